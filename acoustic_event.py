@@ -0,0 +1,165 @@
+"""
+Akusztikus esemény felismerés előtrigger gyűrűpufferrel
+
+A második magon futó audio worker minden blokkot közvetlenül a RAM
+gyűrű következő helyére olvas be, és abból számolja az RMS / csúcs
+jellemzőket. Ha egy blokk átlépi a küszöböt (gyújtás, leválasztó töltet,
+ejtőernyő nyitás), a gyűrű még `post` blokkot vesz fel, majd befagy: a
+trigger előtti és utáni ablak a core 0-n kerül SD kártyára (WAV), és egy
+rövid összegzés megy LoRa-n. Mentés után a felvétel folytatódik.
+
+Állapotok (a core 1 írja, kivéve a RELEASE-t, amit a core 0):
+    ARMED -> TRIGGERED -> READY -> (mentés, release) -> ARMED
+"""
+
+import struct
+import time
+
+ARMED = 0
+TRIGGERED = 1
+READY = 2
+
+
+class EventRecorder:
+    """Előtrigger gyűrű és esemény állapotgép"""
+
+    def __init__(self, block_samples, bytes_per_sample, sample_rate,
+                 pre_ms, post_ms, rms_threshold, peak_threshold, holdoff_ms):
+        """
+        Args:
+            block_samples: Minták száma blokkonként (egy I2S olvasás)
+            bytes_per_sample: 2 (16 bit) vagy 4 (32 bit)
+            sample_rate: Mintavételi frekvencia (Hz)
+            pre_ms: Trigger előtti ablak (ms)
+            post_ms: Trigger utáni ablak (ms)
+            rms_threshold: RMS küszöb (0-1)
+            peak_threshold: Csúcs küszöb (0-1)
+            holdoff_ms: Holtidő mentés után (ms)
+        """
+        self.block_samples = block_samples
+        self.bytes_per_sample = bytes_per_sample
+        self.sample_rate = sample_rate
+        self.rms_threshold = rms_threshold
+        self.peak_threshold = peak_threshold
+        self.holdoff_ms = holdoff_ms
+
+        block_ms = block_samples * 1000 / sample_rate
+        self.pre_blocks = max(1, int(pre_ms / block_ms + 0.5))
+        self.post_blocks = max(1, int(post_ms / block_ms + 0.5))
+        self.blocks = self.pre_blocks + 1 + self.post_blocks
+
+        # Gyűrű és blokkonkénti nézetek egyszer foglalva (a worker nem foglal)
+        size = block_samples * bytes_per_sample
+        self.block_bytes = size
+        self.ring = bytearray(size * self.blocks)
+        view = memoryview(self.ring)
+        self._slots = [view[i * size:(i + 1) * size] for i in range(self.blocks)]
+        self._scratch = bytearray(size)  # Befagyott gyűrű alatt ide olvas
+
+        self.state = ARMED
+        self.pos = 0          # Következő írandó blokk
+        self.filled = 0       # Érvényes blokkok száma
+        self.post_left = 0
+        self.holdoff_until = None
+
+        # Az aktuális esemény adatai
+        self.count = 0
+        self.trigger_ms = 0
+        self.peak = 0.0
+        self.rms_max = 0.0
+        self.loud_blocks = 0
+        self.first = 0        # Az ablak első blokkja a gyűrűben
+        self.length = 0       # Az ablak blokkjainak száma
+
+    def process(self, mic):
+        """
+        Egy blokk olvasása és feldolgozása (core 1, az audio worker hívja)
+
+        Returns:
+            tuple: (rms, peak) a telemetriához
+        """
+        if self.state == READY:
+            return mic.read_features(buf=self._scratch)
+
+        slot = self.pos
+        rms, peak = mic.read_features(buf=self._slots[slot])
+        self.pos = (slot + 1) % self.blocks
+        if self.filled < self.blocks:
+            self.filled += 1
+
+        loud = rms >= self.rms_threshold or peak >= self.peak_threshold
+
+        if self.state == ARMED:
+            if loud and self._armed():
+                self.state = TRIGGERED
+                self.trigger_ms = time.ticks_ms()
+                self.post_left = self.post_blocks
+                self.peak = peak
+                self.rms_max = rms
+                self.loud_blocks = 1
+                # A trigger blokk és az előtte lévő (már meglévő) blokkok
+                pre = min(self.pre_blocks, self.filled - 1)
+                self.first = (slot - pre) % self.blocks
+                self.length = pre + 1
+        else:
+            if peak > self.peak:
+                self.peak = peak
+            if rms > self.rms_max:
+                self.rms_max = rms
+            if loud:
+                self.loud_blocks += 1
+            self.length += 1
+            self.post_left -= 1
+            if self.post_left == 0:
+                self.count += 1
+                self.state = READY
+
+        return rms, peak
+
+    def _armed(self):
+        """Holtidő lejárt-e"""
+        if self.holdoff_until is None:
+            return True
+        if time.ticks_diff(time.ticks_ms(), self.holdoff_until) >= 0:
+            self.holdoff_until = None
+            return True
+        return False
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def window_blocks(self):
+        """Az esemény ablak blokkjai időrendben (memoryview, core 0)"""
+        for i in range(self.length):
+            yield self._slots[(self.first + i) % self.blocks]
+
+    def duration_ms(self):
+        """Küszöb feletti blokkok összideje"""
+        return self.loud_blocks * self.block_samples * 1000 // self.sample_rate
+
+    def release(self):
+        """Mentés után: felvétel folytatása holtidővel (core 0)"""
+        self.filled = 0
+        self.holdoff_until = time.ticks_add(time.ticks_ms(), self.holdoff_ms)
+        self.state = ARMED
+
+    def wav_header(self):
+        """WAV (PCM, mono) fejléc az aktuális ablak méretével"""
+        data_size = self.length * self.block_bytes
+        bits = self.bytes_per_sample * 8
+        byte_rate = self.sample_rate * self.bytes_per_sample
+        return (b'RIFF' + struct.pack('<I', 36 + data_size) + b'WAVEfmt ' +
+                struct.pack('<IHHIIHH', 16, 1, 1, self.sample_rate, byte_rate,
+                            self.bytes_per_sample, bits) +
+                b'data' + struct.pack('<I', data_size))
+
+    def summary(self, mission_id, t_ms):
+        """
+        Esemény összegzés LoRa-ra
+
+        Formátum: "ID,EV,sorszám,idő_ms,csúcs,max_rms,küszöb_feletti_ms"
+        Példa: "CANSAT01,EV,2,73120,0.982,0.412,48"
+        """
+        return (f"{mission_id},EV,{self.count},{t_ms},{self.peak:.3f},"
+                f"{self.rms_max:.3f},{self.duration_ms()}")
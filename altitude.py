@@ -0,0 +1,160 @@
+"""
+Barometrikus magasság számítás
+
+A pontos képlet (44330 * (1 - (p/p0)^0.1903)) mintánként egy float
+hatványozás, ami nagy mintavételi frekvencián drága. Az AltitudeTable a
+repülési nyomástartományra előre kiszámolt táblázatból lineáris
+interpolációval számol; a táblázat sűrűsége a megadott hibakorlátból
+adódik (lineáris interpoláció hibája: h^2/8 * max|f''|).
+
+Két mód:
+- 'isa': nemzetközi standard légkör (mint a pontos képlet)
+- 'hypsometric': hőmérséklettel korrigált, h = R*T/g * ln(p0/p)
+
+CPython alatt is fut (földi feldolgozás).
+"""
+
+import math
+from array import array
+import config
+
+# Nemzetközi standard légkör
+ISA_SCALE = 44330.0
+ISA_EXPONENT = 0.1903
+
+# Hipszometrikus egyenlet: száraz levegő gázállandója / nehézségi gyorsulás
+R_DRY = 287.053  # J/(kg*K)
+G0 = 9.80665     # m/s^2
+KELVIN = 273.15
+
+# Hipszometrikus hibakorláthoz feltételezett legmagasabb hőmérséklet (°C)
+HYPSO_MAX_TEMP_C = 60.0
+
+
+def isa(pres, p0=config.SEA_LEVEL_PRESSURE):
+    """
+    Pontos magasság a standard légkör szerint (referencia)
+
+    Args:
+        pres: Légnyomás (hPa)
+        p0: Tengerszinti (referencia) nyomás (hPa)
+
+    Returns:
+        float: Magasság (m)
+    """
+    return ISA_SCALE * (1 - (pres / p0) ** ISA_EXPONENT)
+
+
+def hypsometric(pres, temp_c, p0=config.SEA_LEVEL_PRESSURE):
+    """
+    Pontos magasság a hipszometrikus egyenlettel (referencia)
+
+    Args:
+        pres: Légnyomás (hPa)
+        temp_c: A réteg átlaghőmérséklete (°C)
+        p0: Referencia nyomás (hPa)
+
+    Returns:
+        float: Magasság (m)
+    """
+    return R_DRY / G0 * (temp_c + KELVIN) * math.log(p0 / pres)
+
+
+class AltitudeTable:
+    """
+    Táblázatos magasság számítás lineáris interpolációval
+
+    A tartományon kívüli nyomásra a szélső szakasz egyenesével
+    extrapolál (ott a hibakorlát nem érvényes).
+    """
+
+    def __init__(self, p0=config.SEA_LEVEL_PRESSURE, p_min=config.ALT_P_MIN,
+                 p_max=config.ALT_P_MAX, max_error=config.ALT_MAX_ERROR, mode=config.ALT_MODE):
+        """
+        Args:
+            p0: Referencia nyomás (hPa)
+            p_min: Táblázat alsó határa (hPa) - a legnagyobb magasság
+            p_max: Táblázat felső határa (hPa)
+            max_error: Megengedett interpolációs hiba (m)
+            mode: 'isa' vagy 'hypsometric'
+        """
+        if mode not in ('isa', 'hypsometric'):
+            raise ValueError("mode: 'isa' vagy 'hypsometric'")
+
+        self.p0 = p0
+        self.p_min = p_min
+        self.mode = mode
+
+        # Második derivált abszolút maximuma a tartományon (p_min-nél)
+        if mode == 'isa':
+            f = lambda p: isa(p, p0)
+            scale = 1.0
+            curvature = (ISA_SCALE * ISA_EXPONENT * (1 - ISA_EXPONENT)
+                         * p_min ** (ISA_EXPONENT - 2) / p0 ** ISA_EXPONENT)
+        else:
+            # ln(p0/p) táblázat, a hőmérséklet szorzó utólag
+            f = lambda p: math.log(p0 / p)
+            scale = R_DRY / G0 * (HYPSO_MAX_TEMP_C + KELVIN)
+            curvature = scale / (p_min * p_min)
+
+        # A float32 tárolás kerekítése (fél ulp) a hibakeretből
+        rounding = max(abs(f(p_min)), abs(f(p_max))) * scale * 2 ** -24
+        if max_error <= rounding:
+            raise ValueError("max_error túl kicsi a float32 táblázathoz")
+
+        step = math.sqrt(8 * (max_error - rounding) / curvature)
+        count = int(math.ceil((p_max - p_min) / step)) + 1
+        step = (p_max - p_min) / (count - 1)
+
+        self.step = step
+        self.inv_step = 1 / step
+        self.last = count - 2  # Utolsó szakasz kezdőindexe
+        self.table = array('f', (f(p_min + i * step) for i in range(count)))
+
+        # Elméleti korlát a választott lépésközzel
+        self.max_error = step * step / 8 * curvature + rounding
+
+    def altitude(self, pres, temp_c=15.0):
+        """
+        Magasság a táblázatból
+
+        Args:
+            pres: Légnyomás (hPa)
+            temp_c: Réteg átlaghőmérséklet (°C), csak 'hypsometric' módban
+
+        Returns:
+            float: Magasság (m)
+        """
+        x = (pres - self.p_min) * self.inv_step
+        i = int(x)
+        if i < 0:
+            i = 0
+        elif i > self.last:
+            i = self.last
+        table = self.table
+        a = table[i]
+        value = a + (table[i + 1] - a) * (x - i)
+
+        if self.mode == 'isa':
+            return value
+        return R_DRY / G0 * (temp_c + KELVIN) * value
+
+    def check(self, samples=2000, temp_c=15.0):
+        """
+        Tényleges legnagyobb eltérés a pontos képlettől a tartományon
+
+        Returns:
+            float: Legnagyobb abszolút hiba (m)
+        """
+        span = self.step * (self.last + 1)
+        worst = 0.0
+        for k in range(samples + 1):
+            p = self.p_min + span * k / samples
+            if self.mode == 'isa':
+                exact = isa(p, self.p0)
+            else:
+                exact = hypsometric(p, temp_c, self.p0)
+            err = abs(self.altitude(p, temp_c) - exact)
+            if err > worst:
+                worst = err
+        return worst
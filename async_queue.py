@@ -0,0 +1,82 @@
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+
+class BoundedQueue:
+    """
+    Fix méretű FIFO sor uasyncio taskok összekötéséhez
+
+    A tároló előre lefoglalt lista (ring buffer), így a sor mérete sosem nő.
+    Tele sor esetén a legrégebbi elem eldobódik: a termelő task sosem
+    blokkol, a fogyasztó mindig a legfrissebb adatokat kapja.
+    """
+
+    def __init__(self, maxsize):
+        """
+        Args:
+            maxsize: A sorban tárolható elemek maximális száma
+        """
+        self.maxsize = maxsize
+        self._items = [None] * maxsize
+        self._head = 0
+        self._count = 0
+        self._event = asyncio.Event()
+        self.dropped = 0
+
+    def __len__(self):
+        return self._count
+
+    def empty(self):
+        """Üres-e a sor"""
+        return self._count == 0
+
+    def full(self):
+        """Tele van-e a sor"""
+        return self._count == self.maxsize
+
+    def put_nowait(self, item):
+        """
+        Elem betétele a sorba (sosem blokkol)
+
+        Returns:
+            bool: False, ha egy régi elemet el kellett dobni
+        """
+        overwritten = False
+        if self._count == self.maxsize:
+            # Legrégebbi elem eldobása
+            self._items[self._head] = None
+            self._head = (self._head + 1) % self.maxsize
+            self._count -= 1
+            self.dropped += 1
+            overwritten = True
+
+        tail = (self._head + self._count) % self.maxsize
+        self._items[tail] = item
+        self._count += 1
+        self._event.set()
+        return not overwritten
+
+    def get_nowait(self):
+        """
+        Elem kivétele a sorból várakozás nélkül
+
+        Returns:
+            A legrégebbi elem vagy None, ha a sor üres
+        """
+        if self._count == 0:
+            return None
+
+        item = self._items[self._head]
+        self._items[self._head] = None
+        self._head = (self._head + 1) % self.maxsize
+        self._count -= 1
+        return item
+
+    async def get(self):
+        """Elem kivétele a sorból, várakozás amíg érkezik adat"""
+        while self._count == 0:
+            self._event.clear()
+            await self._event.wait()
+        return self.get_nowait()
@@ -0,0 +1,133 @@
+"""
+Audio feldolgozás az RP2040 második magján (core 1)
+
+A worker szál birtokolja az I2S mikrofont: mintavétel, RMS és csúcsérték
+számítás, az eredményeket egy termelő / egy fogyasztó gyűrűpufferen adja át
+a core 0-n futó főprogramnak.
+"""
+
+import _thread
+import time
+from array import array
+
+
+class SPSCBuffer:
+    """
+    Egy termelő / egy fogyasztó gyűrűpuffer magok közötti adatátadáshoz
+
+    Minden bejegyzés `width` darab float érték, előre lefoglalt tömbben.
+    Az indexek módosítását zár védi; tele puffer esetén a legrégebbi
+    bejegyzés íródik felül (a fogyasztó mindig a friss adatot kapja).
+    """
+
+    def __init__(self, capacity, width):
+        """
+        Args:
+            capacity: Bejegyzések maximális száma
+            width: Értékek száma bejegyzésenként
+        """
+        self.capacity = capacity
+        self.width = width
+        self._data = array('f', [0.0] * (capacity * width))
+        self._head = 0  # Következő olvasandó bejegyzés (fogyasztó)
+        self._count = 0
+        self._lock = _thread.allocate_lock()
+        self.overruns = 0
+
+    def push(self, values):
+        """
+        Bejegyzés beírása (termelő oldal)
+
+        Args:
+            values: `width` hosszú szekvencia
+        """
+        self._lock.acquire()
+        if self._count == self.capacity:
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            self.overruns += 1
+        base = ((self._head + self._count) % self.capacity) * self.width
+        for i in range(self.width):
+            self._data[base + i] = values[i]
+        self._count += 1
+        self._lock.release()
+
+    def pop_into(self, out):
+        """
+        Legrégebbi bejegyzés kiolvasása (fogyasztó oldal)
+
+        Args:
+            out: `width` hosszú lista, ebbe kerülnek az értékek
+
+        Returns:
+            bool: False, ha a puffer üres
+        """
+        self._lock.acquire()
+        if self._count == 0:
+            self._lock.release()
+            return False
+        base = self._head * self.width
+        for i in range(self.width):
+            out[i] = self._data[base + i]
+        self._head = (self._head + 1) % self.capacity
+        self._count -= 1
+        self._lock.release()
+        return True
+
+    def __len__(self):
+        return self._count
+
+
+class AudioWorker:
+    """Mikrofon mintavétel és jellemzőszámítás a második magon"""
+
+    # Bejegyzés felépítése a pufferben: (rms, peak, feldolgozási idő µs)
+    WIDTH = 3
+
+    def __init__(self, mic, buffer, num_samples=128, interval_ms=0, recorder=None):
+        """
+        Args:
+            mic: I2S_Microphone példány (a worker kizárólagosan használja)
+            buffer: SPSCBuffer (WIDTH szélességű)
+            num_samples: Minták száma mérésenként
+            interval_ms: Várakozás két mérés között (0 = folyamatos)
+            recorder: EventRecorder (opcionális); ha van, a blokkok az
+                      esemény gyűrűbe kerülnek, a blokkméret a recorderé
+        """
+        self.mic = mic
+        self.buffer = buffer
+        self.num_samples = num_samples
+        self.interval_ms = interval_ms
+        self.recorder = recorder
+        self.running = False
+        self.frames = 0
+
+    def start(self):
+        """Worker szál indítása a core 1-en"""
+        if self.running:
+            return
+        self.running = True
+        _thread.start_new_thread(self._run, ())
+
+    def stop(self):
+        """Worker leállítása (a következő mérés után lép ki)"""
+        self.running = False
+
+    def _run(self):
+        """Worker ciklus (core 1)"""
+        values = [0.0, 0.0, 0.0]
+        while self.running:
+            try:
+                t0 = time.ticks_us()
+                if self.recorder:
+                    values[0], values[1] = self.recorder.process(self.mic)
+                else:
+                    values[0], values[1] = self.mic.read_features(self.num_samples)
+                values[2] = time.ticks_diff(time.ticks_us(), t0)
+                self.buffer.push(values)
+                self.frames += 1
+            except:
+                pass
+
+            if self.interval_ms:
+                time.sleep_ms(self.interval_ms)
@@ -0,0 +1,238 @@
+"""
+Több BMP280 kezelése egy buszon: felderítés, egymás utáni olvasás, szavazás
+
+Az összes szenzor nyers értékei egy ütemezési lépésben, közvetlenül
+egymás után kerülnek beolvasásra (a kompenzáció csak utána), így a minták
+közel egyidejűek és a busz tranzakciók nem keverednek a számolással.
+
+Fúzió:
+- 3+ érvényes érték: medián, ettől BARO_VOTE_TOL_HPA-nál jobban eltérő
+  érték kiugró, a többi átlaga az eredmény
+- 2 érték: ha egyeznek, átlag; ha nem, az előző fúziós értékhez
+  közelebbi nyer
+- 1 érték: az
+
+Szenzoronként számláló: olvasás, hiba, kiugró. BARO_MAX_ERRORS egymás
+utáni hiba után a szenzor kimarad, és csak BARO_RETRY_READS olvasásonként
+próbálkozik újra.
+
+Kifelé a BMP280 felülete (read, set_preset, preset), így a főprogram
+egy vagy több szenzorral ugyanúgy használja. A nyers értékek (adc_p,
+adc_t) az első szenzoréi, és csak akkor vannak meg, ha az a fúzióban
+részt vett: a nyers log így mindig a kalibrációjához tartozik.
+"""
+
+import bmp280
+import config
+
+CHIP_ID_REG = 0xD0
+BMP280_CHIP_ID = 0x58
+
+
+class SensorHealth:
+    """Egy szenzor állapot számlálói"""
+
+    def __init__(self):
+        self.reads = 0
+        self.errors = 0
+        self.outliers = 0
+        self.error_run = 0  # Egymást követő hibák
+        self.skip = 0       # Kimaradó olvasások (kiesett szenzor)
+
+    def summary(self):
+        """Formátum: "olvasás/hiba/kiugró" """
+        return f"{self.reads}/{self.errors}/{self.outliers}"
+
+    def reset(self):
+        """Ablak számlálók nullázása (a kiesési állapot megmarad)"""
+        self.reads = 0
+        self.errors = 0
+        self.outliers = 0
+
+
+def scan(i2c, preset='legacy'):
+    """
+    Minden BMP280 megkeresése a buszon chip ID alapján
+
+    Returns:
+        list: BMP280 példányok (cím szerint rendezve)
+    """
+    sensors = []
+    for addr in sorted(i2c.scan()):
+        try:
+            if i2c.readfrom_mem(addr, CHIP_ID_REG, 1)[0] == BMP280_CHIP_ID:
+                sensors.append(bmp280.BMP280(i2c, addr=addr, preset=preset))
+        except:
+            pass
+    return sensors
+
+
+class BarometerArray:
+    """Több BMP280 egy szenzorként"""
+
+    def __init__(self, sensors, tolerance=config.BARO_VOTE_TOL_HPA):
+        """
+        Args:
+            sensors: BMP280 példányok (scan())
+            tolerance: Megengedett eltérés a mediántól (hPa)
+        """
+        if not sensors:
+            raise ValueError("Nincs BMP280")
+
+        self.sensors = sensors
+        self.tolerance = tolerance
+        self.health = [SensorHealth() for _ in sensors]
+        self.last = None  # Előző fúziós nyomás
+
+        # Előre foglalt munkaterület (szenzoronként)
+        n = len(sensors)
+        self._raw = [None] * n
+        self._pres = [0.0] * n
+        self._temp = [0.0] * n
+        self._valid = [False] * n
+
+    # --- BMP280 felület ---
+
+    @property
+    def preset(self):
+        return self.sensors[0].preset
+
+    def set_preset(self, name):
+        """Mérési beállítás minden szenzoron"""
+        for sensor in self.sensors:
+            try:
+                sensor.set_preset(name)
+            except:
+                pass
+
+    @property
+    def cal(self):
+        """Az első szenzor kalibrációja (nyers log, az adc_p / adc_t ehhez tartozik)"""
+        return self.sensors[0].cal
+
+    @property
+    def adc_p(self):
+        """
+        Az első szenzor nyers nyomás értéke, ha az utolsó fúzióban részt
+        vett; különben (kiesett, kiugró, még nem olvasott) None
+        """
+        return self._raw[0][0] if self._valid[0] else None
+
+    @property
+    def adc_t(self):
+        """Az első szenzor nyers hőmérséklet értéke (mint adc_p), vagy None"""
+        return self._raw[0][1] if self._valid[0] else None
+
+    def read(self):
+        """
+        Minden szenzor beolvasása és fúziója
+
+        Returns:
+            tuple: (pressure_hpa, temp_c) vagy None, ha egyik sem adott
+                   érvényes mérést
+        """
+        sensors = self.sensors
+        health = self.health
+        raw = self._raw
+        n = len(sensors)
+
+        # 1. Busz: nyers értékek egymás után
+        for i in range(n):
+            h = health[i]
+            raw[i] = None
+            if h.skip:
+                h.skip -= 1
+                continue
+            try:
+                raw[i] = sensors[i].read_raw()
+            except:
+                self._failed(h)
+
+        # 2. Kompenzáció
+        pres = self._pres
+        temp = self._temp
+        valid = self._valid
+        count = 0
+        for i in range(n):
+            valid[i] = False
+            if raw[i] is None:
+                continue
+            adc_p, adc_t = raw[i]
+            if adc_p == bmp280.ADC_SKIPPED:
+                self._failed(health[i])
+                continue
+            sensor = sensors[i]
+            t_fine = sensor._compensate_temp(adc_t)
+            pres[i] = sensor._compensate_pressure(adc_p, t_fine) / 100
+            temp[i] = sensor.temperature / 100
+            valid[i] = True
+            health[i].reads += 1
+            health[i].error_run = 0
+            count += 1
+
+        if count == 0:
+            return None
+
+        # 3. Szavazás
+        if count >= 3:
+            self._vote_median()
+        elif count == 2:
+            self._vote_pair()
+
+        p_sum = 0.0
+        t_sum = 0.0
+        used = 0
+        for i in range(n):
+            if valid[i]:
+                p_sum += pres[i]
+                t_sum += temp[i]
+                used += 1
+
+        self.last = p_sum / used
+        return self.last, t_sum / used
+
+    def _failed(self, h):
+        """Olvasási hiba; sok egymás utáni hiba után a szenzor kimarad"""
+        h.errors += 1
+        h.error_run += 1
+        if h.error_run >= config.BARO_MAX_ERRORS:
+            h.skip = config.BARO_RETRY_READS
+            h.error_run = 0
+
+    def _vote_median(self):
+        """A mediántól túl messze eső értékek kizárása"""
+        values = sorted(self._pres[i] for i in range(len(self.sensors)) if self._valid[i])
+        mid = len(values) // 2
+        if len(values) % 2:
+            median = values[mid]
+        else:
+            median = (values[mid - 1] + values[mid]) / 2
+
+        for i in range(len(self.sensors)):
+            if self._valid[i] and abs(self._pres[i] - median) > self.tolerance:
+                self._valid[i] = False
+                self.health[i].outliers += 1
+
+    def _vote_pair(self):
+        """Két eltérő érték közül az előző fúziós értékhez közelebbi marad"""
+        a, b = [i for i in range(len(self.sensors)) if self._valid[i]]
+        if abs(self._pres[a] - self._pres[b]) <= self.tolerance or self.last is None:
+            return
+        if abs(self._pres[a] - self.last) > abs(self._pres[b] - self.last):
+            a, b = b, a
+        self._valid[b] = False
+        self.health[b].outliers += 1
+
+    def summary(self):
+        """
+        Szenzoronkénti állapot housekeeping csomaghoz
+
+        Formátum: "baro0x76=olvasás/hiba/kiugró;baro0x77=..."
+        """
+        return ";".join(f"baro{hex(s.addr)}={h.summary()}"
+                        for s, h in zip(self.sensors, self.health))
+
+    def reset_stats(self):
+        """Ablak számlálók nullázása"""
+        for h in self.health:
+            h.reset()
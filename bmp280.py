@@ -1,49 +1,229 @@
 from machine import I2C
+import micropython
 import time
 import struct
 
+# Regiszterek
+REG_STATUS = 0xF3
+REG_CTRL_MEAS = 0xF4
+REG_CONFIG = 0xF5
+REG_DATA = 0xF7
+
+STATUS_MEASURING = 0x08  # 1, amíg konverzió fut
+ADC_SKIPPED = 0x80000    # Reset érték: még nem volt mérés
+
+# Mérési beállítások (regiszter kódok):
+# (hőm. túlmintavétel, nyomás túlmintavétel, IIR szűrő, standby)
+#   túlmintavétel: 1=x1, 2=x2, 3=x4, 4=x8, 5=x16
+#   IIR szűrő: 0=ki, 1=2, 2=4, 3=8, 4=16
+#   standby: 0=0.5, 1=62.5, 2=125, 3=250, 4=500, 5=1000, 6=2000, 7=4000 ms
+PRESETS = {
+    'legacy':    (1, 1, 0, 5),  # ~1 Hz, szűrés nélkül (a korábbi fix beállítás)
+    'high_rate': (1, 1, 1, 0),  # ~150 Hz, emelkedés / csúcspont
+    'standard':  (1, 3, 2, 0),  # ~75 Hz, közepes zaj
+    'low_noise': (2, 5, 4, 1),  # ~10 Hz, legkisebb zaj (starthelyen, földön)
+}
+STANDBY_MS = (0.5, 62.5, 125, 250, 500, 1000, 2000, 4000)
+
+
 class BMP280:
-    def __init__(self, i2c, addr=0x76):
+    def __init__(self, i2c, addr=0x76, preset='legacy'):
         self.i2c = i2c
         self.addr = addr
+        # Előre foglalt olvasási pufferek (read() nem foglal új buffert)
+        self._buf = bytearray(6)
+        self._status = bytearray(1)
         self._load_calibration()
-        self.i2c.writeto_mem(self.addr, 0xF4, b'\x27')
-        self.i2c.writeto_mem(self.addr, 0xF5, b'\xA0')
+        self.set_preset(preset)
 
     def _load_calibration(self):
         calib = self.i2c.readfrom_mem(self.addr, 0x88, 24)
-        self.cal = struct.unpack('<HhhHhhhhhhhh', calib)
+        self._set_calibration(struct.unpack('<HhhHhhhhhhhh', calib))
+
+    def _set_calibration(self, cal):
+        """
+        Kalibrációs együtthatók és a belőlük számolt állandók
+
+        Args:
+            cal: (T1, T2, T3, P1, ..., P9)
+        """
+        self.cal = cal
+        t1, t2, t3, p1, p2, p3, p4, p5, p6, p7, p8, p9 = cal
+        # Mintánként változatlan eltolások egyszer, itt
+        self._tc = (t1, t1 << 1, t2, t3)
+        self._pc = (p1, p2, p3, p4 << 16, p5 << 1, p6, p7, p8, p9)
+
+    def set_preset(self, name):
+        """
+        Túlmintavétel, IIR szűrő és standby beállítása
+
+        A config regiszter írása normál módban elveszhet, ezért az
+        átállítás sleep módon keresztül történik.
+
+        Args:
+            name: PRESETS kulcs
+        """
+        osrs_t, osrs_p, iir, standby = PRESETS[name]
+        ctrl = (osrs_t << 5) | (osrs_p << 2)
+        self.i2c.writeto_mem(self.addr, REG_CTRL_MEAS, bytes((ctrl,)))
+        self.i2c.writeto_mem(self.addr, REG_CONFIG, bytes(((standby << 5) | (iir << 2),)))
+        self.i2c.writeto_mem(self.addr, REG_CTRL_MEAS, bytes((ctrl | 0x03,)))
+        self.preset = name
+
+        # Egy mérési ciklus legnagyobb hossza (adatlap szerinti max konverziós idő)
+        t_meas = 1.25 + 2.3 * (1 << (osrs_t - 1)) + 2.3 * (1 << (osrs_p - 1)) + 0.575
+        self.period_ms = t_meas + STANDBY_MS[standby]
+
+    def wait_ready(self, timeout_ms=None):
+        """
+        Várakozás egy konverzió végére (measuring bit 1 -> 0)
+
+        Ha a hívás egy futó konverzió közben történik, annak végéig vár,
+        így az utána olvasott adat mindig friss.
+
+        Args:
+            timeout_ms: Időkorlát (alapból két mérési ciklus)
+
+        Returns:
+            bool: True, ha új adat érkezett
+        """
+        if timeout_ms is None:
+            timeout_ms = int(2 * self.period_ms) + 2
+        start = time.ticks_ms()
+        measuring = False
+        while time.ticks_diff(time.ticks_ms(), start) <= timeout_ms:
+            self.i2c.readfrom_mem_into(self.addr, REG_STATUS, self._status)
+            if self._status[0] & STATUS_MEASURING:
+                measuring = True
+            elif measuring:
+                return True
+        return False
+
+    def read_raw(self):
+        """
+        Nyers ADC értékek olvasása az előre foglalt pufferbe
 
-    def read(self):
-        data = self.i2c.readfrom_mem(self.addr, 0xF7, 6)
+        Az utolsó értékek az adc_p / adc_t attribútumban is megmaradnak
+        (nyers log a földi újrafeldolgozáshoz, bmp280_batch.py).
+
+        Returns:
+            tuple: (adc_p, adc_t)
+        """
+        data = self._buf
+        self.i2c.readfrom_mem_into(self.addr, REG_DATA, data)
         adc_p = (data[0]<<12) | (data[1]<<4) | (data[2]>>4)
         adc_t = (data[3]<<12) | (data[4]<<4) | (data[5]>>4)
+        self.adc_p = adc_p
+        self.adc_t = adc_t
+        return adc_p, adc_t
+
+    def read(self, wait=False):
+        """
+        Nyomás és hőmérséklet
+
+        Args:
+            wait: Várjon-e a következő konverzió végére
+
+        Returns:
+            tuple: (pressure_hpa, temp_c) vagy None, ha még nincs mérés
+        """
+        if wait:
+            self.wait_ready()
+
+        adc_p, adc_t = self.read_raw()
+        if adc_p == ADC_SKIPPED:
+            return None
 
         t_fine = self._compensate_temp(adc_t)
         pressure = self._compensate_pressure(adc_p, t_fine)
 
         return pressure / 100, self.temperature / 100
 
+    def burst(self, count):
+        """
+        Egymást követő konverziók beolvasása időbélyeggel
+
+        Mintánként a konverzió végét megvárja, így egy minta sem ismétlődik
+        és nem marad ki (a mintaköz a beállítás mérési ciklusa).
+
+        Args:
+            count: Minták száma
+
+        Returns:
+            list: [(ticks_us, pressure_hpa, temp_c), ...] - kimaradt
+                  konverzió (időtúllépés) esetén kevesebb elem
+        """
+        samples = []
+        for _ in range(count):
+            if not self.wait_ready():
+                break
+            t = time.ticks_us()
+            data = self.read()
+            if data:
+                samples.append((t, data[0], data[1]))
+        return samples
+
+    @micropython.native
     def _compensate_temp(self, adc_t):
-        c = self.cal
-        var1 = (((adc_t>>3) - (c[0]<<1)) * c[1]) >> 11
-        var2 = (((((adc_t>>4) - c[0]) * ((adc_t>>4) - c[0])) >> 12) * c[2]) >> 14
+        t1, t1x2, t2, t3 = self._tc
+        var1 = (((adc_t>>3) - t1x2) * t2) >> 11
+        d = (adc_t>>4) - t1
+        var2 = (((d * d) >> 12) * t3) >> 14
         t_fine = var1 + var2
         self.temperature = (t_fine * 5 + 128) >> 8
         return t_fine
 
+    @micropython.native
     def _compensate_pressure(self, adc_p, t_fine):
+        """
+        32 bites egész kompenzáció (Bosch int32 változat), Pa
+
+        Az adatlap szerinti működési tartományban (-40..+85 °C,
+        300..1100 hPa) és az adatlap példa kalibrációjával minden
+        részeredmény a MicroPython small int tartományban (±2^30, a
+        legnagyobb kb. 0.83 * 2^30) marad, így nincs bignum foglalás; ezen
+        kívül, vagy szélsőséges kalibrációnál az eredmény ugyanúgy helyes,
+        csak foglalhat. A Bosch kódtól eltérések, hogy a tartományon belül
+        maradjon: a var1 négyzet és a P2 szorzat egy bittel korábbi
+        eltolással (az eredmény >>18 miatt elhanyagolható),
+        ((32768+v)*P1)>>15 helyett P1 + ((v*P1)>>15) (azonos), és a 3125-ös
+        szorzás osztás maradékkal (pontosabb, legfeljebb 1 Pa eltérés a
+        Bosch kódtól).
+        """
+        p1, p2, p3, p4s, p5x2, p6, p7, p8, p9 = self._pc
+        var1 = (t_fine>>1) - 64000
+        sq = (var1>>3) * (var1>>3)
+        var2 = (sq>>9) * p6 + var1 * p5x2
+        var2 = (var2>>2) + p4s
+        var1 = (((p3 * (sq>>11)) >> 3) + p2 * (var1>>1)) >> 18
+        var1 = p1 + ((var1 * p1) >> 15)
+        if var1 == 0:
+            return 0
+        x = (1048576 - adc_p) - (var2>>12)
+        q = x // var1
+        p = q * 6250 + ((x - q * var1) * 6250) // var1
+        var1 = (p9 * (((p>>3) * (p>>3)) >> 13)) >> 12
+        var2 = ((p>>2) * p8) >> 13
+        return p + ((var1 + var2 + p7) >> 4)
+
+    def _compensate_pressure64(self, adc_p, t_fine):
+        """
+        64 bites egész kompenzáció (Bosch int64 változat, referencia)
+
+        Returns:
+            int: Nyomás Q24.8 formátumban (Pa * 256)
+        """
         c = self.cal
         var1 = t_fine - 128000
-        var2 = var1 * var1 * c[5]
-        var2 = var2 + ((var1 * c[4]) << 17)
-        var2 = var2 + (c[3] << 35)
-        var1 = ((var1 * var1 * c[2]) >> 8) + ((var1 * c[1]) << 12)
-        var1 = (((1 << 47) + var1) * c[0]) >> 33
+        var2 = var1 * var1 * c[8]
+        var2 = var2 + ((var1 * c[7]) << 17)
+        var2 = var2 + (c[6] << 35)
+        var1 = ((var1 * var1 * c[5]) >> 8) + ((var1 * c[4]) << 12)
+        var1 = (((1 << 47) + var1) * c[3]) >> 33
         if var1 == 0:
             return 0
         p = 1048576 - adc_p
         p = (((p << 31) - var2) * 3125) // var1
-        var1 = (c[8] * (p >> 13) * (p >> 13)) >> 25
-        var2 = (c[7] * p) >> 19
-        return ((p + var1 + var2) >> 8) + (c[6] << 4)
+        var1 = (c[11] * (p >> 13) * (p >> 13)) >> 25
+        var2 = (c[10] * p) >> 19
+        return ((p + var1 + var2) >> 8) + (c[9] << 4)
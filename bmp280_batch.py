@@ -0,0 +1,153 @@
+"""
+BMP280 nyers minták kompenzálása NumPy tömbökön (gépen, repülés után)
+
+Az SD kártyára mentett nyers ADC értékekből (config.LOG_RAW_BARO) a
+fedélzeti kóddal bitre azonos hőmérsékletet és nyomást számol, egész
+tömbökön, ciklus nélkül: egy órás, 100 Hz-es log néhány másodperc.
+
+Nyers log formátum (config.RAW_LOG_FILENAME):
+    cal,T1,T2,T3,P1,...,P9          # minden induláskor, a minták előtt
+    timestamp_ms,adc_p,adc_t        # barométer mintánként
+
+Használat:
+    python bmp280_batch.py baro_raw.csv                # összegzés
+    python bmp280_batch.py baro_raw.csv -o baro.csv    # timestamp_ms,temp_c,pressure_hpa
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+
+def compensate_temp(adc_t, cal):
+    """
+    Hőmérséklet kompenzáció (bmp280.BMP280._compensate_temp tömbösítve)
+
+    Args:
+        adc_t: Nyers hőmérséklet ADC értékek
+        cal: Kalibráció (T1, T2, T3, P1, ..., P9)
+
+    Returns:
+        tuple: (t_fine, hőmérséklet 0.01 °C-ban) int64 tömbök
+    """
+    t1, t2, t3 = cal[0], cal[1], cal[2]
+    adc_t = np.asarray(adc_t, dtype=np.int64)
+
+    var1 = (((adc_t >> 3) - (t1 << 1)) * t2) >> 11
+    d = (adc_t >> 4) - t1
+    var2 = (((d * d) >> 12) * t3) >> 14
+    t_fine = var1 + var2
+    return t_fine, (t_fine * 5 + 128) >> 8
+
+
+def compensate_pressure(adc_p, t_fine, cal):
+    """
+    Nyomás kompenzáció (bmp280.BMP280._compensate_pressure tömbösítve)
+
+    A fedélzeti 32 bites egész változat lépései eltolásról eltolásra,
+    int64 tömbökön; a >> és // a Pythonhoz hasonlóan lefelé kerekít, így
+    az eredmény bitre azonos. A fedélzeti lépések változásakor ezt is
+    módosítani kell (test_ground.py ellenőrzi).
+
+    Returns:
+        ndarray: Nyomás Pa-ban (int64)
+    """
+    p1, p2, p3, p4, p5, p6, p7, p8, p9 = cal[3:]
+    adc_p = np.asarray(adc_p, dtype=np.int64)
+    t_fine = np.asarray(t_fine, dtype=np.int64)
+
+    var1 = (t_fine >> 1) - 64000
+    sq = (var1 >> 3) * (var1 >> 3)
+    var2 = (sq >> 9) * p6 + var1 * (p5 << 1)
+    var2 = (var2 >> 2) + (p4 << 16)
+    var1 = (((p3 * (sq >> 11)) >> 3) + p2 * (var1 >> 1)) >> 18
+    var1 = p1 + ((var1 * p1) >> 15)
+
+    # Nullával osztás helyett 0 (mint a fedélzeten)
+    zero = var1 == 0
+    var1 = np.where(zero, 1, var1)
+
+    x = (1048576 - adc_p) - (var2 >> 12)
+    q = x // var1
+    p = q * 6250 + ((x - q * var1) * 6250) // var1
+    var1 = (p9 * (((p >> 3) * (p >> 3)) >> 13)) >> 12
+    var2 = ((p >> 2) * p8) >> 13
+    p = p + ((var1 + var2 + p7) >> 4)
+    return np.where(zero, 0, p)
+
+
+def compensate(adc_p, adc_t, cal):
+    """
+    Nyers mintákból hőmérséklet és nyomás
+
+    Returns:
+        tuple: (temp_c, pressure_hpa) float tömbök - a fedélzeti
+               BMP280.read() értékeivel azonosak
+    """
+    t_fine, temp = compensate_temp(adc_t, cal)
+    pressure = compensate_pressure(adc_p, t_fine, cal)
+    return temp / 100, pressure / 100
+
+
+def load_raw_log(filename):
+    """
+    Nyers barométer log beolvasása
+
+    Returns:
+        tuple: (cal, timestamp_ms, adc_p, adc_t) - a tömbök int64-esek
+
+    Raises:
+        ValueError: Ha nincs kalibráció, vagy induláskor eltérő volt
+                    (más szenzor ugyanabban a fájlban)
+    """
+    cal = None
+    with open(filename) as f:
+        for line in f:
+            if line.startswith("cal,"):
+                values = tuple(int(v) for v in line.strip().split(",")[1:])
+                if cal is not None and values != cal:
+                    raise ValueError(f"{filename}: eltérő kalibráció a logban")
+                cal = values
+
+    if cal is None or len(cal) != 12:
+        raise ValueError(f"{filename}: hiányzó kalibráció")
+
+    data = np.loadtxt(filename, delimiter=",", comments="cal", dtype=np.int64, ndmin=2)
+    if data.size == 0:
+        data = np.zeros((0, 3), dtype=np.int64)
+    return cal, data[:, 0], data[:, 1], data[:, 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BMP280 nyers log kompenzálása")
+    parser.add_argument("raw_log", help="Nyers barométer log (baro_raw.csv)")
+    parser.add_argument("-o", "--output", help="Kimeneti CSV (timestamp_ms,temp_c,pressure_hpa)")
+    args = parser.parse_args()
+
+    try:
+        cal, timestamp, adc_p, adc_t = load_raw_log(args.raw_log)
+    except (OSError, ValueError) as e:
+        print(f"Hiba: {e}")
+        return 1
+
+    t0 = time.perf_counter()
+    temp, pressure = compensate(adc_p, adc_t, cal)
+    elapsed = time.perf_counter() - t0
+
+    print(f"{len(timestamp)} minta, kompenzálás: {elapsed * 1000:.1f} ms")
+    if len(timestamp):
+        print(f"Hőmérséklet: {temp.min():.2f} .. {temp.max():.2f} °C")
+        print(f"Nyomás: {pressure.min():.2f} .. {pressure.max():.2f} hPa")
+
+    if args.output:
+        np.savetxt(args.output, np.column_stack((timestamp, temp, pressure)),
+                   fmt=("%d", "%.2f", "%.2f"), delimiter=",",
+                   header="timestamp_ms,temp_c,pressure_hpa", comments="")
+        print(f"Mentve: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Indulási benchmark (MicroPython, a Pico-n futtatandó)
+
+A repülési modulok importálási idejét és a heap állapotát méri. Forrás
+(.py), lefordított (.mpy) és fagyasztott (frozen) modulokkal is futtatva
+összehasonlítható, mennyit nyer a fordítás (lásd build_mpy.py --bench).
+
+Kimenet egy sorban:
+    BENCH,változat,összes_us,szabad_előtte,szabad_utána,modul=us;...
+"""
+
+import gc
+import sys
+import time
+
+gc.collect()
+free_before = gc.mem_free()
+t_start = time.ticks_us()
+
+import config
+
+module_times = []
+for name in config.FLIGHT_MODULES:
+    t0 = time.ticks_us()
+    __import__(name)
+    module_times.append((name, time.ticks_diff(time.ticks_us(), t0)))
+
+total_us = time.ticks_diff(time.ticks_us(), t_start)
+gc.collect()
+free_after = gc.mem_free()
+
+# Változat felismerése a fő modul forrása alapján
+source = getattr(sys.modules['cansat_main'], '__file__', '')
+if not source or source.startswith('.frozen'):
+    variant = 'frozen'
+elif source.endswith('.mpy'):
+    variant = 'mpy'
+else:
+    variant = 'source'
+
+modules = ";".join(f"{name}={us}" for name, us in module_times)
+print(f"BENCH,{variant},{total_us},{free_before},{free_after},{modules}")
@@ -0,0 +1,149 @@
+"""
+Repülési modulok fordítása .mpy bájtkódra / fagyasztás a firmware-be
+
+A gépen (CPython) futtatandó, mpy-cross szükséges hozzá
+(pip install mpy-cross). A -march=armv6m miatt a @micropython.native és
+@micropython.viper dekorátorral jelölt függvények natív kódra fordulnak.
+
+Használat:
+    python build_mpy.py                      # build/mpy/*.mpy + main.py indító
+    python build_mpy.py --frozen             # build/manifest.py a firmware-hez
+    python build_mpy.py --bench /dev/ttyACM0 # forrás vs .mpy indulási benchmark
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+import config
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ARCH = "armv6m"  # RP2040 (Cortex-M0+)
+
+# A Pico-n automatikusan induló main.py (csak .py lehet)
+MAIN_STUB = "import cansat_main\ncansat_main.main()\n"
+
+
+def mpy_cross_command():
+    """mpy-cross futtatási parancs (önálló bináris vagy a pip csomag)"""
+    if shutil.which("mpy-cross"):
+        return ["mpy-cross"]
+    return [sys.executable, "-m", "mpy_cross"]
+
+
+def build_mpy(out_dir, opt):
+    """
+    Modulok fordítása .mpy fájlokká
+
+    Returns:
+        list: A létrehozott fájlok elérési útjai
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = []
+
+    for name in ("config",) + tuple(config.FLIGHT_MODULES):
+        source = os.path.join(ROOT, name + ".py")
+        target = os.path.join(out_dir, name + ".mpy")
+        cmd = mpy_cross_command() + [f"-march={ARCH}", f"-O{opt}", "-o", target, source]
+        subprocess.run(cmd, check=True)
+        outputs.append(target)
+        print(f"  {name}.py -> {os.path.relpath(target, ROOT)}")
+
+    stub = os.path.join(out_dir, "main.py")
+    with open(stub, "w") as f:
+        f.write(MAIN_STUB)
+    outputs.append(stub)
+
+    return outputs
+
+
+def write_manifest(path, opt):
+    """
+    Fagyasztási manifest a MicroPython rp2 port buildjéhez
+
+    Firmware build:
+        make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=<path>
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write('include("$(PORT_DIR)/boards/manifest.py")\n')
+        for name in ("config",) + tuple(config.FLIGHT_MODULES):
+            f.write(f'module("{name}.py", base_path="{ROOT}", opt={opt})\n')
+    print(f"  manifest: {os.path.relpath(path, ROOT)}")
+
+
+def mpremote(port, *args):
+    """mpremote parancs futtatása, kimenet visszaadása"""
+    cmd = ["mpremote", "connect", port] + list(args)
+    return subprocess.run(cmd, check=False, capture_output=True, text=True).stdout
+
+
+def run_benchmark(port, variant, mpy_dir):
+    """
+    Modulok feltöltése (forrás vagy .mpy) és a benchmark futtatása
+
+    Returns:
+        str: A BENCH sor vagy None
+    """
+    names = ("config",) + tuple(config.FLIGHT_MODULES)
+
+    for name in names:
+        # A másik változat eltávolítása, hogy az import ne azt találja meg
+        stale = name + (".mpy" if variant == "source" else ".py")
+        mpremote(port, "fs", "rm", ":" + stale)
+
+        if variant == "source":
+            local = os.path.join(ROOT, name + ".py")
+        else:
+            local = os.path.join(mpy_dir, name + ".mpy")
+        mpremote(port, "fs", "cp", local, ":")
+
+    output = mpremote(port, "soft-reset", "run", os.path.join(ROOT, "boot_benchmark.py"))
+    for line in output.splitlines():
+        if line.startswith("BENCH,"):
+            return line
+    return None
+
+
+def print_comparison(results):
+    """Benchmark eredmények táblázatos összevetése"""
+    print()
+    print(f"{'variant':8} {'import ms':>10} {'free before':>12} {'free after':>11} {'heap used':>10}")
+    for line in results:
+        _, variant, total_us, free_before, free_after, _ = line.split(",", 5)
+        used = int(free_before) - int(free_after)
+        print(f"{variant:8} {int(total_us) / 1000:10.1f} {free_before:>12} {free_after:>11} {used:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CanSat repülési modulok fordítása")
+    parser.add_argument("--out", default=os.path.join(ROOT, "build", "mpy"), help="kimeneti könyvtár")
+    parser.add_argument("-O", dest="opt", type=int, default=2, help="mpy-cross optimalizálási szint (0-3)")
+    parser.add_argument("--frozen", action="store_true", help="manifest írása fagyasztott firmware-hez")
+    parser.add_argument("--bench", metavar="PORT", help="indulási benchmark a megadott porton (mpremote)")
+    args = parser.parse_args()
+
+    print("Building .mpy modules...")
+    build_mpy(args.out, args.opt)
+
+    if args.frozen:
+        write_manifest(os.path.join(ROOT, "build", "manifest.py"), args.opt)
+
+    if args.bench:
+        results = []
+        for variant in ("source", "mpy"):
+            print(f"Benchmark: {variant}...")
+            line = run_benchmark(args.bench, variant, args.out)
+            if line is None:
+                print(f"  ERROR: no benchmark output ({variant})")
+                return 1
+            results.append(line)
+        print_comparison(results)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
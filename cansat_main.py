@@ -1,60 +1,148 @@
 """
 CanSat Főprogram
 Hőmérséklet, légnyomás, magasság és audio telemetria
+
+uasyncio ütemezés: barométer, mikrofon, rádió és SD külön taskban,
+mindegyik a saját ütemében, korlátos sorokkal összekötve; a LED jelzéseket
+timer vezérelt mintamotor játssza le, így nem késleltetik a taskokat
 """
 
 from machine import I2C, Pin
 import time
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
 import config
-import bmp280
+import barometers
 from microphone_i2s import I2S_Microphone
 from led_controller import LEDController
 from sd_logger import SDLogger
-from lora_radio import LoRaRadio
+from lora_radio import LoRaRadio, AirtimeBudget
+from async_queue import BoundedQueue
+from audio_worker import SPSCBuffer, AudioWorker
+from acoustic_event import EventRecorder
+from downlink import BulkDownlink
+from uplink import UplinkAuth
+from loop_timing import FixedRateTimer
+from profiler import Profiler, BootReport
+from heap_monitor import HeapMonitor
+import flight_phase
+import altitude
+from kalman import AltitudeKalman
+from stream_filter import ChannelFilter
+from watchdog import StateStore, Supervisor, reset_cause_name
 
 # ===== GLOBÁLIS VÁLTOZÓK =====
 packet_counter = 0
 mission_time = 0
 start_time = 0
+first_packet_time = None
+mic = None
+audio_worker = None
+recorder = None  # Akusztikus esemény gyűrű (csak kétmagos módban)
+event_file = 0   # Utolsó használt esemény fájl sorszáma
+mic_samples = config.MIC_SAMPLE_COUNT
+lora_profile = config.LORA_DEFAULT_PROFILE
+reset_cause = ''
+restored = None  # Újraindulás után visszaállított állapot (dict)
+
+# Legfrissebb mért értékek (a mintavevő taskok frissítik)
+latest = {
+    'temp': 0.0,
+    'pres': 0.0,
+    'altitude': 0.0,
+    'audio_rms': 0.0,
+    'audio_peak': 0.0,
+    'phase': flight_phase.PHASES.index(flight_phase.PAD),
+    'kf_alt': 0.0,      # Kalman becslés: magasság,
+    'kf_vel': 0.0,      # függőleges sebesség,
+    'kf_apogee': 0.0,   # előrejelzett csúcsmagasság
+    'lora_profile': config.LORA_DEFAULT_PROFILE,  # Kért profil (a rádió task váltja)
+    'bmp_preset': config.BMP_PRESET,  # Kért BMP280 beállítás (a barométer task váltja)
+}
+
+# A rádiót a telemetria és a tömeges letöltés felváltva használja
+# (a flight() hozza létre, így újraindított ütemezőnél sem marad foglalt)
+radio_lock = None
+downlink = None  # BulkDownlink, földet érés után
+downlink_mode = None  # DL parancs: None = automatikus (LANDED), True / False = kézi
+
+# Feltöltött parancsok ellenőrzése, újraküldhető telemetria csomagok
+uplink = UplinkAuth(counter_file=config.UPLINK_COUNTER_FILENAME)
+sent_history = []  # (sorszám, csomag), legfeljebb UPLINK_HISTORY
+
+# Magasság táblázat (a háttér inicializálás építi fel, addig pontos képlet)
+alt_table = None
+
+# Kiírásra váró nyers barométer sorok (config.LOG_RAW_BARO)
+raw_lines = []
+
+# Repülési fázis felismerő (a Kalman szűrő becslésével)
+detector = flight_phase.FlightPhaseDetector()
+kalman = AltitudeKalman()
+
+# Kiugró minták szűrése csatornánként (az olvasás és a felhasználók között)
+filters = {name: ChannelFilter(**params) for name, params in config.SENSOR_FILTERS.items()}
+
+# Periodikus taskok időzítői (drift-mentes határidő ütemezés)
+timers = {
+    'baro': FixedRateTimer(config.BARO_INTERVAL_MS, 'baro'),
+    'audio': FixedRateTimer(config.AUDIO_INTERVAL_MS, 'audio'),
+    'telemetry': FixedRateTimer(int(config.TELEMETRY_INTERVAL * 1000), 'telemetry'),
+}
+
+# Lépésenkénti futásidő profilozó
+profiler = Profiler(('sensor', 'rms', 'encode', 'tx', 'sd'))
+
+# Indulási idő bontás
+boot = BootReport()
+
+# Heap figyelés, GC a tétlen időben
+heap = HeapMonitor(config.GC_THRESHOLD, config.GC_IDLE_BUDGET, config.GC_MIN_SLACK_MS)
+
+# Watchdog felügyelet és utolsó jó állapot
+store = StateStore(config.STATE_FILENAME)
+supervisor = Supervisor(config.WDT_TIMEOUT_MS)
+profiler.stage_hook = store.mark_stage
 
 # ===== INICIALIZÁLÁS =====
 
 def init_system():
-    """Rendszer inicializálása"""
+    """
+    Gyors indulás: csak a LED, a barométer és a rádió inicializálása
+
+    Az SD kártya és a mikrofon a háttérben indul (background_init_task),
+    így a mintavétel és az adás ezekre nem vár.
+
+    Returns:
+        tuple: (led, sensor, lora, sd) - az SD még nincs csatolva
+    """
     global start_time
 
     # LED vezérlő
+    t0 = time.ticks_ms()
     led = LEDController(config.LED_STATUS_GREEN, config.LED_ERROR_RED)
     led.status_on()
+    boot.mark('led', t0)
 
-    # BMP280 szenzor
+    # BMP280 szenzor(ok): minden chip ID szerint talált szenzor, szavazással
+    t0 = time.ticks_ms()
     sensor = None
     try:
         i2c = I2C(0, scl=Pin(config.I2C_SCL), sda=Pin(config.I2C_SDA), freq=config.I2C_FREQ)
-        time.sleep_ms(100)
-
-        devices = i2c.scan()
-        if devices:
-            bmp_addr = devices[0]
-            chip_id = i2c.readfrom_mem(bmp_addr, 0xD0, 1)[0]
-            if chip_id == 0x58:
-                sensor = bmp280.BMP280(i2c, addr=bmp_addr)
-    except:
-        led.error_blink(3)
-
-    # I2S Mikrofon
-    mic = I2S_Microphone(
-        sck_pin=config.I2S_SCK,
-        ws_pin=config.I2S_WS,
-        sd_pin=config.I2S_SD,
-        sample_rate=config.MIC_SAMPLE_RATE,
-        bits=config.MIC_BITS
-    )
 
-    if not mic.initialized:
-        led.error_blink(3)
+        sensors = barometers.scan(i2c, config.BMP_PRESET)
+        if sensors:
+            sensor = barometers.BarometerArray(sensors)
+        else:
+            led.show_error(3)
+    except:
+        led.show_error(3)
+    boot.mark('baro', t0)
 
     # LoRa rádió
+    t0 = time.ticks_ms()
     lora = LoRaRadio(
         sck_pin=config.LORA_SCK,
         mosi_pin=config.LORA_MOSI,
@@ -71,9 +159,11 @@ def init_system():
         bandwidth=config.LORA_BANDWIDTH,
         coding_rate=config.LORA_CODING_RATE
     ):
-        led.error_blink(3)
+        led.show_error(3)
+    lora.budget = AirtimeBudget(config.DL_DUTY_CYCLE, config.DL_DUTY_WINDOW_MS)
+    boot.mark('lora', t0)
 
-    # SD kártya
+    # SD kártya (csak az SPI, csatolás a háttérben)
     sd = SDLogger(
         sck_pin=config.SD_SCK,
         mosi_pin=config.SD_MOSI,
@@ -81,132 +171,852 @@ def init_system():
         cs_pin=config.SD_CS
     )
 
-    if sd.mount():
-        sd.write_header(config.LOG_FILENAME)
-    else:
-        led.error_blink(2)
-
     start_time = time.ticks_ms()
 
-    return led, sensor, mic, lora, sd
+    return led, sensor, lora, sd
 
 
-def read_sensors(sensor, mic):
+def restore_state(lora, sd):
     """
-    Szenzorok olvasása
+    Utolsó jó állapot visszaállítása újraindulás után
+
+    A sorszám, a repülési fázis és a földi referencia folytatódik, a rádió
+    bejelentés nélkül rögtön a fázis profiljára áll (a vevőállomás már
+    azon hallgat). Bekapcsoláskor a földet ért állapot új küldetést jelent.
+    """
+    global packet_counter, lora_profile, reset_cause, restored
+
+    reset_cause = reset_cause_name()
+    state = store.load()
+    if state is None:
+        return
+
+    phase = flight_phase.PHASES[state['phase']] if state['phase'] < len(flight_phase.PHASES) else flight_phase.PAD
+    if reset_cause == 'pwron' and phase == flight_phase.LANDED:
+        store.clear()
+        return
+
+    restored = state
+    packet_counter = state['seq']
+    sd.offset = state['log_offset']
+    detector.restore(phase, state['ground_alt'], state['max_alt'])
+
+    profile = config.PHASE_PROFILES[phase]['lora']
+    try:
+        lora.set_profile(**config.LORA_PROFILES[profile])
+        lora_profile = profile
+    except:
+        pass
+
+
+def save_state(sd, reason=''):
+    """
+    Állapot mentése: mindig a scratch regiszterekbe, okkal (vagy
+    periodikusan, fázisváltáskor) a flash-re is
+
+    Args:
+        sd: SD logger (a log pozícióhoz)
+        reason: Ha nem üres, flash mentés ezzel az okkal
+    """
+    ground_alt = detector.ground_alt or 0.0
+    store.save_fast(packet_counter, latest['phase'], sd.offset, ground_alt, detector.max_alt)
+    if reason:
+        store.save_flash(packet_counter, latest['phase'], sd.offset, ground_alt,
+                         detector.max_alt, reason)
+
+
+def init_microphone():
+    """
+    I2S mikrofon inicializálása
 
     Returns:
-        tuple: (temperature, pressure, altitude, audio_rms) vagy None hiba esetén
+        I2S_Microphone: Mikrofon példány (initialized=False hiba esetén)
+    """
+    return I2S_Microphone(
+        sck_pin=config.I2S_SCK,
+        ws_pin=config.I2S_WS,
+        sd_pin=config.I2S_SD,
+        sample_rate=config.MIC_SAMPLE_RATE,
+        bits=config.MIC_BITS
+    )
+
+
+def read_sensors(sensor):
+    """
+    BMP280 szenzor olvasása (szűretlen)
+
+    Returns:
+        tuple: (temperature, pressure) vagy None hiba esetén
     """
     try:
-        # BMP280 olvasása
         if sensor:
-            pres, temp = sensor.read()
-            # Magasság számítás
-            altitude = 44330 * (1 - (pres / config.SEA_LEVEL_PRESSURE) ** 0.1903)
+            data = sensor.read()
+            if data is None:
+                # Az első konverzió még nem készült el
+                return None
+            pres, temp = data
         else:
             temp = 0.0
             pres = 0.0
-            altitude = 0.0
 
-        # Mikrofon RMS olvasása
-        if mic and mic.initialized:
-            audio_rms = mic.get_rms_level(config.MIC_SAMPLE_COUNT)
-        else:
-            audio_rms = 0.0
+        return temp, pres
 
-        return temp, pres, altitude, audio_rms
+    except:
+        return None
 
+
+def pressure_altitude(pres, temp):
+    """
+    Magasság a légnyomásból (config.ALT_MODE szerint)
+
+    Táblázatból, ha már elkészült; indulás után a pontos képlettel.
+    """
+    if alt_table:
+        return alt_table.altitude(pres, temp)
+    if config.ALT_MODE == 'hypsometric':
+        return altitude.hypsometric(pres, temp)
+    return altitude.isa(pres)
+
+
+def read_audio(mic):
+    """
+    Mikrofon RMS és csúcsérték olvasása
+
+    Returns:
+        tuple: (audio_rms, audio_peak) vagy None hiba esetén
+    """
+    try:
+        if mic and mic.initialized:
+            return mic.read_features(mic_samples)
+        return 0.0, 0.0
     except:
         return None
 
 
-def send_telemetry(lora, led, temp, pres, altitude, audio_rms):
+def start_audio_worker(mic):
     """
-    Telemetria küldése LoRa-n
+    Audio worker indítása a második magon
 
     Returns:
-        bool: Sikeres-e a küldés
+        SPSCBuffer: A worker kimeneti puffere vagy None, ha nem indult el
     """
-    global packet_counter
+    global audio_worker, recorder
 
-    packet_counter += 1
-    packet_id = (config.MISSION_ID, packet_counter)
+    if not (config.AUDIO_ON_CORE1 and mic and mic.initialized):
+        return None
+
+    # Újraindított ütemező esetén a worker már fut
+    if audio_worker:
+        return audio_worker.buffer
+
+    # Esemény gyűrű: folyamatos mintavétel kell hozzá, ezért csak itt
+    if config.EVENT_ENABLED and recorder is None:
+        try:
+            recorder = EventRecorder(
+                config.EVENT_BLOCK_SAMPLES, config.MIC_BITS // 8, config.MIC_SAMPLE_RATE,
+                config.EVENT_PRE_MS, config.EVENT_POST_MS,
+                config.EVENT_RMS_THRESHOLD, config.EVENT_PEAK_THRESHOLD,
+                config.EVENT_HOLDOFF_MS)
+        except MemoryError:
+            recorder = None
 
     try:
-        success = lora.send_telemetry(packet_id, temp, pres, altitude, audio_rms)
+        audio_buffer = SPSCBuffer(config.AUDIO_BUFFER_SIZE, AudioWorker.WIDTH)
+        audio_worker = AudioWorker(mic, audio_buffer, mic_samples, recorder=recorder)
+        audio_worker.start()
+        return audio_buffer
+    except:
+        audio_worker = None
+        return None
+
+
+def apply_phase_profile(phase):
+    """
+    Fázishoz tartozó mintavételi, audio, telemetria és rádió beállítások
+
+    A periódusok a következő határidőtől érvényesek; a LoRa profilváltást
+    a rádió task végzi két adás között.
+    """
+    global mic_samples
+
+    profile = config.PHASE_PROFILES[phase]
+
+    timers['baro'].set_period(profile['baro_ms'])
+    timers['audio'].set_period(profile['audio_ms'])
+    timers['telemetry'].set_period(profile['telemetry_ms'])
+
+    mic_samples = profile['mic_samples']
+    if audio_worker:
+        audio_worker.num_samples = mic_samples
+
+    latest['phase'] = flight_phase.PHASES.index(phase)
+    latest['lora_profile'] = profile['lora']
+    latest['bmp_preset'] = profile['bmp']
+
+
+def idle_collect():
+    """
+    Tétlen idejű GC: csak ha a legközelebbi határidőig (bármely taskét
+    figyelembe véve) elegendő idő van hátra
+    """
+    now = time.ticks_ms()
+    slack = None
+    for timer in timers.values():
+        if timer.deadline is not None:
+            remaining = time.ticks_diff(timer.deadline, now)
+            if slack is None or remaining < slack:
+                slack = remaining
+
+    if slack is not None:
+        heap.maybe_collect(slack)
+
+
+# ===== TASKOK =====
+
+async def baro_task(sensor, led):
+    """BMP280 mintavétel saját ütemben, a legfrissebb értékek frissítése"""
+    timer = timers['baro']
+    while True:
+        deadline = await timer.wait()
+        supervisor.feed('baro')
+
+        # Fázisváltás után új túlmintavétel / IIR / standby beállítás
+        if sensor and sensor.preset != latest['bmp_preset']:
+            try:
+                sensor.set_preset(latest['bmp_preset'])
+            except:
+                profiler.error('sensor')
+
+        t0 = profiler.start('sensor')
+        sensor_data = read_sensors(sensor)
+
+        if sensor_data:
+            temp, pres = sensor_data
+            alt = 0.0
+
+            if sensor:
+                # Kiugró minták helyett medián, a magasság már a szűrt nyomásból
+                temp = filters['temp'].update(temp)
+                pres = filters['pres'].update(pres)
+                alt = pressure_altitude(pres, temp)
+
+                # Minden minta a Kalman szűrőbe (a mintaköz a határidőkből)
+                kalman.update(alt, deadline)
+                latest['kf_alt'] = kalman.altitude
+                latest['kf_vel'] = kalman.velocity
+                latest['kf_apogee'] = kalman.apogee()
+
+            latest['temp'], latest['pres'], latest['altitude'] = temp, pres, alt
+            profiler.record('sensor', t0)
+
+            # Nyers ADC értékek a földi újrafeldolgozáshoz (tele puffer: eldobva);
+            # ha a naplózott szenzor ebből a fúzióból kimaradt, nincs sor
+            if (config.LOG_RAW_BARO and sensor and sensor.adc_p is not None
+                    and len(raw_lines) < config.RAW_BARO_MAX_LINES):
+                raw_lines.append(f"{time.ticks_diff(deadline, start_time)},{sensor.adc_p},{sensor.adc_t}")
+
+            # Repülési fázis követése a szűrt magasság és sebesség alapján
+            if sensor:
+                detector.update(latest['kf_alt'], deadline, latest['kf_vel'])
+                if detector.changed:
+                    apply_phase_profile(detector.phase)
+        else:
+            # Szenzor olvasási hiba
+            profiler.error('sensor')
+            led.show_error(1)
+
+
+async def audio_task(led):
+    """Mikrofon RMS mérés saját ütemben (egymagos mód)"""
+    timer = timers['audio']
+    while True:
+        await timer.wait()
+        supervisor.feed('audio')
+
+        t0 = profiler.start('rms')
+        audio_data = read_audio(mic)
+
+        if audio_data:
+            profiler.record('rms', t0)
+            latest['audio_rms'], latest['audio_peak'] = audio_data
+        else:
+            profiler.error('rms')
+            led.show_error(1)
+
+
+async def audio_drain_task(audio_buffer):
+    """
+    A core 1 worker eredményeinek átvétele (kétmagos mód)
+
+    Az utolsó RMS és az időszak legnagyobb csúcsértéke kerül a telemetriába.
+    """
+    timer = timers['audio']
+    values = [0.0, 0.0, 0.0]
+    while True:
+        await timer.wait()
+
+        peak = -1.0
+        while audio_buffer.pop_into(values):
+            profiler.add('rms', int(values[2]))
+            latest['audio_rms'] = values[0]
+            if values[1] > peak:
+                peak = values[1]
+
+        if peak >= 0:
+            latest['audio_peak'] = peak
+            # Csak akkor jelentkezik, ha a második mag is dolgozik
+            supervisor.feed('audio')
+
+
+def next_event_file():
+    """Következő szabad esemény fájlnév (újraindulás után sem ír felül)"""
+    global event_file
+
+    while event_file < config.EVENT_MAX_FILES:
+        event_file += 1
+        filename = f"{config.EVENT_FILE_PREFIX}{event_file:03d}.wav"
+        if SDLogger.file_size(filename) == 0:
+            return filename
+    return None
+
+
+async def event_task(sd, radio_queue):
+    """
+    Kész akusztikus esemény mentése (WAV) és összegzés küldése
+
+    A gyűrű a mentés végéig befagyott, a core 1 addig is mér (a
+    telemetria RMS / csúcs értéke folyamatos). Az írás blokkcsoportonként
+    történik, közben a többi task fut.
+    """
+    while True:
+        await asyncio.sleep_ms(config.EVENT_POLL_MS)
+        if not recorder.ready:
+            continue
+
+        t_ms = time.ticks_diff(recorder.trigger_ms, start_time)
+        radio_queue.put_nowait(recorder.summary(config.MISSION_ID, t_ms))
+
+        filename = next_event_file() if sd.mounted else None
+        ok = filename is not None
+        if ok:
+            t0 = profiler.start('sd')
+            ok = sd.write_bytes(filename, (recorder.wav_header(),), append=False)
+            group = []
+            for block in recorder.window_blocks():
+                group.append(block)
+                if len(group) == config.EVENT_WRITE_BLOCKS:
+                    ok = ok and sd.write_bytes(filename, group)
+                    group = []
+                    await asyncio.sleep_ms(0)
+            if group:
+                ok = ok and sd.write_bytes(filename, group)
+            if ok:
+                profiler.record('sd', t0)
+            else:
+                profiler.error('sd')
+
+        timestamp = t_ms / 1000.0
+        sd.append_line(config.EVENT_LOG_FILENAME,
+                       f"{timestamp},{recorder.count},{recorder.peak:.3f},"
+                       f"{recorder.rms_max:.3f},{recorder.duration_ms()},"
+                       f"{filename if ok else ''}")
+        recorder.release()
+
+
+async def telemetry_task(radio_queue, sd_queue):
+    """Telemetria rekord összeállítása és továbbítása a rádió és SD soroknak"""
+    global mission_time
+
+    timer = timers['telemetry']
+    while True:
+        # Névleges (határidő) időbélyeg: egyenletes mintaköz a földi feldolgozáshoz
+        deadline = await timer.wait()
+        supervisor.feed('telemetry')
+
+        mission_time = time.ticks_diff(deadline, start_time) / 1000.0
+        heap.sample()
+
+        record = (mission_time, latest['temp'], latest['pres'],
+                  latest['altitude'], latest['audio_rms'], latest['phase'],
+                  (latest['kf_alt'], latest['kf_vel'], latest['kf_apogee']))
+        radio_queue.put_nowait(record)
+        sd_queue.put_nowait(record)
+
+
+async def radio_task(lora, radio_queue, sd, led):
+    """
+    LoRa küldés: az adás ideje alatt a többi task tovább fut
+
+    A sor elemei telemetria rekordok vagy kész szöveges csomagok
+    (pl. housekeeping).
+    """
+    global packet_counter, lora_profile, first_packet_time
+
+    last_telemetry = time.ticks_ms()
+    while True:
+        item = await radio_queue.get()
+        supervisor.feed('radio')
+
+        if isinstance(item, str):
+            t0 = profiler.start('tx')
+            async with radio_lock:
+                success = await lora.send_async(item)
+            if success:
+                profiler.record('tx', t0)
+            else:
+                profiler.error('tx')
+            continue
+
+        # Tömeges letöltés közben ritkított telemetria (duty cycle keret)
+        if downlink and time.ticks_diff(time.ticks_ms(), last_telemetry) < config.DL_TELEMETRY_MS:
+            continue
+        last_telemetry = time.ticks_ms()
+
+        _, temp, pres, _, audio_rms, phase, estimate = item
+
+        # Profilváltás két adás között: előbb bejelentés a régi profilon,
+        # hogy a vevőállomás követni tudja
+        if latest['lora_profile'] != lora_profile:
+            try:
+                async with radio_lock:
+                    await lora.send_async(lora.format_phase_announce(
+                        config.MISSION_ID, phase, latest['lora_profile']))
+                    lora.set_profile(**config.LORA_PROFILES[latest['lora_profile']])
+                lora_profile = latest['lora_profile']
+            except:
+                led.show_error(1)
+
+        packet_counter += 1
+        packet_id = (config.MISSION_ID, packet_counter)
+
+        try:
+            t0 = profiler.start('encode')
+            # Rádión a szűrt magasság megy, sebességgel és csúcspont előrejelzéssel
+            kf_alt, kf_vel, kf_apogee = estimate
+            message = lora.format_telemetry(packet_id, temp, pres, kf_alt, audio_rms, phase,
+                                            kf_vel, kf_apogee)
+            profiler.record('encode', t0)
+
+            t0 = profiler.start('tx')
+            async with radio_lock:
+                success = await lora.send_async(message)
+        except:
+            success = False
+
         if success:
-            led.heartbeat()
+            profiler.record('tx', t0)
+            led.show('heartbeat')
+            if first_packet_time is None:
+                # Reset -> első telemetria csomag
+                first_packet_time = time.ticks_ms()
+            if len(sent_history) >= config.UPLINK_HISTORY:
+                sent_history.pop(0)
+            sent_history.append((packet_counter, message))
+            if config.UPLINK_ENABLED:
+                await command_window(lora, radio_queue)
         else:
-            led.error_blink(1)
-        return success
-    except:
-        led.error_blink(1)
-        return False
+            profiler.error('tx')
+            led.show_error(1)
+
+        # Utolsó jó állapot a scratch regiszterekbe
+        save_state(sd)
+
+
+async def command_window(lora, radio_queue):
+    """
+    Vételi ablak egy telemetria adás után a földi parancsra
+
+    Az ablak a leghosszabb parancs adásideje plusz a földi reakcióidő, de
+    legkésőbb a következő telemetria határidő előtt UPLINK_GUARD_MS-mal
+    zár. A vétel alatt a mintavevő taskok futnak.
+    """
+    window = config.UPLINK_RX_MARGIN_MS + int(lora.airtime_ms(config.UPLINK_MAX_LEN))
+    deadline = timers['telemetry'].deadline
+    if deadline is not None:
+        window = min(window, time.ticks_diff(deadline, time.ticks_ms()) - config.UPLINK_GUARD_MS)
+    if window <= 0:
+        return
+
+    async with radio_lock:
+        data = await lora.receive_async(window)
+    if data:
+        handle_uplink(data, radio_queue)
 
 
-def log_to_sd(sd, timestamp, temp, pres, altitude, audio_rms):
+def handle_uplink(data, radio_queue):
     """
-    Adatok mentése SD kártyára
+    Fogadott feltöltött csomag: parancs végrehajtása és nyugtázása,
+    letöltési hiánylista átadása
 
     Returns:
-        bool: Sikeres-e a mentés
+        bool: Érvényes (hitelesített) csomag volt-e
     """
-    try:
-        return sd.append_data(config.LOG_FILENAME, timestamp, temp, pres, altitude, audio_rms)
-    except:
+    global downlink_mode
+
+    body = uplink.verify(data)
+    if body is None:
         return False
 
+    # Vessző nélküli (értelmezhetetlen) csomag: elutasított parancs
+    fields = body.split(',', 2)
+    if len(fields) > 1 and fields[1] == 'NK':
+        if downlink and downlink.handle_nack(body):
+            downlink.save()
+        return True
 
-# ===== FŐ PROGRAM =====
+    command = uplink.parse_command(body)
+    if command is None:
+        return False
+    counter, cmd, arg, fresh = command
 
-def main():
-    """Fő program loop"""
-    global mission_time
+    status = 'dup'
+    if fresh:
+        status = 'ok'
+        try:
+            if cmd == 'TI':
+                period = int(arg)
+                if not config.UPLINK_TI_MIN_MS <= period <= config.UPLINK_TI_MAX_MS:
+                    raise ValueError
+                timers['telemetry'].set_period(period)
+            elif cmd == 'RP':
+                if arg not in config.LORA_PROFILES:
+                    raise ValueError
+                # A rádió task bejelentéssel vált a következő adás előtt
+                latest['lora_profile'] = arg
+            elif cmd == 'RT':
+                first, _, last = arg.partition('-')
+                first = int(first)
+                last = int(last or first)
+                # Csak a sor szabad helyeire (egy hely a nyugtának marad),
+                # különben a tele sor a régebbi csomagokat csendben eldobná;
+                # a nyugta jelzi, meddig ment ki, a többi újra kérhető
+                room = radio_queue.maxsize - len(radio_queue) - 1
+                queued = first - 1
+                for seq, message in sent_history:
+                    if first <= seq <= last:
+                        if room <= 0:
+                            status = f'part:{queued}'
+                            break
+                        radio_queue.put_nowait(message)
+                        queued = seq
+                        room -= 1
+            elif cmd == 'DL':
+                downlink_mode = {'1': True, '0': False}.get(arg)
+        except:
+            status = 'err'
 
-    # Rendszer inicializálása
-    led, sensor, mic, lora, sd = init_system()
+    radio_queue.put_nowait(uplink.ack(counter, status))
+    return True
 
-    # Késleltetés a startra
-    time.sleep(2)
 
-    # Fő loop
-    last_telemetry_time = 0
+def downlink_wanted(sd):
+    """Fut-e a tömeges letöltés (DL parancs, egyébként földet érés után)"""
+    if not sd.mounted:
+        return False
+    if downlink_mode is not None:
+        return downlink_mode
+    return config.DL_ENABLED and detector.phase == flight_phase.LANDED
+
+
+async def downlink_task(lora, sd, radio_queue):
+    """
+    Tömeges letöltés földet érés után (vagy DL parancsra): az SD log
+    darabokban LoRa-n
+
+    Darabonként megvárja a duty cycle keretet, DL_POLL_EVERY darab (és
+    minden kör) után lekérdez és rövid vételi ablakot nyit a földi
+    hiánylistára (vagy parancsra). Az állapot minden nyugta után az SD
+    kártyára kerül. Inicializálatlan rádióval (sikertelen lora.init())
+    a task csak vár: a modem beállítások ilyenkor nincsenek meg.
+    """
+    global downlink
+
+    sent = 0
+    while True:
+        if not lora.initialized or not downlink_wanted(sd):
+            downlink = None
+            await asyncio.sleep_ms(config.DL_CHECK_MS)
+            continue
+
+        if downlink is None:
+            try:
+                downlink = BulkDownlink()
+                downlink.start()
+            except:
+                downlink = None
+                await asyncio.sleep_ms(config.DL_IDLE_MS)
+                continue
+            sent = 0
+
+        index = None if sent >= config.DL_POLL_EVERY else downlink.next_index()
+
+        if index is None:
+            # Lekérdezés és vételi ablak (a rádió közben nem adhat)
+            if not downlink.done:
+                async with radio_lock:
+                    await lora.send_async(downlink.poll_frame())
+                    reply = await lora.receive_async(config.DL_RX_WINDOW_MS)
+                if reply:
+                    handle_uplink(reply, radio_queue)
+            sent = 0
+            if not downlink.refresh():
+                await asyncio.sleep_ms(config.DL_IDLE_MS)
+            continue
+
+        frame = downlink.chunk_frame(index)
+        airtime = lora.airtime_ms(len(frame))
+        # A várakozás alatt a telemetria is fogyaszthat a keretből
+        wait = lora.budget.wait_ms(airtime)
+        while wait:
+            await asyncio.sleep_ms(wait)
+            wait = lora.budget.wait_ms(airtime)
+
+        t0 = profiler.start('tx')
+        async with radio_lock:
+            success = await lora.send_async(frame)
+        if success:
+            profiler.record('tx', t0)
+        else:
+            profiler.error('tx')
+        sent += 1
+
 
+async def sd_task(sd, sd_queue, led):
+    """SD mentés: a rekordok bufferelése, írás SD_BUFFER_SIZE rekordonként"""
     while True:
+        timestamp, temp, pres, altitude, audio_rms, phase, estimate = await sd_queue.get()
+        supervisor.feed('sd')
+
+        if not sd.mounted:
+            continue
+
+        sd.buffer_data(sd.format_data(timestamp, temp, pres, altitude, audio_rms, phase, estimate))
+
+        if len(sd.buffer) >= config.SD_BUFFER_SIZE:
+            t0 = profiler.start('sd')
+            try:
+                ok = sd.flush_buffer(config.LOG_FILENAME)
+                if raw_lines and sd.append_lines(config.RAW_LOG_FILENAME, raw_lines):
+                    raw_lines.clear()
+            except:
+                ok = False
+
+            if ok:
+                profiler.record('sd', t0)
+            else:
+                profiler.error('sd')
+                led.show_error(2)
+
+
+async def timing_report_task(sd):
+    """
+    Időzítési statisztikák (túlfutás, jitter, slack hisztogram) mentése
+
+    Minden riport után a statisztikák nullázódnak, így egy sor mindig
+    az utolsó TIMING_REPORT_INTERVAL_MS időszakot írja le.
+    """
+    while True:
+        await asyncio.sleep_ms(config.TIMING_REPORT_INTERVAL_MS)
+
+        timestamp = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        for timer in timers.values():
+            sd.append_line(config.TIMING_LOG_FILENAME, f"{timestamp},{timer.report()}")
+            timer.reset_stats()
+
+
+async def housekeeping_task(sd, sensor, radio_queue):
+    """
+    Profilozó összegzés: housekeeping csomag LoRa-n, részletes riport SD-re
+
+    A csomag a telemetriával azonos sorba kerül, így a rádió task két
+    telemetria adás között küldi el.
+    """
+    while True:
+        await asyncio.sleep_ms(config.HK_INTERVAL_MS)
+
+        radio_queue.put_nowait(profiler.housekeeping(config.MISSION_ID, heap.summary()))
+
+        # Szenzor állapot külön csomagban (egy LoRa csomag legfeljebb 255 bájt)
+        window = time.ticks_diff(time.ticks_ms(), profiler.window_start)
+        health = [f"f_{name}={f.summary()}" for name, f in filters.items()]
+        if sensor:
+            health.insert(0, sensor.summary())
+        radio_queue.put_nowait(f"{config.MISSION_ID},HK,{window},{';'.join(health)}")
+
+        timestamp = time.ticks_diff(time.ticks_ms(), start_time) / 1000.0
+        for line in profiler.report_lines(timestamp):
+            sd.append_line(config.HK_LOG_FILENAME, line)
+        sd.append_line(config.HK_LOG_FILENAME,
+                       f"{timestamp},heap,{heap.summary()},{heap.gc_time.summary()}")
+        if sensor:
+            sd.append_line(config.HK_LOG_FILENAME, f"{timestamp},baro,{sensor.summary()}")
+            sensor.reset_stats()
+        for name, f in filters.items():
+            sd.append_line(config.HK_LOG_FILENAME, f"{timestamp},f_{name},{f.summary()}")
+            f.reset_stats()
+
+        profiler.reset()
+        heap.reset()
+
+
+async def state_task(sd):
+    """
+    Állapotmentés a flash-re: periodikusan és fázisváltás után
+
+    A fázisváltást a barométer task jelzi (latest['phase']); a lassú flash
+    írás itt, a mintavételtől függetlenül történik.
+    """
+    saved_phase = latest['phase']
+    last_save = time.ticks_ms()
+    while True:
+        await asyncio.sleep_ms(config.WDT_CHECK_MS)
+
+        now = time.ticks_ms()
+        if latest['phase'] != saved_phase:
+            save_state(sd, 'phase')
+        elif time.ticks_diff(now, last_save) >= config.STATE_SAVE_INTERVAL_MS:
+            save_state(sd, 'periodic')
+        else:
+            continue
+
+        saved_phase = latest['phase']
+        last_save = now
+
+
+async def background_init_task(sd, sensor, led, radio_queue):
+    """
+    Háttér inicializálás: mikrofon (és audio feldolgozás), SD kártya
+
+    A barométer és a rádió ekkor már fut. Az indulási idő bontás az
+    első csomag elküldése után kerül az SD kártyára.
+    """
+    global mic, alt_table
+
+    # Magasság táblázat
+    if alt_table is None:
+        t0 = time.ticks_ms()
         try:
-            # Időbélyeg
-            current_time = time.ticks_ms()
-            mission_time = time.ticks_diff(current_time, start_time) / 1000.0
+            alt_table = altitude.AltitudeTable()
+        except:
+            pass
+        boot.mark('alt', t0)
+        await asyncio.sleep_ms(0)
+
+    # I2S Mikrofon
+    if mic is None:
+        t0 = time.ticks_ms()
+        mic = init_microphone()
+        boot.mark('mic', t0)
+        if not mic.initialized:
+            led.show_error(3)
 
-            # Telemetria intervallum ellenőrzése
-            if time.ticks_diff(current_time, last_telemetry_time) >= config.TELEMETRY_INTERVAL * 1000:
+    # Audio feldolgozás: második magon, ha lehet, egyébként itt
+    audio_buffer = start_audio_worker(mic)
+    if mic.initialized:
+        supervisor.register('audio', config.WDT_TASK_LIMITS_MS['audio'])
+    if audio_buffer:
+        asyncio.create_task(audio_drain_task(audio_buffer))
+        if recorder:
+            asyncio.create_task(event_task(sd, radio_queue))
+    else:
+        asyncio.create_task(audio_task(led))
+
+    await asyncio.sleep_ms(0)
+
+    # SD kártya
+    if not sd.mounted:
+        t0 = time.ticks_ms()
+        store.mark_stage('mount')
+        if sd.mount():
+            sd.write_header(config.LOG_FILENAME)
+            # Kalibráció minden induláskor a nyers minták elé
+            if config.LOG_RAW_BARO and sensor:
+                sd.append_line(config.RAW_LOG_FILENAME, "cal," + ",".join(str(c) for c in sensor.cal))
+        else:
+            led.show_error(2)
+        store.mark_stage(None)
+        boot.mark('sd', t0)
+
+    # Indulási riport (megvárja az első csomagot); újraindulás után a
+    # reset oka, az elakadt lépés és a visszaállított sorszám is, így a
+    # first_packet idő a helyreállási idő
+    while first_packet_time is None:
+        await asyncio.sleep_ms(100)
 
-                # Szenzorok olvasása
-                sensor_data = read_sensors(sensor, mic)
+    line = f"{boot.summary()};first_packet@{first_packet_time};reset={reset_cause}"
+    if restored:
+        line += (f";reason={restored['reason']};stage={restored['stage']}"
+                 f";seq={restored['seq']};log={restored['log_offset']}/{sd.offset}")
+    sd.append_line(config.BOOT_LOG_FILENAME, line)
 
-                if sensor_data:
-                    temp, pres, altitude, audio_rms = sensor_data
 
-                    # LoRa küldés
-                    send_telemetry(lora, led, temp, pres, altitude, audio_rms)
+async def flight(led, sensor, lora, sd):
+    """
+    Taskok indítása, összekötés korlátos sorokkal
 
-                    # SD mentés
-                    log_to_sd(sd, mission_time, temp, pres, altitude, audio_rms)
+    Az audio taskot a háttér inicializálás indítja a mikrofon után: ha az
+    audio a második magon fut, a core 0 csak átveszi az eredményeket,
+    egyébként a mikrofon is itt kerül mintavételezésre.
+    """
+    global radio_lock
 
-                else:
-                    # Szenzor olvasási hiba
-                    led.error_blink(1)
+    radio_queue = BoundedQueue(config.RADIO_QUEUE_SIZE)
+    sd_queue = BoundedQueue(config.SD_QUEUE_SIZE)
+    radio_lock = asyncio.Lock()
 
-                last_telemetry_time = current_time
+    # Újraindításkor a határidők a mostani időponttól indulnak
+    for timer in timers.values():
+        timer.restart()
 
-            # Kis várakozás
-            time.sleep_ms(50)
+    # Aktuális fázis beállításai
+    apply_phase_profile(detector.phase)
+
+    # GC: a barométer ciklusok közötti tétlen időben
+    heap.setup()
+    timers['baro'].idle_hook = idle_collect
+
+    # Taskfelügyelet (az audio a mikrofon indulása után kerül be)
+    for name in ('baro', 'telemetry', 'radio', 'sd'):
+        supervisor.register(name, config.WDT_TASK_LIMITS_MS[name])
+
+    def on_stall(name):
+        # Az ok a flash-re, mielőtt a watchdog újraindít
+        save_state(sd, f"hang:{name}")
+
+    await asyncio.gather(
+        baro_task(sensor, led),
+        telemetry_task(radio_queue, sd_queue),
+        radio_task(lora, radio_queue, sd, led),
+        sd_task(sd, sd_queue, led),
+        timing_report_task(sd),
+        housekeeping_task(sd, sensor, radio_queue),
+        state_task(sd),
+        background_init_task(sd, sensor, led, radio_queue),
+        downlink_task(lora, sd, radio_queue),
+        supervisor.run(config.WDT_CHECK_MS, on_stall),
+    )
+
+
+# ===== FŐ PROGRAM =====
+
+def main():
+    """Fő program: uasyncio ütemező indítása"""
+
+    # Rendszer inicializálása (barométer és rádió; SD, mikrofon a háttérben)
+    led, sensor, lora, sd = init_system()
+
+    # Újraindulás után: sorszám, fázis, földi referencia folytatása
+    restore_state(lora, sd)
+
+    while True:
+        try:
+            asyncio.run(flight(led, sensor, lora, sd))
 
         except Exception as e:
-            # Kritikus hiba
-            led.error_blink(5)
+            # Kritikus hiba: ütemező újraindítása tiszta állapotból
+            led.show_error(5)
             time.sleep(1)
+            asyncio.new_event_loop()
 
 
 # Program indítás
@@ -37,13 +37,83 @@ MIC_SAMPLE_RATE = 8000  # Hz (alacsonyabb a sávszélesség miatt)
 MIC_BITS = 16
 MIC_SAMPLE_COUNT = 128  # Minta darabszám RMS számításhoz
 
+# Több BMP280 (0x76 / 0x77): szavazás és állapotfigyelés (barometers.py)
+BARO_VOTE_TOL_HPA = 0.5   # Megengedett eltérés a mediántól (~4 m)
+BARO_MAX_ERRORS = 5       # Ennyi egymás utáni hiba után a szenzor kimarad...
+BARO_RETRY_READS = 50     # ...ennyi olvasásig, utána újrapróbálja
+
+# BMP280 mérési beállítás induláskor (bmp280.PRESETS: 'high_rate' ~150 Hz,
+# 'standard' ~75 Hz, 'low_noise' ~10 Hz, 'legacy' ~1 Hz)
+BMP_PRESET = 'low_noise'
+
 # === TELEMETRIA ===
 TELEMETRY_INTERVAL = 1.0  # másodperc (adatküldési gyakoriság)
 SEA_LEVEL_PRESSURE = 1013.25  # hPa (referencia légnyomás)
 
+# Magasság számítás (altitude.AltitudeTable): táblázat a repülési nyomástartományra
+ALT_MODE = 'isa'      # 'isa' (standard légkör) vagy 'hypsometric' (hőmérséklettel korrigált)
+ALT_P_MIN = 300.0     # hPa (~9 km)
+ALT_P_MAX = 1100.0    # hPa
+ALT_MAX_ERROR = 0.01  # m, megengedett interpolációs hiba a pontos képlethez képest
+
+# === ÜTEMEZÉS (uasyncio taskok) ===
+BARO_INTERVAL_MS = 100   # BMP280 mintavételi periódus
+AUDIO_INTERVAL_MS = 250  # Mikrofon RMS mérési periódus
+RADIO_QUEUE_SIZE = 4     # LoRa küldési sor mérete (tele sor: legrégebbi eldobva)
+SD_QUEUE_SIZE = 16       # SD írási sor mérete
+
+# === KÉTMAGOS FUTÁS (RP2040) ===
+AUDIO_ON_CORE1 = True    # Mikrofon mintavétel és feldolgozás a második magon
+AUDIO_BUFFER_SIZE = 16   # Magok közötti audio puffer mérete (bejegyzés)
+
+# === AKUSZTIKUS ESEMÉNYEK (acoustic_event.py, csak kétmagos módban) ===
+# Folyamatos mintavétel egy RAM gyűrűbe; küszöb átlépésekor a trigger
+# előtti és utáni ablak WAV fájlba kerül, az összegzés LoRa-n megy
+EVENT_ENABLED = True
+EVENT_BLOCK_SAMPLES = 128    # Minták blokkonként (8 kHz: 16 ms)
+EVENT_PRE_MS = 2000          # Trigger előtti ablak (RAM: 16 kB / s 16 biten)
+EVENT_POST_MS = 1000         # Trigger utáni ablak
+EVENT_RMS_THRESHOLD = 0.25   # Blokk RMS küszöb (0-1)
+EVENT_PEAK_THRESHOLD = 0.9   # Blokk csúcs küszöb (0-1)
+EVENT_HOLDOFF_MS = 1000      # Holtidő egy esemény mentése után
+EVENT_POLL_MS = 100          # Kész esemény ellenőrzése (core 0)
+EVENT_FILE_PREFIX = "/sd/event_"  # + sorszám + ".wav"
+EVENT_LOG_FILENAME = "/sd/event_log.csv"  # Eseményenként egy sor (idő, csúcs, RMS, fájl)
+EVENT_MAX_FILES = 50         # Ennyi fájl után csak az összegzés megy
+EVENT_WRITE_BLOCKS = 8       # Blokkok írásonként (közben a többi task fut)
+
+# === HEAP / GC ===
+GC_THRESHOLD = 32768     # Automatikus GC küszöb (bájt) - csak biztonsági háló
+GC_IDLE_BUDGET = 8192    # Ennyi új foglalás után gyűjt a tétlen időben (bájt)
+GC_MIN_SLACK_MS = 15     # Tétlen GC csak ennyi szabad idő esetén
+
+# === WATCHDOG / ÚJRAINDULÁS ===
+WDT_TIMEOUT_MS = 5000    # Hardveres watchdog időkorlát (RP2040: max ~8300)
+WDT_CHECK_MS = 1000      # Taskfelügyelet ellenőrzési periódusa
+# Taskonként a leghosszabb megengedett csend (ms) - a leglassabb fázis
+# periódusánál (LANDED) is nagyobb legyen
+WDT_TASK_LIMITS_MS = {
+    'baro': 10000,
+    'audio': 15000,
+    'telemetry': 25000,
+    'radio': 25000,
+    'sd': 25000,
+}
+STATE_FILENAME = "/state.csv"   # Utolsó jó állapot a flash-en (túléli a tápvesztést)
+STATE_SAVE_INTERVAL_MS = 5000   # Flash állapotmentés gyakorisága (és fázisváltáskor)
+
 # === SD KÁRTYA ===
 LOG_FILENAME = "/sd/cansat_log.csv"
+TIMING_LOG_FILENAME = "/sd/timing_log.csv"  # Ütemezési jitter / slack statisztika
+TIMING_REPORT_INTERVAL_MS = 60000  # Időzítési riport gyakorisága
+BOOT_LOG_FILENAME = "/sd/boot_log.csv"  # Indulási idő bontás perifériánként
+HK_LOG_FILENAME = "/sd/housekeeping_log.csv"  # Lépésenkénti futásidő / hiba statisztika
+HK_INTERVAL_MS = 30000  # Housekeeping csomag (LoRa + SD) gyakorisága
 SD_BUFFER_SIZE = 5  # Hány mérés után írjon SD-re
+# Nyers BMP280 ADC értékek és kalibráció mentése (földi újrafeldolgozás: bmp280_batch.py)
+LOG_RAW_BARO = False
+RAW_LOG_FILENAME = "/sd/baro_raw.csv"
+RAW_BARO_MAX_LINES = 200  # Kiírásra váró nyers sorok felső korlátja (RAM)
 
 # === LoRa BEÁLLÍTÁSOK ===
 LORA_FREQUENCY = 868.0  # MHz (Európa: 868 MHz, USA: 915 MHz)
@@ -52,5 +122,137 @@ LORA_BANDWIDTH = 125000  # Hz
 LORA_SPREADING_FACTOR = 7  # 7-12 (nagyobb = nagyobb hatótáv, de lassabb)
 LORA_CODING_RATE = 5  # 5-8
 
+# LoRa profilok (a repülési fázis szerint váltva)
+LORA_PROFILES = {
+    'robust': {'spreading_factor': 9, 'bandwidth': 125000, 'coding_rate': 5, 'tx_power': 17},
+    'normal': {'spreading_factor': 7, 'bandwidth': 125000, 'coding_rate': 5, 'tx_power': 14},
+    'fast':   {'spreading_factor': 7, 'bandwidth': 250000, 'coding_rate': 5, 'tx_power': 17},
+}
+LORA_DEFAULT_PROFILE = 'normal'  # Induláskor (a fenti LORA_* értékekkel egyezik)
+LORA_SCAN_TIMEOUT = 15  # másodperc csend után a vevő végigpróbálja a profilokat
+
+# === REPÜLÉSI FÁZISOK ===
+PHASE_LAUNCH_ALT = 20.0     # m a talaj felett -> emelkedés
+PHASE_APOGEE_DROP = 3.0     # m a maximum alatt -> csúcspont
+PHASE_DESCENT_DROP = 15.0   # m a maximum alatt -> ereszkedés
+PHASE_LANDED_BAND = 2.0     # m sávon belül marad...
+PHASE_LANDED_MS = 10000     # ...ennyi ideig -> földet ért
+PHASE_CONFIRM_SAMPLES = 3   # Megerősítő minták egy átmenethez
+
+# Csatornánkénti kiugrószűrés (stream_filter.ChannelFilter): Hampel ablak,
+# küszöb (szórás), legkisebb küszöb (hPa / °C), EMA együttható (1: nincs)
+SENSOR_FILTERS = {
+    'pres': {'window': 5, 'k': 3.0, 'min_dev': 0.1, 'alpha': 1.0},
+    'temp': {'window': 5, 'k': 3.0, 'min_dev': 0.5, 'alpha': 0.2},
+}
+
+# Kalman szűrő (magasság / sebesség / gyorsulás)
+KALMAN_MEAS_STD = 0.5     # m, barometrikus magasság zaja
+KALMAN_JERK_STD = 20.0    # m/s^3, modell bizonytalanság (indulás, ejtőernyő nyitás)
+KALMAN_GATE = 5.0         # szórás, ezen kívüli minta kiugrónak számít
+KALMAN_MAX_REJECTS = 3    # ennyi egymás utáni kiugró után a mérés elfogadva
+PHASE_APOGEE_VELOCITY = 0.0  # m/s, csúcspont: a becsült sebesség ez alá esik
+
+# Fázisonkénti beállítások: barométer / audio / telemetria periódus (ms),
+# RMS mintaszám, LoRa profil és BMP280 beállítás
+PHASE_PROFILES = {
+    'PAD':     {'baro_ms': 500, 'audio_ms': 1000, 'telemetry_ms': 2000, 'mic_samples': 128, 'lora': 'robust', 'bmp': 'low_noise'},
+    'ASCENT':  {'baro_ms': 20,  'audio_ms': 100,  'telemetry_ms': 500,  'mic_samples': 256, 'lora': 'fast', 'bmp': 'high_rate'},
+    'APOGEE':  {'baro_ms': 20,  'audio_ms': 100,  'telemetry_ms': 500,  'mic_samples': 256, 'lora': 'fast', 'bmp': 'high_rate'},
+    'DESCENT': {'baro_ms': 100, 'audio_ms': 250,  'telemetry_ms': 1000, 'mic_samples': 128, 'lora': 'normal', 'bmp': 'standard'},
+    'LANDED':  {'baro_ms': 2000, 'audio_ms': 5000, 'telemetry_ms': 10000, 'mic_samples': 128, 'lora': 'robust', 'bmp': 'low_noise'},
+}
+
+# === TÖMEGES LETÖLTÉS (downlink.py, földet érés után) ===
+DL_ENABLED = True
+DL_STATE_FILENAME = "/sd/downlink_state.bin"  # Nyugtázott darabok (folytatás újraindulás után)
+DL_CHUNK_SIZE = 220         # Log bájt csomagonként (fejléccel együtt <= 255)
+DL_POLL_EVERY = 16          # Ennyi darab után lekérdezés + vételi ablak
+DL_RX_WINDOW_MS = 1500      # Vételi ablak a földi hiánylistára
+DL_NACK_MAX_LEN = 200       # Hiánylista leghosszabb szövege (vevőállomás)
+# Duty cycle: 868.0-868.6 MHz: 1%, 869.4-869.65 MHz: 10% (ETSI EN 300 220)
+DL_DUTY_CYCLE = 0.01
+DL_DUTY_WINDOW_MS = 3600000  # Keret időablak (1 óra)
+DL_TELEMETRY_MS = 60000     # Letöltés közben ritkított telemetria
+DL_IDLE_MS = 30000          # Kész letöltés után ennyi időnként nézi a log növekedését
+DL_CHECK_MS = 1000          # Indítási feltétel (fázis, DL parancs) ellenőrzése
+
+# === FELTÖLTÉS (uplink.py): parancs ablak minden telemetria adás után ===
+UPLINK_ENABLED = True
+UPLINK_KEY = b"cosmig-change-me"  # Közös kulcs (a vevőállomáson is) - indulás előtt cserélni!
+UPLINK_MAC_LEN = 4          # MAC bájt (hexában kétszer ennyi karakter)
+UPLINK_COUNTER_FILENAME = "/uplink.ctr"  # Utolsó elfogadott parancs számláló (flash)
+UPLINK_MAX_LEN = 64         # Leghosszabb parancs csomag (az ablakhoz: ennek adásideje)
+UPLINK_RX_MARGIN_MS = 150   # Vételi ablak a parancs adásidején felül (földi reakcióidő)
+UPLINK_GUARD_MS = 20        # Az ablak ennyivel a következő telemetria határidő előtt zár
+UPLINK_HISTORY = 16         # Újraküldhető (RT) telemetria csomagok száma
+UPLINK_TI_MIN_MS = 200      # TI parancs határai
+UPLINK_TI_MAX_MS = 12000    # A telemetria / rádió / SD task periódusonként egyszer eteti a watchdogot
+UPLINK_RETRIES = 5          # Vevőállomás: nyugtázatlan parancs újraküldése
+
+# A telemetria periódus legfeljebb a fele lehet a periódusonként etetett
+# taskok watchdog határának, különben a Supervisor elakadást jelez
+_FED_PER_PERIOD_MS = min(WDT_TASK_LIMITS_MS[name] for name in ('telemetry', 'radio', 'sd'))
+assert 2 * UPLINK_TI_MAX_MS <= _FED_PER_PERIOD_MS, "UPLINK_TI_MAX_MS > WDT_TASK_LIMITS_MS / 2"
+for _name, _profile in PHASE_PROFILES.items():
+    assert 2 * _profile['telemetry_ms'] <= _FED_PER_PERIOD_MS, \
+        "PHASE_PROFILES[%s]['telemetry_ms'] > WDT_TASK_LIMITS_MS / 2" % _name
+
+# === VEVŐÁLLOMÁS / FÖLDI ESZKÖZÖK (gépen) ===
+# A vevő konzolra keretenként egy gépi sor is kerül (ground_merge.py forward)
+GROUND_FRAME_OUTPUT = False
+GROUND_DISPLAY = True        # Csomagonkénti szöveges kiírás (műszerfal mellett kikapcsolható)
+GROUND_FRAME_PREFIX = "@F "
+MERGE_PORT = 7410            # Összefésülő szerver (ground_merge.py serve)
+MERGE_HOLD_MS = 500          # Ennyi ideig gyűjti egy csomag példányait a vevőktől
+MERGE_FLUSH_MS = 50          # Lejárt csomagok kiírásának periódusa
+MERGE_MAX_PENDING = 1024     # Függő csomagok felső korlátja
+MERGE_MAX_SEEN = 8192        # Megjegyzett kiírt kulcsok (késő példányok szűrése)
+BUS_PORT = 7411              # Élő telemetria busz (telemetry_bus.py)
+BUS_QUEUE_SIZE = 256         # Keretek feliratkozónként
+BUS_DROP_POLICY = 'oldest'   # Lassú feliratkozó: 'oldest' / 'newest' / 'disconnect'
+DASH_FPS = 5                 # Műszerfal képfrissítés (dashboard.py)
+DASH_HISTORY = 2048          # Megtartott minták csatornánként (sparkline: LTTB ritkítás)
+ANALYSIS_ALT_BIN_M = 50      # Repülés utáni elemzés (flight_analysis.py): magasság tartomány
+ANALYSIS_TIME_BIN_S = 30     # Vesztés idő tartomány
+ANALYSIS_RATE_WINDOW_S = 1.0 # Sebesség számítás simító ablaka
+
+# Kapcsolat szimulátor (link_sim.py)
+SIM_PATH_LOSS_EXP = 2.7      # Log-távolság kitevő (2: szabadtéri, földközelben nagyobb)
+SIM_SHADOWING_DB = 3.0       # Csomagonkénti árnyékolás szórása
+SIM_ANTENNA_GAIN_DB = 2.0    # Két antenna nyeresége mínusz kábel veszteség
+SIM_NOISE_FIGURE_DB = 6.0    # Vevő zajtényező
+SIM_SNR_SLOPE_DB = 0.5       # Csomaghiba vízesés meredeksége a küszöb körül
+SIM_DETECT_MARGIN_DB = 2.5   # Ennyivel a küszöb alatt a preamble sem detektálódik
+SIM_GROUND_POLL_MS = 20      # Vevő lekérdezési periódus (ground_station.main)
+SIM_PACKETS = 200            # Csomagok mérésenként
+SIM_DISTANCES_M = (1000, 3000, 5000, 10000)
+
+# === BUILD ===
+# Repülési modulok (build_mpy.py ezeket fordítja .mpy-ra / fagyasztja a
+# firmware-be, boot_benchmark.py ezek importálási idejét méri)
+FLIGHT_MODULES = (
+    'async_queue',
+    'altitude',
+    'loop_timing',
+    'profiler',
+    'heap_monitor',
+    'led_controller',
+    'bmp280',
+    'barometers',
+    'microphone_i2s',
+    'audio_worker',
+    'acoustic_event',
+    'lora_radio',
+    'downlink',
+    'uplink',
+    'sd_logger',
+    'stream_filter',
+    'kalman',
+    'flight_phase',
+    'watchdog',
+    'cansat_main',
+)
+
 # === EGYÉB ===
 MISSION_ID = "COSMIG2026"  # Azonosító
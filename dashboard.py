@@ -0,0 +1,311 @@
+"""
+Élő telemetria műszerfal terminálban (gépen, CPython, curses)
+
+A vett keretek csak az állapotot frissítik (utolsó értékek, rögzített
+méretű gyűrűk), a képernyő DASH_FPS ütemben, a legfrissebb állapotból
+rajzolódik újra. A rajzolás költsége így a csomagsebességtől független:
+a sparkline-ok a gyűrű tartalmából LTTB-vel (Largest Triangle Three
+Buckets) a terminál szélességére ritkítva készülnek, ami a csúcsokat és
+a görbe alakját megtartja; csatornánként csak akkor számol újra, ha jött
+új adat vagy változott a szélesség.
+
+Forrás a telemetria busz (telemetry_bus.py) vagy egy vevő konzol
+kimenete (--stdin, GROUND_FRAME_OUTPUT = True mellett).
+
+Használat:
+    python dashboard.py                       # busz: ground_merge.py serve --bus
+    mpremote ... run ground_station.py | python dashboard.py --stdin
+"""
+
+import argparse
+import asyncio
+import curses
+import math
+import os
+import sys
+import time
+from array import array
+
+import config
+from flight_phase import PHASES
+from ground_merge import parse_frame_line
+from telemetry_bus import subscribe
+
+SPARK = "▁▂▃▄▅▆▇█"
+
+# Csatornák: (kulcs, felirat, formátum)
+CHANNELS = (
+    ('altitude', 'Altitude m', '{:8.1f}'),
+    ('temperature', 'Temp °C', '{:8.2f}'),
+    ('audio_rms', 'Audio RMS', '{:8.4f}'),
+    ('rssi', 'RSSI dBm', '{:8.0f}'),
+)
+
+
+def lttb(xs, ys, threshold):
+    """
+    Largest Triangle Three Buckets ritkítás (Steinarsson, 2013)
+
+    Az első és utolsó pont marad; a köztes pontokat threshold-2 vödörre
+    osztja, és vödrönként azt a pontot tartja meg, amely az előzőleg
+    kiválasztott ponttal és a következő vödör átlagával a legnagyobb
+    területű háromszöget adja.
+
+    Args:
+        xs, ys: Azonos hosszú sorozatok
+        threshold: Megtartandó pontok száma
+
+    Returns:
+        list: A megtartott pontok indexei (növekvő)
+    """
+    n = len(ys)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        # Következő vödör átlaga
+        start = int((i + 1) * every) + 1
+        end = min(int((i + 2) * every) + 1, n)
+        count = end - start
+        avg_x = sum(xs[start:end]) / count
+        avg_y = sum(ys[start:end]) / count
+
+        # Aktuális vödör: legnagyobb háromszög
+        ax = xs[a]
+        ay = ys[a]
+        best = -1.0
+        best_j = int(i * every) + 1
+        for j in range(best_j, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best:
+                best = area
+                best_j = j
+        selected.append(best_j)
+        a = best_j
+
+    selected.append(n - 1)
+    return selected
+
+
+class Ring:
+    """Rögzített méretű (idő, érték) gyűrű float tömbökben"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.xs = array('d', bytes(8 * capacity))
+        self.ys = array('d', bytes(8 * capacity))
+        self.pos = 0
+        self.count = 0
+        self.version = 0  # Minden hozzáadással nő (újraszámolás jelzése)
+
+    def append(self, x, y):
+        self.xs[self.pos] = x
+        self.ys[self.pos] = y
+        self.pos = (self.pos + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        self.version += 1
+
+    def ordered(self):
+        """(xs, ys) időrendben"""
+        if self.count < self.capacity:
+            return self.xs[:self.count], self.ys[:self.count]
+        p = self.pos
+        return self.xs[p:] + self.xs[:p], self.ys[p:] + self.ys[:p]
+
+
+def sparkline(values, lo, hi):
+    """Értékek -> blokk karakterek (NaN: szóköz)"""
+    span = hi - lo
+    top = len(SPARK) - 1
+    chars = []
+    for v in values:
+        if math.isnan(v):
+            chars.append(' ')
+        elif span <= 0:
+            chars.append(SPARK[top // 2])
+        else:
+            chars.append(SPARK[int((v - lo) / span * top + 0.5)])
+    return "".join(chars)
+
+
+class DashboardState:
+    """A legutóbbi állapot és a csatorna előzmények; frissítés O(1)"""
+
+    def __init__(self, capacity=config.DASH_HISTORY):
+        self.latest = None
+        self.rings = {key: Ring(capacity) for key, _, _ in CHANNELS}
+        self.packets = 0
+        self.lost = 0
+        self.last_seq = None
+        self.last_time = None
+        self.rate = 0.0  # Csomag / s (exponenciális átlag)
+        self._spark_cache = {}  # kulcs -> (verzió, szélesség, szöveg, min, max)
+
+    def update(self, frame):
+        now = time.monotonic()
+        if self.last_time is not None:
+            dt = now - self.last_time
+            if dt > 0:
+                self.rate += 0.1 * (1 / dt - self.rate)
+        self.last_time = now
+
+        seq = frame.get('sequence')
+        if isinstance(seq, int):
+            if self.last_seq is not None and seq > self.last_seq + 1:
+                self.lost += seq - self.last_seq - 1
+            if self.last_seq is None or seq > self.last_seq:
+                self.last_seq = seq
+
+        self.packets += 1
+        self.latest = frame
+        for key, ring in self.rings.items():
+            value = frame.get(key)
+            ring.append(now, math.nan if value is None else float(value))
+
+    def spark(self, key, width):
+        """
+        Sparkline a csatornához a megadott szélességben
+
+        Returns:
+            tuple: (szöveg, min, max)
+        """
+        ring = self.rings[key]
+        cached = self._spark_cache.get(key)
+        if cached and cached[0] == ring.version and cached[1] == width:
+            return cached[2:]
+
+        xs, ys = ring.ordered()
+        valid = [i for i in range(len(ys)) if not math.isnan(ys[i])]
+        if len(valid) < len(ys):
+            xs = [xs[i] for i in valid]
+            ys = [ys[i] for i in valid]
+        if ys:
+            picked = [ys[i] for i in lttb(xs, ys, width)]
+            lo, hi = min(ys), max(ys)
+            text = sparkline(picked, lo, hi)
+        else:
+            text, lo, hi = "", math.nan, math.nan
+        self._spark_cache[key] = (ring.version, width, text, lo, hi)
+        return text, lo, hi
+
+
+def render(screen, state):
+    """Teljes képernyő újrarajzolása a legfrissebb állapotból"""
+    screen.erase()
+    height, width = screen.getmaxyx()
+
+    def put(y, x, text, attr=0):
+        if 0 <= y < height and x < width:
+            screen.addnstr(y, x, text, width - x - 1, attr)
+
+    frame = state.latest
+    put(0, 0, "CanSat telemetry  (q: quit)", curses.A_BOLD)
+    if frame is None:
+        put(2, 0, "Waiting for telemetry...")
+        screen.refresh()
+        return
+
+    age = time.monotonic() - state.last_time
+    phase = frame.get('phase')
+    phase_name = PHASES[phase] if isinstance(phase, int) and 0 <= phase < len(PHASES) else phase
+    total = state.packets + state.lost
+    loss = 100 * state.lost / total if total else 0.0
+    put(1, 0, f"{frame.get('mission_id')}  #{frame.get('sequence')}  phase {phase_name}  "
+              f"{state.rate:.1f} pkt/s  loss {loss:.1f}%  last {age:.1f} s ago"
+              + (f"  rx {frame['receiver']}" if frame.get('receiver') else ""))
+
+    velocity = frame.get('velocity')
+    line = (f"P {frame.get('pressure', 0):.2f} hPa   "
+            f"alt {frame.get('altitude', 0):.1f} m")
+    if velocity is not None:
+        line += f"   v {velocity:.1f} m/s   apogee {frame.get('apogee', 0):.1f} m"
+    put(2, 0, line)
+
+    label_w = 12
+    value_w = 9
+    spark_w = max(width - label_w - 3 * value_w - 4, 3)
+    row = 4
+    for key, label, fmt in CHANNELS:
+        text, lo, hi = state.spark(key, spark_w)
+        value = frame.get(key)
+        last = fmt.format(value) if value is not None else " " * 8
+        put(row, 0, f"{label:<{label_w}}")
+        put(row, label_w, text)
+        put(row, label_w + spark_w + 1, f"{last} " + fmt.format(lo) + " " + fmt.format(hi))
+        row += 2
+    put(row, label_w + spark_w + 1, "    last      min      max", curses.A_DIM)
+    screen.refresh()
+
+
+async def read_bus(state, args):
+    while True:
+        try:
+            async for frame in subscribe(args.bus_host, args.bus_port, 'json', args.bus_unix):
+                state.update(frame)
+        except OSError:
+            pass
+        await asyncio.sleep(1)
+
+
+async def read_stdin(state, source):
+    loop = asyncio.get_running_loop()
+    while True:
+        line = await loop.run_in_executor(None, source.readline)
+        if not line:
+            return
+        frame = parse_frame_line(line.rstrip("\r\n"))
+        if frame is not None:
+            state.update(frame)
+
+
+async def run(screen, args):
+    curses.curs_set(0)
+    screen.nodelay(True)
+    state = DashboardState(args.history)
+    reader = asyncio.create_task(read_stdin(state, args.source) if args.stdin
+                                 else read_bus(state, args))
+
+    period = 1 / args.fps
+    try:
+        while True:
+            t0 = time.monotonic()
+            key = screen.getch()
+            if key in (ord('q'), ord('Q')):
+                break
+            render(screen, state)
+            await asyncio.sleep(max(period - (time.monotonic() - t0), 0))
+    finally:
+        reader.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Élő telemetria műszerfal")
+    parser.add_argument("--stdin", action="store_true", help="Vevő konzol kimenet a bemeneten")
+    parser.add_argument("--fps", type=float, default=config.DASH_FPS)
+    parser.add_argument("--history", type=int, default=config.DASH_HISTORY,
+                        help="Megtartott minták csatornánként")
+    parser.add_argument("--bus-host", default="127.0.0.1")
+    parser.add_argument("--bus-port", type=int, default=config.BUS_PORT)
+    parser.add_argument("--bus-unix", help="Unix socket útvonal")
+    args = parser.parse_args()
+
+    if args.stdin:
+        # A csővezeték külön leíróra, a curses billentyűzete a terminál
+        args.source = os.fdopen(os.dup(0))
+        tty = os.open("/dev/tty", os.O_RDONLY)
+        os.dup2(tty, 0)
+        os.close(tty)
+
+    try:
+        curses.wrapper(lambda screen: asyncio.run(run(screen, args)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
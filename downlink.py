@@ -0,0 +1,358 @@
+"""
+Leszállás utáni tömeges letöltés: az SD log számozott LoRa csomagokban
+
+Ha a CanSat nem kerül elő, a log csak így jut le. Földet érés után a
+fedélzet körbe-körbe küldi a még nyugtázatlan darabokat; minden
+DL_POLL_EVERY darab (és minden kör) után lekérdezést küld, majd rövid
+vételi ablakot nyit, amiben a vevőállomás a hiányzó darabokat jelzi. A
+nyugtázott darabok kimaradnak, az állapot az SD kártyára kerül, így
+újraindulás után a letöltés folytatódik. Ha a log közben nő, az új
+darabok (és a korábban részleges utolsó darab) is sorra kerülnek.
+
+Csomagok (a log ASCII, ezért szöveges keret):
+    CanSat -> föld: "ID,DL,index,méret,<adat>"  adat: a log index*CHUNK bájttól
+                    "ID,DQ,kurzor"               lekérdezés, utána vételi ablak
+    föld -> CanSat: "ID,NK,eddig,a-b;c;..."      hiányzó darabok `eddig` alatt
+
+A fedélzet és a vevőállomás is használja (MicroPython és CPython).
+"""
+
+import os
+import struct
+import config
+
+STATE_MAGIC = b'DLS1'
+STATE_HEADER = '<4sII'  # magic, lefedett log méret, darabszám
+
+# Legrosszabb esetben a keret fejléce: "ID,DL,9999999,999999999,"
+HEADER_MAX = 22
+MAX_PACKET = 255
+
+
+def _file_size(filename):
+    try:
+        return os.stat(filename)[6]
+    except OSError:
+        return 0
+
+
+class ChunkMap:
+    """Darabonként egy bit, bővíthető, fájlba menthető"""
+
+    def __init__(self, count=0, value=False):
+        self.count = 0
+        self.bits = bytearray(0)
+        self.resize(count, value)
+
+    def resize(self, count, value):
+        """Bővítés count darabra; az új darabok értéke value"""
+        if count <= self.count:
+            return
+        size = (count + 7) >> 3
+        if size > len(self.bits):
+            bits = bytearray(size)
+            bits[:len(self.bits)] = self.bits
+            self.bits = bits
+        old = self.count
+        self.count = count
+        self.fill(old, count, value)
+
+    def get(self, i):
+        return bool(self.bits[i >> 3] & (1 << (i & 7)))
+
+    def set(self, i, value):
+        if value:
+            self.bits[i >> 3] |= 1 << (i & 7)
+        else:
+            self.bits[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+
+    def fill(self, start, stop, value):
+        for i in range(start, min(stop, self.count)):
+            self.set(i, value)
+
+    def find(self, start, value=True):
+        """
+        Első start utáni darab a megadott értékkel
+
+        Returns:
+            int: Index vagy -1
+        """
+        bits = self.bits
+        skip = 0 if value else 0xFF
+        i = start
+        while i < self.count:
+            if not i & 7 and bits[i >> 3] == skip:
+                i += 8
+                continue
+            if self.get(i) == value:
+                return i
+            i += 1
+        return -1
+
+    def ranges(self, start, stop, value, max_len):
+        """
+        A megadott értékű darabok tartományai szövegesen ("a-b;c;...")
+
+        Args:
+            max_len: Leghosszabb szöveg (LoRa csomag korlát)
+
+        Returns:
+            tuple: (szöveg, eddig) - eddig: az első ki nem írt index
+        """
+        parts = []
+        length = 0
+        i = self.find(start, value)
+        while 0 <= i < stop:
+            j = self.find(i, not value)
+            if j < 0 or j > stop:
+                j = stop
+            part = str(i) if j == i + 1 else f"{i}-{j - 1}"
+            if length + len(part) + 1 > max_len:
+                return ";".join(parts), i
+            parts.append(part)
+            length += len(part) + 1
+            i = self.find(j, value)
+        return ";".join(parts), stop
+
+    def save(self, filename, size):
+        """Állapot mentése (lefedett log méret + bitek)"""
+        try:
+            with open(filename, 'wb') as f:
+                f.write(struct.pack(STATE_HEADER, STATE_MAGIC, size, self.count))
+                f.write(self.bits)
+            return True
+        except:
+            return False
+
+    def load(self, filename):
+        """
+        Mentett állapot betöltése
+
+        Returns:
+            int: A lefedett log méret, vagy None, ha nincs érvényes mentés
+        """
+        try:
+            with open(filename, 'rb') as f:
+                magic, size, count = struct.unpack(STATE_HEADER, f.read(12))
+                bits = f.read()
+            if magic != STATE_MAGIC or len(bits) != (count + 7) >> 3:
+                return None
+            self.bits = bytearray(bits)
+            self.count = count
+            return size
+        except:
+            return None
+
+
+class BulkDownlink:
+    """Fedélzeti oldal: darabolás, körkörös küldés, nyugták kezelése"""
+
+    def __init__(self, filename=config.LOG_FILENAME, state_filename=config.DL_STATE_FILENAME,
+                 chunk_size=config.DL_CHUNK_SIZE, mission_id=config.MISSION_ID):
+        """
+        Args:
+            filename: Letöltendő log
+            state_filename: Nyugtázott darabok (újraindulás utáni folytatáshoz)
+            chunk_size: Adat bájt csomagonként (a vevőállomáson is ugyanez)
+            mission_id: Csomag azonosító
+        """
+        if len(mission_id) + HEADER_MAX + chunk_size > MAX_PACKET:
+            raise ValueError("DL_CHUNK_SIZE túl nagy")
+
+        self.filename = filename
+        self.state_filename = state_filename
+        self.chunk_size = chunk_size
+        self.mission_id = mission_id
+
+        self.pending = ChunkMap()  # 1: még nincs nyugtázva
+        self.size = 0              # Lefedett log méret
+        self.cursor = 0            # Következő vizsgálandó darab a körben
+        self.passes = 0
+        self.acked = 0             # Nyugtázott darabok (ebben az indulásban)
+        self._frame = bytearray(MAX_PACKET)
+
+    def start(self):
+        """Mentett állapot betöltése és a log aktuális méretének felvétele"""
+        size = self.pending.load(self.state_filename)
+        if size is None or size > _file_size(self.filename):
+            self.pending = ChunkMap()
+            size = 0
+        self.size = size
+        self.refresh()
+
+    def refresh(self):
+        """
+        A log közben nőtt részének felvétele
+
+        Returns:
+            bool: Van-e nyugtázatlan darab
+        """
+        size = _file_size(self.filename)
+        if size > self.size:
+            # A korábban részleges utolsó darab tartalma is változott
+            if self.size % self.chunk_size:
+                self.pending.set(self.size // self.chunk_size, True)
+            self.pending.resize((size + self.chunk_size - 1) // self.chunk_size, True)
+            self.size = size
+        return not self.done
+
+    @property
+    def done(self):
+        return self.pending.find(0) < 0
+
+    def next_index(self):
+        """
+        Következő küldendő darab a körben
+
+        Returns:
+            int: Index vagy None, ha a kör végére ért (a kurzor ekkor 0)
+        """
+        i = self.pending.find(self.cursor)
+        if i < 0:
+            self.cursor = 0
+            self.passes += 1
+            return None
+        self.cursor = i + 1
+        return i
+
+    def chunk_frame(self, index):
+        """
+        Adatcsomag: "ID,DL,index,méret,<adat>" előre foglalt bufferben
+
+        Returns:
+            memoryview: A küldendő keret (a következő hívásig érvényes)
+        """
+        header = f"{self.mission_id},DL,{index},{self.size},".encode()
+        h = len(header)
+        frame = self._frame
+        frame[:h] = header
+
+        offset = index * self.chunk_size
+        n = min(self.chunk_size, self.size - offset)
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            n = f.readinto(memoryview(frame)[h:h + n])
+        return memoryview(frame)[:h + n]
+
+    def poll_frame(self):
+        """Lekérdezés: "ID,DQ,kurzor" (a kör végén a darabszám)"""
+        cursor = self.cursor or self.pending.count
+        return f"{self.mission_id},DQ,{cursor}"
+
+    def handle_nack(self, message):
+        """
+        Vevőállomás válasza: `eddig` alatt csak a felsorolt darabok hiányoznak
+
+        Returns:
+            bool: Érvényes válasz volt-e
+        """
+        try:
+            if isinstance(message, (bytes, bytearray, memoryview)):
+                message = bytes(message).decode()
+            parts = message.split(',')
+            if parts[0] != self.mission_id or parts[1] != 'NK':
+                return False
+            upto = min(int(parts[2]), self.pending.count)
+            missing = ChunkMap(upto)
+            if len(parts) > 3 and parts[3]:
+                for part in parts[3].split(';'):
+                    a, _, b = part.partition('-')
+                    missing.fill(int(a), int(b or a) + 1, True)
+        except:
+            return False
+
+        pending = self.pending
+        for i in range(upto):
+            if pending.get(i) and not missing.get(i):
+                pending.set(i, False)
+                self.acked += 1
+        return True
+
+    def save(self):
+        """Állapot mentése az SD kártyára"""
+        return self.pending.save(self.state_filename, self.size)
+
+    def summary(self):
+        """Formátum: "nyugtázott/összes darab" """
+        return f"{self.pending.count - self._pending_count()}/{self.pending.count}"
+
+    def _pending_count(self):
+        count = 0
+        i = self.pending.find(0)
+        while i >= 0:
+            count += 1
+            i = self.pending.find(i + 1)
+        return count
+
+
+class DownlinkReceiver:
+    """Vevőállomás oldal: darabok helyükre írása, hiánylista"""
+
+    def __init__(self, filename="downlink_cansat_log.csv",
+                 state_filename="downlink_state.bin",
+                 chunk_size=config.DL_CHUNK_SIZE, mission_id=config.MISSION_ID):
+        """
+        Args:
+            filename: Visszaállított log
+            state_filename: Megkapott darabok (a vevő újraindulásához)
+            chunk_size: Adat bájt csomagonként (mint a fedélzeten)
+            mission_id: Válasz csomag azonosító
+        """
+        self.filename = filename
+        self.state_filename = state_filename
+        self.chunk_size = chunk_size
+        self.mission_id = mission_id
+
+        self.received = ChunkMap()
+        self.size = self.received.load(state_filename) or 0
+        if not _file_size(filename):
+            # Nincs meg a fájl: az állapot sem érvényes
+            self.received = ChunkMap()
+            self.size = 0
+            with open(filename, 'wb'):
+                pass
+
+    def handle_chunk(self, message):
+        """
+        Adatcsomag: "ID,DL,index,méret,<adat>"
+
+        Returns:
+            int: A darab indexe vagy None hibás csomagnál
+        """
+        try:
+            parts = message.split(',', 4)
+            index = int(parts[2])
+            size = int(parts[3])
+            data = parts[4].encode()
+        except:
+            return None
+
+        if size > self.size:
+            # A log nőtt: a korábbi részleges utolsó darab újra jön
+            if self.size % self.chunk_size:
+                self.received.set(self.size // self.chunk_size, False)
+            self.size = size
+        self.received.resize((self.size + self.chunk_size - 1) // self.chunk_size, False)
+
+        with open(self.filename, 'r+b') as f:
+            f.seek(index * self.chunk_size)
+            f.write(data)
+        self.received.set(index, True)
+        return index
+
+    def nack(self, message, max_len=config.DL_NACK_MAX_LEN):
+        """
+        Válasz egy "ID,DQ,kurzor" lekérdezésre
+
+        Returns:
+            str: "ID,NK,eddig,a-b;c;..." (a hiányzó darabok a kurzor alatt)
+        """
+        cursor = int(message.split(',')[2])
+        self.received.resize(cursor, False)
+        missing, upto = self.received.ranges(0, cursor, False, max_len)
+        self.received.save(self.state_filename, self.size)
+        return f"{self.mission_id},NK,{upto},{missing}"
+
+    @property
+    def complete(self):
+        return self.size > 0 and self.received.find(0, False) < 0
@@ -0,0 +1,510 @@
+"""
+Repülés utáni elemzés: SD log és vevőállomás log összehangolása (gépen)
+
+A fedélzeti log (cansat_log.csv) küldetés időben, a vevő log
+(ground_station_log.csv vagy a ground_merge.py összefésült logja) gépi
+időben és sorszámmal készül. A telemetria csomagban nincs küldetés idő,
+de a csomag és az SD sor ugyanabból a rekordból készül (telemetry_task),
+így a kerekített mezők (hőmérséklet, nyomás, audio, fázis) egyeznek: az
+egyértelmű egyezések horgonyok (sorszám -> SD sor), ezekből lineáris
+interpolációval minden sorszám - az elveszetteké is - küldetés időt és
+magasságot kap.
+
+Számol: csomagvesztés térkép (idő és magasság szerint, kiesés sorozatok),
+link budget a magasság függvényében (RSSI, vesztés), emelkedési /
+süllyedési sebesség, csúcspont. Minden lépés NumPy tömbökön fut: egy
+több órás, 100 Hz-es log néhány másodperc.
+
+Használat:
+    python flight_analysis.py cansat_log.csv ground_station_log.csv
+    python flight_analysis.py cansat_log.csv merged_log.csv --report report.txt \\
+        --aligned aligned.csv --plots plots/       # ábrák: matplotlib kell
+    python flight_analysis.py - ground_station_log.csv   # SD log nélkül
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+import config
+from flight_phase import PHASES, PAD, ASCENT, LANDED
+
+# SD log oszlopai (sd_logger.SDLogger.format_data), a becslés opcionális
+SD_COLUMNS = ('timestamp', 'temp_c', 'pressure_hpa', 'altitude_m', 'audio_rms', 'phase',
+              'kf_alt_m', 'kf_vel_ms', 'kf_apogee_m')
+# Vevő log numerikus oszlopai (ground_station.GroundStation.log_to_file;
+# a ground_merge.MERGED_COLUMNS eleje ugyanez), a 1. oszlop a küldetés azonosító
+GROUND_COLUMNS = ('timestamp', 'sequence', 'temperature', 'pressure', 'altitude',
+                  'audio_rms', 'rssi', 'phase', 'velocity', 'apogee')
+GROUND_USECOLS = (0, 2, 3, 4, 5, 6, 7, 8, 9, 10)
+
+
+def _numeric_lines(filename, widths):
+    """
+    Adatsorok (fejléc és csonka sorok nélkül) mezőszám szerint csoportosítva
+
+    A soronkénti mezőszám és az első karakter NumPy-jal számolódik a
+    teljes fájl bájtjain; a hiányzó értékek ("None" / üres) NaN-ra
+    cserélődnek, szintén egyben.
+
+    Returns:
+        dict: mezőszám -> (sorszámok a fájlban, sorok listája)
+    """
+    with open(filename, 'rb') as f:
+        raw = f.read().replace(b"\r", b"")
+    raw = raw.replace(b"None", b"nan")
+    while b",," in raw:
+        raw = raw.replace(b",,", b",nan,")
+    raw = raw.replace(b",\n", b",nan\n").rstrip(b"\n")
+    if raw.endswith(b","):
+        raw += b"nan"
+    if not raw:
+        return {}
+
+    lines = raw.split(b"\n")
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(buf == 10) + 1))
+    fields = np.add.reduceat(buf == 44, starts, dtype=np.int32) + 1
+    first = buf[starts]
+    numeric = ((first >= 48) & (first <= 57)) | (first == 45)
+
+    groups = {}
+    for width in np.unique(fields[numeric]):
+        if width not in widths:
+            continue
+        rows = np.flatnonzero(numeric & (fields == width))
+        text = b"\n".join([lines[i] for i in rows]).decode(errors='replace')
+        groups[int(width)] = (rows, text.split("\n"))
+    return groups
+
+
+def _parse(lines, usecols=None):
+    """Sorok -> float tömb"""
+    return np.loadtxt(lines, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+
+
+def load_sd_log(filename):
+    """
+    Fedélzeti log beolvasása
+
+    Újraindulás után a küldetés idő újra nulláról indul; az ilyen
+    szakaszokat az előző végéhez illeszti, hogy az idő monoton legyen.
+
+    Returns:
+        tuple: (oszlop -> tömb szótár, újraindulások száma)
+    """
+    full = len(SD_COLUMNS)
+    groups = _numeric_lines(filename, (full - 3, full))
+    count = sum(len(rows) for rows, _ in groups.values())
+    data = np.full((count, full), np.nan)
+    order = np.empty(count, dtype=np.int64)
+
+    pos = 0
+    for width, (rows, lines) in groups.items():
+        values = _parse(lines)
+        data[pos:pos + len(rows), :width] = values
+        order[pos:pos + len(rows)] = rows
+        pos += len(rows)
+    data = data[np.argsort(order, kind='stable')]
+
+    t = data[:, 0]
+    resets = np.flatnonzero(np.diff(t) < 0) + 1
+    if len(resets):
+        step = np.median(np.diff(t)[t[1:] > t[:-1]]) if count > 2 else 1.0
+        for i in resets:
+            t[i:] += t[i - 1] - t[i] + step
+
+    return {name: data[:, i] for i, name in enumerate(SD_COLUMNS)}, len(resets)
+
+
+def load_ground_log(filename, mission_id=None):
+    """
+    Vevő log beolvasása; sorszám szerint rendezve, duplikátumok nélkül
+
+    Args:
+        mission_id: Csak ez a küldetés (több küldetés egy fájlban)
+
+    Returns:
+        dict: Oszlop -> tömb (GROUND_COLUMNS)
+    """
+    groups = _numeric_lines(filename, range(len(GROUND_USECOLS) + 1, 64))
+    lines = [line for _, group in sorted(groups.items()) for line in group[1]]
+    if mission_id:
+        lines = [line for line in lines if line.split(',', 2)[1] == mission_id]
+    if lines:
+        data = _parse(lines, GROUND_USECOLS)
+    else:
+        data = np.zeros((0, len(GROUND_COLUMNS)))
+
+    # Újraküldött (RT) / többször vett csomag: az első példány marad
+    _, first = np.unique(data[:, 1], return_index=True)
+    data = data[first]
+    ground = {name: data[:, i] for i, name in enumerate(GROUND_COLUMNS)}
+    ground['sequence'] = ground['sequence'].astype(np.int64)
+    return ground
+
+
+def _record_keys(temp, pressure, audio, phase):
+    """A telemetria kerekítésével azonos egész kulcs rekordonként (int64)"""
+    t = np.rint(temp * 100).astype(np.int64) + 20000       # 16 bit
+    p = np.rint(pressure * 100).astype(np.int64)           # 18 bit
+    a = np.rint(audio * 10000).astype(np.int64) & 0x3FFF   # 14 bit
+    ph = np.nan_to_num(phase).astype(np.int64) & 0x7       # 3 bit
+    return (((t << 18 | p) << 14 | a) << 3) | ph
+
+
+def align(sd, ground):
+    """
+    Vett csomagok párosítása SD sorokkal (horgonyok)
+
+    Csak az SD-ben egyszer előforduló kulcsok számítanak, és a horgonyok
+    küldetés ideje a sorszámmal együtt nő (a kilógók kimaradnak).
+
+    Returns:
+        tuple: (horgony sorszámok, horgony SD sor indexek)
+    """
+    sd_keys = _record_keys(sd['temp_c'], sd['pressure_hpa'], sd['audio_rms'], sd['phase'])
+    keys, index, counts = np.unique(sd_keys, return_index=True, return_counts=True)
+    ground_keys = _record_keys(ground['temperature'], ground['pressure'],
+                               ground['audio_rms'], ground['phase'])
+
+    pos = np.clip(np.searchsorted(keys, ground_keys), 0, max(len(keys) - 1, 0))
+    if not len(keys):
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    ok = (keys[pos] == ground_keys) & (counts[pos] == 1)
+    seq = ground['sequence'][ok]
+    rows = index[pos[ok]]
+
+    # Monoton lánc: a sorszámmal együtt növő SD index (futó maximumnál nagyobb)
+    keep = rows >= np.maximum.accumulate(rows)
+    keep[1:] &= rows[1:] > rows[:-1]
+    return seq[keep], rows[keep]
+
+
+def flight_stats(sd, window_s):
+    """
+    Repülési jellemzők a fedélzeti logból
+
+    A magasság a Kalman becslés, ha van, különben a nyers érték
+    window_s mozgó átlaggal; a sebesség ennek deriváltja.
+
+    Returns:
+        dict: launch_t, apogee_t, apogee_m (indítási magasság felett),
+              landing_t, ascent_ms / descent_ms (átlag), max_ascent_ms,
+              max_descent_ms, ground_m, valamint a simított altitude és
+              velocity tömbök
+    """
+    t = sd['timestamp']
+    alt = np.where(np.isnan(sd['kf_alt_m']), sd['altitude_m'], sd['kf_alt_m'])
+    n = len(t)
+    if n < 3:
+        return {}
+
+    dt = float(np.median(np.diff(t))) or 1.0
+    w = max(int(round(window_s / dt)), 1)
+    csum = np.concatenate(([0.0], np.cumsum(alt)))
+    smooth = alt.copy()
+    if n > w:
+        smooth[w // 2:w // 2 + n - w + 1] = (csum[w:] - csum[:-w]) / w
+    vel = np.gradient(smooth, t)
+
+    phase = np.nan_to_num(sd['phase'], nan=-1).astype(int)
+    pad = phase == PHASES.index(PAD)
+    ground = float(np.median(alt[pad])) if pad.any() else float(alt[0])
+
+    top = int(np.argmax(smooth))
+    flying = np.flatnonzero(phase >= PHASES.index(ASCENT))
+    launch = int(flying[0]) if len(flying) else 0
+    landed = np.flatnonzero(phase == PHASES.index(LANDED))
+    landing = int(landed[0]) if len(landed) else n - 1
+
+    stats = {
+        'ground_m': ground,
+        'launch_t': float(t[launch]),
+        'apogee_t': float(t[top]),
+        'apogee_m': float(smooth[top] - ground),
+        'landing_t': float(t[landing]),
+        'max_ascent_ms': float(vel[launch:top + 1].max()) if top >= launch else np.nan,
+        'max_descent_ms': float(-vel[top:landing + 1].min()) if landing > top else np.nan,
+    }
+    up = t[top] - t[launch]
+    stats['ascent_ms'] = (smooth[top] - smooth[launch]) / up if up > 0 else np.nan
+    down = t[landing] - t[top]
+    stats['descent_ms'] = (smooth[top] - smooth[landing]) / down if down > 0 else np.nan
+    stats['altitude'] = smooth
+    stats['velocity'] = vel
+    return stats
+
+
+def loss_map(ground, anchor_seq, anchor_rows, sd, alt):
+    """
+    Minden sorszám (az első és utolsó vett között) küldetés idővel és magassággal
+
+    Returns:
+        dict: sequence, received (bool), mission_t, altitude, rssi (NaN: elveszett)
+    """
+    seq = ground['sequence']
+    if not len(seq):
+        return None
+    all_seq = np.arange(seq.min(), seq.max() + 1)
+    received = np.isin(all_seq, seq, assume_unique=True)
+    rssi = np.full(len(all_seq), np.nan)
+    rssi[(seq - all_seq[0]).astype(np.int64)] = ground['rssi']
+
+    if len(anchor_seq) >= 2:
+        mission_t = np.interp(all_seq, anchor_seq, sd['timestamp'][anchor_rows])
+        # A horgonyokon túl a telemetria periódussal extrapolál
+        period = np.median(np.diff(sd['timestamp'][anchor_rows]) / np.diff(anchor_seq))
+        before = all_seq < anchor_seq[0]
+        after = all_seq > anchor_seq[-1]
+        mission_t[before] = sd['timestamp'][anchor_rows[0]] - (anchor_seq[0] - all_seq[before]) * period
+        mission_t[after] = sd['timestamp'][anchor_rows[-1]] + (all_seq[after] - anchor_seq[-1]) * period
+        altitude = np.interp(mission_t, sd['timestamp'], alt)
+    else:
+        # SD log nélkül: vételi idő, a vesztett csomagoké interpolálva
+        mission_t = np.interp(all_seq, seq, ground['timestamp'] - ground['timestamp'][0])
+        altitude = np.interp(all_seq, seq, ground['altitude'])
+
+    return {'sequence': all_seq, 'received': received, 'mission_t': mission_t,
+            'altitude': altitude, 'rssi': rssi}
+
+
+def loss_bursts(received):
+    """
+    Összefüggő kiesések
+
+    Returns:
+        tuple: (kezdő indexek, hosszak) a leghosszabbal kezdve
+    """
+    edges = np.diff(np.concatenate(([0], (~received).astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    order = np.argsort(-lengths, kind='stable')
+    return starts[order], lengths[order]
+
+
+def binned(values, received, rssi, width):
+    """
+    Vesztés és RSSI tartományonként (magasság vagy idő)
+
+    Returns:
+        tuple: (tartomány alsó határok, várt, vett, átlag RSSI, min RSSI)
+    """
+    ok = ~np.isnan(values)
+    values, received, rssi = values[ok], received[ok], rssi[ok]
+    if not len(values):
+        return (np.zeros(0),) * 5
+    lo = np.floor(values.min() / width) * width
+    bins = ((values - lo) // width).astype(np.int64)
+    size = bins.max() + 1
+    expected = np.bincount(bins, minlength=size)
+    got = np.bincount(bins, weights=received, minlength=size)
+    has = received & ~np.isnan(rssi)
+    rssi_sum = np.bincount(bins[has], weights=rssi[has], minlength=size)
+    rssi_n = np.bincount(bins[has], minlength=size)
+    rssi_min = np.full(size, np.inf)
+    np.minimum.at(rssi_min, bins[has], rssi[has])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = rssi_sum / rssi_n
+    rssi_min[np.isinf(rssi_min)] = np.nan
+    used = expected > 0
+    edges = lo + np.arange(size) * width
+    return edges[used], expected[used], got[used], mean[used], rssi_min[used]
+
+
+def report(sd, resets, ground, anchors, stats, losses, alt_bin, time_bin, top_bursts=10):
+    """Szöveges összefoglaló sorai"""
+    lines = ["CanSat flight analysis", "=" * 60]
+
+    if sd is not None:
+        t = sd['timestamp']
+        lines.append(f"SD log: {len(t)} rows, {t[-1] - t[0] if len(t) else 0:.1f} s"
+                     + (f", {resets} restart(s)" if resets else ""))
+    if ground is not None:
+        lines.append(f"Ground log: {len(ground['sequence'])} packets")
+        if sd is not None:
+            lines.append(f"Aligned: {len(anchors[0])} anchor packets")
+            if len(anchors[0]) >= 2:
+                wall = ground['timestamp'][np.isin(ground['sequence'], anchors[0])]
+                mission = sd['timestamp'][anchors[1]]
+                drift, offset = np.polyfit(mission, wall, 1)
+                lines.append(f"Clock: wall = mission + {offset:.3f} s, "
+                             f"drift {(drift - 1) * 1e6:+.0f} ppm")
+
+    if stats:
+        lines += ["", "Flight",
+                  f"  Launch:   T+{stats['launch_t']:.1f} s",
+                  f"  Apogee:   {stats['apogee_m']:.1f} m above pad at T+{stats['apogee_t']:.1f} s",
+                  f"  Landing:  T+{stats['landing_t']:.1f} s",
+                  f"  Ascent:   {stats['ascent_ms']:.1f} m/s mean, {stats['max_ascent_ms']:.1f} m/s max",
+                  f"  Descent:  {stats['descent_ms']:.1f} m/s mean, {stats['max_descent_ms']:.1f} m/s max"]
+
+    if losses is not None:
+        received = losses['received']
+        total = len(received)
+        lost = total - int(received.sum())
+        lines += ["", "Link",
+                  f"  Packets:  {total - lost}/{total} received, {lost} lost "
+                  f"({100 * lost / total:.1f}%)"]
+        rssi = losses['rssi'][received]
+        if len(rssi) and not np.isnan(rssi).all():
+            lines.append(f"  RSSI:     {np.nanmean(rssi):.1f} dBm mean, "
+                         f"{np.nanmin(rssi):.0f} .. {np.nanmax(rssi):.0f} dBm")
+
+        starts, lengths = loss_bursts(received)
+        if len(starts):
+            lines += ["", f"Longest outages (of {len(starts)})",
+                      "  seq        packets  T+ s      alt m"]
+            for s, n in zip(starts[:top_bursts], lengths[:top_bursts]):
+                lines.append(f"  {losses['sequence'][s]:<10d} {n:<8d} "
+                             f"{losses['mission_t'][s]:<9.1f} {losses['altitude'][s]:.0f}")
+
+        # Idő szerint csak a repülés (a teljes sor az --aligned CSV-ben)
+        mission_t = losses['mission_t']
+        if stats:
+            margin = 2 * time_bin
+            outside = ((mission_t < stats['launch_t'] - margin)
+                       | (mission_t > stats['landing_t'] + margin))
+            mission_t = np.where(outside, np.nan, mission_t)
+
+        for title, values, width, unit in (
+                ("Link budget vs altitude", losses['altitude'], alt_bin, "m"),
+                ("Loss vs mission time", mission_t, time_bin, "s")):
+            edges, expected, got, mean, low = binned(values, received, losses['rssi'], width)
+            lines += ["", title, f"  from {unit:<6} packets   loss %   RSSI mean   RSSI min"]
+            for e, x, g, m, r in zip(edges, expected, got, mean, low):
+                lines.append(f"  {e:<8.0f} {int(x):<9d} {100 * (1 - g / x):<8.1f} "
+                             f"{m:<11.1f} {r:.0f}")
+    return lines
+
+
+def save_aligned(filename, losses):
+    """Sorszámonként: vett-e, küldetés idő, magasság, RSSI"""
+    np.savetxt(filename, np.column_stack((losses['sequence'], losses['received'],
+                                          losses['mission_t'], losses['altitude'],
+                                          losses['rssi'])),
+               fmt=("%d", "%d", "%.2f", "%.1f", "%.0f"), delimiter=",",
+               header="sequence,received,mission_t,altitude_m,rssi", comments="")
+
+
+def save_plots(directory, sd, stats, losses, alt_bin):
+    """
+    Ábrák PNG-ben (matplotlib, ha telepítve van)
+
+    Returns:
+        list: A mentett fájlok (üres, ha nincs matplotlib)
+    """
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return []
+
+    os.makedirs(directory, exist_ok=True)
+    saved = []
+
+    def save(fig, name):
+        path = os.path.join(directory, name)
+        fig.tight_layout()
+        fig.savefig(path, dpi=120)
+        plt.close(fig)
+        saved.append(path)
+
+    if stats:
+        fig, (ax1, ax2) = plt.subplots(2, 1, sharex=True, figsize=(10, 6))
+        ax1.plot(sd['timestamp'], stats['altitude'] - stats['ground_m'], lw=0.8)
+        if losses is not None:
+            lost = ~losses['received']
+            ax1.plot(losses['mission_t'][lost], losses['altitude'][lost] - stats['ground_m'],
+                     'rx', ms=3, label="lost packet")
+            ax1.legend()
+        ax1.axvline(stats['apogee_t'], color='gray', ls=':')
+        ax1.set_ylabel("altitude above pad (m)")
+        ax2.plot(sd['timestamp'], stats['velocity'], lw=0.8)
+        ax2.set_ylabel("vertical speed (m/s)")
+        ax2.set_xlabel("mission time (s)")
+        save(fig, "altitude.png")
+
+    if losses is not None:
+        received = losses['received']
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+        ax1.scatter(losses['altitude'][received], losses['rssi'][received], s=3)
+        ax1.set_xlabel("altitude (m)")
+        ax1.set_ylabel("RSSI (dBm)")
+        edges, expected, got, _, _ = binned(losses['altitude'], received, losses['rssi'], alt_bin)
+        ax2.bar(edges, 100 * (1 - got / expected), width=alt_bin, align='edge')
+        ax2.set_xlabel("altitude (m)")
+        ax2.set_ylabel("packet loss (%)")
+        save(fig, "link_budget.png")
+    return saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Repülés utáni elemzés")
+    parser.add_argument("sd_log", nargs="?", help="Fedélzeti log (cansat_log.csv)")
+    parser.add_argument("ground_log", nargs="?", help="Vevő log (ground_station_log.csv)")
+    parser.add_argument("--mission", help="Csak ez a küldetés azonosító a vevő logból")
+    parser.add_argument("--alt-bin", type=float, default=config.ANALYSIS_ALT_BIN_M,
+                        help="Magasság tartomány (m)")
+    parser.add_argument("--time-bin", type=float, default=config.ANALYSIS_TIME_BIN_S,
+                        help="Idő tartomány (s)")
+    parser.add_argument("--window", type=float, default=config.ANALYSIS_RATE_WINDOW_S,
+                        help="Sebesség simító ablak (s)")
+    parser.add_argument("--report", help="Összefoglaló mentése szövegként")
+    parser.add_argument("--aligned", help="Sorszámonkénti összehangolt CSV")
+    parser.add_argument("--plots", help="Ábrák könyvtára (matplotlib)")
+    args = parser.parse_args()
+
+    if not args.sd_log and not args.ground_log:
+        parser.error("legalább egy log kell")
+
+    t0 = time.perf_counter()
+    sd = ground = stats = losses = None
+    resets = 0
+    anchors = (np.zeros(0), np.zeros(0, dtype=np.int64))
+    try:
+        if args.sd_log and args.sd_log != "-":
+            sd, resets = load_sd_log(args.sd_log)
+        if args.ground_log:
+            ground = load_ground_log(args.ground_log, args.mission)
+    except (OSError, ValueError) as e:
+        print(f"Hiba: {e}")
+        return 1
+    loaded = time.perf_counter() - t0
+
+    if sd is not None:
+        stats = flight_stats(sd, args.window)
+    if ground is not None:
+        if sd is not None and stats:
+            anchors = align(sd, ground)
+            losses = loss_map(ground, anchors[0], anchors[1], sd, stats['altitude'])
+        else:
+            losses = loss_map(ground, anchors[0], anchors[1], None, None)
+    elapsed = time.perf_counter() - t0
+
+    lines = report(sd, resets, ground, anchors, stats, losses, args.alt_bin, args.time_bin)
+    lines += ["", f"Processed in {elapsed:.2f} s (load {loaded:.2f} s)"]
+    print("\n".join(lines))
+
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"Mentve: {args.report}")
+    if args.aligned and losses is not None:
+        save_aligned(args.aligned, losses)
+        print(f"Mentve: {args.aligned}")
+    if args.plots:
+        saved = save_plots(args.plots, sd, stats, losses, args.alt_bin)
+        if saved:
+            print(f"Ábrák: {', '.join(saved)}")
+        else:
+            print("Ábrák kihagyva: nincs matplotlib")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
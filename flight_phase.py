@@ -0,0 +1,157 @@
+"""
+Repülési fázis felismerés barometrikus magasság alapján
+
+Fázisok: PAD (startállás) -> ASCENT (emelkedés) -> APOGEE (csúcspont)
+-> DESCENT (ereszkedés) -> LANDED (földet ért)
+"""
+
+import time
+import config
+
+PAD = 'PAD'
+ASCENT = 'ASCENT'
+APOGEE = 'APOGEE'
+DESCENT = 'DESCENT'
+LANDED = 'LANDED'
+
+# A telemetriában a fázis indexe kerül küldésre
+PHASES = (PAD, ASCENT, APOGEE, DESCENT, LANDED)
+
+
+class FlightPhaseDetector:
+    """
+    Fázis állapotgép
+
+    A földi referencia magasságot startálláson lassú átlagolással követi
+    (a légnyomás napi változása miatt), minden további küszöb ehhez
+    viszonyított (AGL) magasságra vonatkozik. Minden átmenethez
+    `confirm` egymást követő, a feltételt teljesítő minta kell.
+    """
+
+    def __init__(self,
+                 launch_alt=config.PHASE_LAUNCH_ALT,
+                 apogee_drop=config.PHASE_APOGEE_DROP,
+                 descent_drop=config.PHASE_DESCENT_DROP,
+                 landed_band=config.PHASE_LANDED_BAND,
+                 landed_ms=config.PHASE_LANDED_MS,
+                 confirm=config.PHASE_CONFIRM_SAMPLES,
+                 apogee_velocity=config.PHASE_APOGEE_VELOCITY):
+        """
+        Args:
+            launch_alt: Indulás küszöb a talaj felett (m)
+            apogee_drop: Csúcspont: ennyivel a maximum alatt (m)
+            descent_drop: Ereszkedés: ennyivel a maximum alatt (m)
+            landed_band: Földet érés: a magasság ezen a sávon belül marad (m)
+            landed_ms: ...ennyi ideig (ms)
+            confirm: Megerősítő minták száma egy átmenethez
+            apogee_velocity: Csúcspont: a becsült sebesség ez alá esik (m/s)
+        """
+        self.launch_alt = launch_alt
+        self.apogee_drop = apogee_drop
+        self.descent_drop = descent_drop
+        self.landed_band = landed_band
+        self.landed_ms = landed_ms
+        self.confirm = confirm
+        self.apogee_velocity = apogee_velocity
+
+        self.phase = PAD
+        self.changed = False
+        self.ground_alt = None
+        self.max_alt = 0.0
+        self._seed_max = False
+        self._confirm_count = 0
+        self._band_ref = 0.0
+        self._band_start = 0
+
+    def restore(self, phase, ground_alt, max_alt=None):
+        """
+        Állapot visszaállítása újraindulás után
+
+        Args:
+            phase: Mentett fázis neve
+            ground_alt: Mentett földi referencia magasság (m)
+            max_alt: Mentett maximális AGL magasság (m); ha nincs meg,
+                     startálláson túl az első minta lesz a maximum, különben
+                     a 0 kezdőérték azonnali ereszkedést/csúcspontot jelezne
+        """
+        if phase in PHASES:
+            self.phase = phase
+        self.ground_alt = ground_alt
+        self.max_alt = max_alt or 0.0
+        self._seed_max = not max_alt and self.phase != PAD
+        self._confirm_count = 0
+
+    def _confirmed(self, condition):
+        """Megerősítő számláló léptetése"""
+        if condition:
+            self._confirm_count += 1
+        else:
+            self._confirm_count = 0
+        return self._confirm_count >= self.confirm
+
+    def _enter(self, phase):
+        self.phase = phase
+        self.changed = True
+        self._confirm_count = 0
+
+    def update(self, altitude, now_ms, velocity=None):
+        """
+        Új magasság minta feldolgozása
+
+        Args:
+            altitude: Barometrikus (szűrt) magasság (m)
+            now_ms: Minta időpontja (ticks_ms)
+            velocity: Becsült függőleges sebesség (m/s, Kalman szűrő) -
+                      ha van, a csúcspont már a sebesség előjelváltásakor
+                      felismerhető, a magasságcsökkenés kivárása nélkül
+
+        Returns:
+            str: Aktuális fázis (self.changed jelzi, ha most váltott)
+        """
+        self.changed = False
+
+        if self.ground_alt is None:
+            self.ground_alt = altitude
+
+        agl = altitude - self.ground_alt
+        phase = self.phase
+
+        if self._seed_max:
+            self.max_alt = max(self.max_alt, agl)
+            self._seed_max = False
+
+        if phase == PAD:
+            if self._confirmed(agl > self.launch_alt):
+                self.max_alt = agl
+                self._enter(ASCENT)
+            elif agl < self.launch_alt / 2:
+                # Földi referencia lassú követése
+                self.ground_alt += (altitude - self.ground_alt) * 0.05
+
+        elif phase == ASCENT:
+            if agl > self.max_alt:
+                self.max_alt = agl
+            falling = velocity is not None and velocity < self.apogee_velocity
+            if self._confirmed(falling or agl < self.max_alt - self.apogee_drop):
+                self._enter(APOGEE)
+
+        elif phase == APOGEE:
+            if self._confirmed(agl < self.max_alt - self.descent_drop):
+                self._enter(DESCENT)
+                self._band_ref = agl
+                self._band_start = now_ms
+
+        elif phase == DESCENT:
+            if abs(agl - self._band_ref) > self.landed_band:
+                self._band_ref = agl
+                self._band_start = now_ms
+            elif time.ticks_diff(now_ms, self._band_start) >= self.landed_ms:
+                self._enter(LANDED)
+
+        return self.phase
+
+    @property
+    def index(self):
+        """Aktuális fázis indexe (PHASES-ben)"""
+        return PHASES.index(self.phase)
+
@@ -0,0 +1,318 @@
+"""
+Több vevőállomás összefésülése és duplikátum szűrés (gépen, CPython)
+
+Minden vevőállomás (Pico + GroundStation) USB-n egy géphez csatlakozik;
+a `forward` mód a vevő konzol kimenetéből (config.GROUND_FRAME_OUTPUT)
+kiszűri a dekódolt kereteket, és TCP-n a `serve` módban futó
+összefésülőnek küldi. Az összefésülő küldetés azonosító + sorszám szerint
+MERGE_HOLD_MS ideig gyűjti ugyanannak a csomagnak a példányait, majd a
+legjobb RSSI-jű példányt írja ki egyetlen folyamba. A függő és a már
+kiírt kulcsok száma korlátos (MERGE_MAX_PENDING, MERGE_MAX_SEEN), így a
+memória a futási időtől független; a késve érkező példány eldobásra
+kerül.
+
+Protokoll: soronként egy JSON objektum (a parse_telemetry() szótára +
+"receiver").
+
+Az összefésült folyam a telemetria buszra is mehet (--bus, telemetry_bus.py).
+
+Használat:
+    python ground_merge.py serve -o merged_log.csv [--bus]
+    mpremote connect /dev/ttyACM0 run ground_station.py | python ground_merge.py forward --name north
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+
+import config
+from telemetry_bus import TelemetryBus, add_bus_arguments
+
+# Kimeneti oszlopok: mint a ground_station_log.csv, plusz vevő és példányszám
+MERGED_COLUMNS = ('timestamp', 'mission_id', 'sequence', 'temperature', 'pressure',
+                  'altitude', 'audio_rms', 'rssi', 'phase', 'velocity', 'apogee',
+                  'receiver', 'copies')
+
+
+def parse_frame_line(line):
+    """
+    Vevő konzol sorából keret (config.GROUND_FRAME_PREFIX + JSON)
+
+    Returns:
+        dict: A keret vagy None, ha a sor nem keret
+    """
+    if not line.startswith(config.GROUND_FRAME_PREFIX):
+        return None
+    try:
+        frame = json.loads(line[len(config.GROUND_FRAME_PREFIX):])
+    except ValueError:
+        return None
+    if 'mission_id' not in frame or 'sequence' not in frame:
+        return None
+    return frame
+
+
+class Deduplicator:
+    """
+    Korlátos ablakú duplikátum szűrő, a legjobb RSSI-jű példány marad
+
+    A függő kulcsok beszúrási sorrendben állnak, és mindegyik ugyanannyi
+    ideig vár, így a lejártak mindig a sor elején vannak: egy frissítés
+    O(1) (amortizáltan), a tároló mérete korlátos.
+    """
+
+    def __init__(self, hold_ms=config.MERGE_HOLD_MS, max_pending=config.MERGE_MAX_PENDING,
+                 max_seen=config.MERGE_MAX_SEEN):
+        """
+        Args:
+            hold_ms: Ennyi ideig várja ugyanannak a csomagnak a példányait
+            max_pending: Legfeljebb ennyi függő csomag (telítve a legrégebbi
+                         azonnal kimegy)
+            max_seen: Ennyi kiírt kulcsot jegyez meg a késő példányokhoz
+        """
+        self.hold = hold_ms / 1000
+        self.max_pending = max_pending
+        self.max_seen = max_seen
+        self.pending = OrderedDict()  # kulcs -> [határidő, keret, példányok]
+        self.seen = OrderedDict()     # kiírt kulcsok (LRU)
+
+        self.received = 0
+        self.duplicates = 0
+        self.late = 0
+        self.emitted = 0
+
+    def add(self, frame, now=None):
+        """
+        Egy vett példány
+
+        Returns:
+            list: Az emiatt idő előtt kiírandó keretek (telített ablak)
+        """
+        now = time.monotonic() if now is None else now
+        self.received += 1
+        key = (frame['mission_id'], frame['sequence'])
+
+        entry = self.pending.get(key)
+        if entry is not None:
+            self.duplicates += 1
+            entry[2] += 1
+            if _rssi(frame) > _rssi(entry[1]):
+                entry[1] = frame
+            return []
+
+        if key in self.seen:
+            self.duplicates += 1
+            self.late += 1
+            return []
+
+        self.pending[key] = [now + self.hold, frame, 1]
+        ready = []
+        while len(self.pending) > self.max_pending:
+            ready.append(self._emit(*self.pending.popitem(last=False)))
+        return ready
+
+    def expired(self, now=None):
+        """
+        A várakozási időn túli csomagok legjobb példányai
+
+        Returns:
+            list: Kiírandó keretek (sorrendben)
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        while self.pending:
+            key, entry = next(iter(self.pending.items()))
+            if entry[0] > now:
+                break
+            del self.pending[key]
+            ready.append(self._emit(key, entry))
+        return ready
+
+    def flush(self):
+        """Minden függő csomag kiírása (leállításkor)"""
+        ready = [self._emit(key, entry) for key, entry in self.pending.items()]
+        self.pending.clear()
+        return ready
+
+    def _emit(self, key, entry):
+        self.seen[key] = True
+        if len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+        self.emitted += 1
+        frame = entry[1]
+        frame['copies'] = entry[2]
+        return frame
+
+    def summary(self):
+        """Formátum: "vett/duplikátum/késő/kiírt" """
+        return f"{self.received}/{self.duplicates}/{self.late}/{self.emitted}"
+
+
+def _rssi(frame):
+    """Példány RSSI-je összehasonlításhoz; hiányzó vagy nem szám: -1000"""
+    try:
+        return float(frame.get('rssi'))
+    except (TypeError, ValueError):
+        return -1000
+
+
+class MergeServer:
+    """TCP összefésülő: vevőnként egy kapcsolat, egy kimeneti folyam"""
+
+    def __init__(self, output=None, echo=False, dedup=None):
+        """
+        Args:
+            output: Összefésült CSV fájl (megnyitva, hozzáfűzésre)
+            echo: Összefésült keretek JSON-ként a szabványos kimenetre
+            dedup: Deduplicator (alapértelmezett beállításokkal, ha None)
+        """
+        self.output = output
+        self.echo = echo
+        self.dedup = dedup or Deduplicator()
+        self.receivers = {}  # név -> vett keretek
+        self.sinks = []      # további fogyasztók: callable(frame)
+
+    async def handle_receiver(self, reader, writer):
+        """Egy vevő kapcsolat: soronként egy JSON keret"""
+        peer = writer.get_extra_info('peername')
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(frame, dict) or 'mission_id' not in frame or 'sequence' not in frame:
+                    continue
+                name = frame.setdefault('receiver', str(peer))
+                self.receivers[name] = self.receivers.get(name, 0) + 1
+                self.write(self.dedup.add(frame))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def write(self, frames):
+        """Összefésült keretek kiírása"""
+        for frame in frames:
+            if self.output:
+                self.output.write(",".join(_csv_value(frame.get(c)) for c in MERGED_COLUMNS) + "\n")
+            if self.echo:
+                print(json.dumps(frame), flush=True)
+            for sink in self.sinks:
+                sink(frame)
+        if frames and self.output:
+            self.output.flush()
+
+    async def run(self, host, port, report_s=30):
+        """Szerver futtatása; a lejárt csomagok MERGE_FLUSH_MS-onként mennek ki"""
+        server = await asyncio.start_server(self.handle_receiver, host, port)
+        last_report = time.monotonic()
+        try:
+            async with server:
+                while True:
+                    await asyncio.sleep(config.MERGE_FLUSH_MS / 1000)
+                    self.write(self.dedup.expired())
+                    if report_s and time.monotonic() - last_report >= report_s:
+                        last_report = time.monotonic()
+                        per_receiver = " ".join(f"{n}={c}" for n, c in self.receivers.items())
+                        print(f"merge {self.dedup.summary()} {per_receiver}", file=sys.stderr)
+        finally:
+            self.write(self.dedup.flush())
+
+
+def _csv_value(value):
+    return "" if value is None else str(value)
+
+
+async def forward(name, host, port, source=sys.stdin):
+    """
+    Vevő konzol kimenetének továbbítása az összefésülőnek
+
+    A keret sorok TCP-n mennek (kapcsolat bontás után újrakapcsolódik), a
+    többi sor változatlanul a szabványos kimenetre kerül.
+    """
+    loop = asyncio.get_running_loop()
+    writer = None
+    while True:
+        line = await loop.run_in_executor(None, source.readline)
+        if not line:
+            break
+        frame = parse_frame_line(line.rstrip("\r\n"))
+        if frame is None:
+            sys.stdout.write(line)
+            continue
+
+        frame['receiver'] = name
+        for _ in range(2):
+            try:
+                if writer is None:
+                    _, writer = await asyncio.open_connection(host, port)
+                writer.write((json.dumps(frame) + "\n").encode())
+                await writer.drain()
+                break
+            except OSError:
+                writer = None
+    if writer:
+        writer.close()
+
+
+async def serve(args, output):
+    """Összefésülő (és opcionálisan a busz) futtatása"""
+    merge = MergeServer(output, args.echo)
+    if not args.bus:
+        await merge.run(args.host, args.port)
+        return
+
+    bus = TelemetryBus(args.bus_queue, args.bus_policy)
+    merge.sinks.append(bus.publish)
+    async with await bus.start(args.bus_host, args.bus_port, args.bus_unix):
+        await merge.run(args.host, args.port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Több vevőállomás összefésülése")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    serve = sub.add_parser("serve", help="Összefésülő szerver")
+    serve.add_argument("-o", "--output", help="Összefésült CSV (hozzáfűzés)")
+    serve.add_argument("--echo", action="store_true", help="Keretek JSON-ként a kimenetre")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=config.MERGE_PORT)
+    serve.add_argument("--bus", action="store_true", help="Publikálás a telemetria buszra")
+    add_bus_arguments(serve)
+
+    fwd = sub.add_parser("forward", help="Vevő konzol kimenet továbbítása (stdin)")
+    fwd.add_argument("--name", required=True, help="Vevő neve (pl. helyszín)")
+    fwd.add_argument("--host", default="127.0.0.1")
+    fwd.add_argument("--port", type=int, default=config.MERGE_PORT)
+
+    args = parser.parse_args()
+
+    try:
+        if args.mode == "forward":
+            asyncio.run(forward(args.name, args.host, args.port))
+            return 0
+
+        output = None
+        if args.output:
+            output = open(args.output, "a")
+            if output.tell() == 0:
+                output.write(",".join(MERGED_COLUMNS) + "\n")
+        try:
+            asyncio.run(serve(args, output))
+        finally:
+            if output:
+                output.close()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,13 @@ LoRa telemetria fogadása és megjelenítése
 """
 
 from machine import SPI, Pin
+import json
+import select
+import sys
 import time
 from lora_radio import LoRaRadio
+from downlink import DownlinkReceiver
+from uplink import UplinkAuth, COMMANDS
 import config
 
 class GroundStation:
@@ -32,6 +37,15 @@ class GroundStation:
 
         self.packet_count = 0
         self.last_packet_time = 0
+        self.profile = config.LORA_DEFAULT_PROFILE
+        self.phase = 0
+        self.last_scan_time = time.time()
+        self.downlink = None  # DownlinkReceiver az első letöltött darabtól
+
+        # Parancsok: aláírva sorba, a CanSat vételi ablakában (egy telemetria
+        # csomag után) mennek ki, nyugtáig vagy UPLINK_RETRIES próbáig
+        self.uplink = UplinkAuth(counter_file="uplink_counter.txt")
+        self.commands = []  # [számláló, csomag, próbák]
 
     def receive(self):
         """
@@ -51,24 +65,43 @@ class GroundStation:
             irq_flags = self.lora._read_register(self.lora.REG_IRQ_FLAGS)
 
             if irq_flags & 0x40:  # RxDone
-                # Packet fogadva
-                packet_length = self.lora._read_register(self.lora.REG_RX_NB_BYTES)
-                fifo_addr = self.lora._read_register(self.lora.REG_FIFO)
-
-                self.lora._write_register(self.lora.REG_FIFO_ADDR_PTR, fifo_addr)
-
-                # FIFO olvasás
-                self.lora.cs.value(0)
-                self.lora.spi.write(bytes([self.lora.REG_FIFO & 0x7F]))
-                data = self.lora.spi.read(packet_length)
-                self.lora.cs.value(1)
+                # Packet fogadva (a FIFO a csomag kezdőcímétől olvasva)
+                data = self.lora._read_packet()
 
                 # IRQ flag törlése
                 self.lora._write_register(self.lora.REG_IRQ_FLAGS, 0xFF)
 
+                if irq_flags & 0x20:  # PayloadCrcError: sérült csomag
+                    return None
+
                 # Adat dekódolása
                 message = data.decode('utf-8', 'ignore')
-                return self.parse_telemetry(message)
+
+                # Fázis / profilváltás bejelentés, housekeeping csomag
+                kind = message.split(',', 2)[1:2]
+                if kind == ['PH']:
+                    self.handle_phase_announce(message)
+                    return None
+                if kind == ['HK']:
+                    self.handle_housekeeping(message)
+                    return None
+                if kind == ['EV']:
+                    self.handle_event(message)
+                    return None
+                if kind == ['DL']:
+                    self.handle_downlink(message)
+                    return None
+                if kind == ['DQ']:
+                    self.handle_downlink_poll(message)
+                    return None
+                if kind == ['CA']:
+                    self.handle_command_ack(message)
+                    return None
+
+                data = self.parse_telemetry(message)
+                if data:
+                    self.send_pending_command()
+                return data
 
             return None
 
@@ -79,7 +112,7 @@ class GroundStation:
         """
         Telemetria üzenet feldolgozása
 
-        Formátum: "ID,seq,temp,pres,alt,audio"
+        Formátum: "ID,seq,temp,pres,alt,audio[,phase[,vel,apogee]]"
 
         Returns:
             dict: Telemetria adatok
@@ -89,6 +122,8 @@ class GroundStation:
             if len(parts) >= 6:
                 self.packet_count += 1
                 self.last_packet_time = time.time()
+                if len(parts) >= 7:
+                    self.phase = int(parts[6])
 
                 return {
                     'mission_id': parts[0],
@@ -97,6 +132,9 @@ class GroundStation:
                     'pressure': float(parts[3]),
                     'altitude': float(parts[4]),
                     'audio_rms': float(parts[5]),
+                    'phase': self.phase,
+                    'velocity': float(parts[7]) if len(parts) >= 9 else None,
+                    'apogee': float(parts[8]) if len(parts) >= 9 else None,
                     'rssi': self.get_rssi(),
                     'timestamp': time.time()
                 }
@@ -105,6 +143,161 @@ class GroundStation:
 
         return None
 
+    def handle_phase_announce(self, message):
+        """
+        Fázis / rádió profil váltás követése
+
+        Formátum: "ID,PH,phase,profil"
+        """
+        try:
+            parts = message.split(',')
+            self.phase = int(parts[2])
+            self.last_packet_time = time.time()
+            self.set_profile(parts[3])
+            print(f"Phase change: {self.phase}, radio profile: {self.profile}")
+        except:
+            pass
+
+    def handle_housekeeping(self, message, filename="ground_hk_log.csv"):
+        """
+        Housekeeping (lépésenkénti futásidő) csomag megjelenítése és mentése
+
+        Formátum: "ID,HK,ablak_ms,lépés=db/hiba/min/átlag/max/foglalás;...;heap=...;baro0x76=...;f_pres=..."
+        """
+        try:
+            parts = message.split(',', 3)
+            self.last_packet_time = time.time()
+            print("-" * 60)
+            print(f"Housekeeping ({int(parts[2]) / 1000:.0f} s window)")
+            for stage in parts[3].split(';'):
+                name, stats = stage.split('=')
+                values = stats.split('/')
+                if name == 'heap':
+                    free_min, alloc_max, gc_count, gc_max = values
+                    print(f"  heap     free_min={free_min} alloc_max={alloc_max} "
+                          f"gc={gc_count} gc_max={gc_max} us")
+                    continue
+                if name.startswith('f_'):
+                    count, rejected = values
+                    print(f"  {name:8} n={count:>5} rejected={rejected}")
+                    continue
+                if name.startswith('baro'):
+                    reads, errors, outliers = values
+                    print(f"  {name:8} reads={reads:>5} err={errors:>3} outliers={outliers}")
+                    continue
+                count, errors, t_min, t_mean, t_max, alloc = values
+                print(f"  {name:8} n={count:>5} err={errors:>3} "
+                      f"min/mean/max={t_min}/{t_mean}/{t_max} us alloc={alloc} B")
+            print("-" * 60)
+
+            with open(filename, 'a') as f:
+                f.write(f"{time.time()},{message}\n")
+        except:
+            pass
+
+    def handle_event(self, message, filename="ground_event_log.csv"):
+        """
+        Akusztikus esemény összegzés megjelenítése és mentése
+
+        Formátum: "ID,EV,sorszám,idő_ms,csúcs,max_rms,küszöb_feletti_ms"
+        """
+        try:
+            parts = message.split(',')
+            self.last_packet_time = time.time()
+            print(f"Acoustic event #{parts[2]} at T+{int(parts[3]) / 1000:.2f} s: "
+                  f"peak={parts[4]} rms={parts[5]} loud={parts[6]} ms")
+
+            with open(filename, 'a') as f:
+                f.write(f"{time.time()},{message}\n")
+        except:
+            pass
+
+    def handle_downlink(self, message):
+        """Tömeges letöltés adatcsomag: "ID,DL,index,méret,<adat>" """
+        self.last_packet_time = time.time()
+        if self.downlink is None:
+            self.downlink = DownlinkReceiver()
+        self.downlink.handle_chunk(message)
+
+    def handle_downlink_poll(self, message):
+        """
+        Lekérdezés: a hiánylista azonnal vissza, a CanSat vételi ablaka alatt
+
+        Formátum: "ID,DQ,kurzor" -> "ID,NK,eddig,a-b;c;..."
+        """
+        try:
+            self.last_packet_time = time.time()
+            if self.downlink is None:
+                self.downlink = DownlinkReceiver()
+            reply = self.uplink.sign(self.downlink.nack(message))
+            self.lora.send(reply)
+            received = self.downlink.received
+            done = "complete" if self.downlink.complete else "in progress"
+            print(f"Downlink: {self.downlink.size} B, {received.count} chunks, {done}")
+        except:
+            pass
+
+    def queue_command(self, cmd, arg=''):
+        """
+        Parancs sorba állítása (UPLINK_COMMANDS: TI, RP, RT, DL)
+
+        Returns:
+            int: A parancs számlálója
+        """
+        if cmd not in COMMANDS:
+            raise ValueError(f"Ismeretlen parancs: {cmd}")
+        counter, packet = self.uplink.command(cmd, arg)
+        self.commands.append([counter, packet, 0])
+        return counter
+
+    def send_pending_command(self):
+        """A legrégebbi nyugtázatlan parancs küldése (telemetria vétele után)"""
+        if not self.commands:
+            return
+        command = self.commands[0]
+        self.lora.send(command[1])
+        command[2] += 1
+        if command[2] >= config.UPLINK_RETRIES:
+            print(f"Command #{command[0]} not acknowledged, dropped")
+            self.commands.pop(0)
+
+    def handle_command_ack(self, message):
+        """
+        Parancs nyugta
+
+        Formátum: "ID,CA,számláló,ok|dup|err|part:n" (part:n: újraküldés
+        csak n sorszámig, a többi újra kérhető)
+        """
+        try:
+            parts = message.split(',')
+            counter = int(parts[2])
+            self.last_packet_time = time.time()
+            print(f"Command #{counter}: {parts[3]}")
+            self.commands = [c for c in self.commands if c[0] != counter]
+        except:
+            pass
+
+    def set_profile(self, name):
+        """Vevő rádió profil váltása (config.LORA_PROFILES kulcs)"""
+        if name in config.LORA_PROFILES and name != self.profile:
+            self.lora.set_profile(**config.LORA_PROFILES[name])
+            self.profile = name
+
+    def check_link(self):
+        """
+        Kapcsolat figyelése: ha LORA_SCAN_TIMEOUT ideig nem jön csomag
+        (pl. elmaradt egy profilváltás bejelentés), a következő profilra vált
+        """
+        now = time.time()
+        last = max(self.last_packet_time, self.last_scan_time)
+        if now - last < config.LORA_SCAN_TIMEOUT:
+            return
+
+        names = list(config.LORA_PROFILES)
+        index = names.index(self.profile) if self.profile in names else -1
+        self.set_profile(names[(index + 1) % len(names)])
+        self.last_scan_time = now
+
     def get_rssi(self):
         """
         RSSI (Received Signal Strength Indicator) lekérése
@@ -125,17 +318,26 @@ class GroundStation:
             print(f"Pressure: {data['pressure']:.2f} hPa")
             print(f"Altitude: {data['altitude']:.1f} m")
             print(f"Audio RMS: {data['audio_rms']:.4f}")
+            print(f"Phase: {data['phase']}")
+            if data['velocity'] is not None:
+                print(f"Velocity: {data['velocity']:.1f} m/s (apogee: {data['apogee']:.1f} m)")
             print(f"RSSI: {data['rssi']} dBm")
             print(f"Time: {data['timestamp']:.2f}")
             print("=" * 60)
 
+    @staticmethod
+    def frame_line(data):
+        """Gépi sor a konzolra (ground_merge.py forward): prefix + JSON"""
+        return config.GROUND_FRAME_PREFIX + json.dumps(data)
+
     def log_to_file(self, data, filename="ground_station_log.csv"):
         """Telemetria mentése fájlba"""
         try:
             with open(filename, 'a') as f:
                 f.write(f"{data['timestamp']},{data['mission_id']},{data['sequence']},"
                        f"{data['temperature']},{data['pressure']},{data['altitude']},"
-                       f"{data['audio_rms']},{data['rssi']}\n")
+                       f"{data['audio_rms']},{data['rssi']},{data['phase']},"
+                       f"{data['velocity']},{data['apogee']}\n")
         except:
             pass
 
@@ -152,18 +354,37 @@ def main():
         return
 
     print("Waiting for telemetry...")
+    print("Commands: TI <ms> | RP <profile> | RT <seq>[-<seq>] | DL <1|0|a>")
     print("Press Ctrl+C to stop")
     print()
 
+    # Parancsok a konzolról, blokkolás nélkül
+    console = select.poll()
+    console.register(sys.stdin, select.POLLIN)
+
     try:
         while True:
             data = station.receive()
 
             if data:
-                station.display_telemetry(data)
+                if config.GROUND_DISPLAY:
+                    station.display_telemetry(data)
                 station.log_to_file(data)
-
-            time.sleep_ms(100)
+                if config.GROUND_FRAME_OUTPUT:
+                    print(station.frame_line(data))
+            else:
+                station.check_link()
+
+            if console.poll(0):
+                line = sys.stdin.readline().split()
+                try:
+                    counter = station.queue_command(line[0].upper(), line[1] if len(line) > 1 else '')
+                    print(f"Command #{counter} queued")
+                except Exception as e:
+                    print(f"Invalid command: {e}")
+
+            # Rövid ciklus: a válasznak a CanSat vételi ablakába kell esnie
+            time.sleep_ms(20)
 
     except KeyboardInterrupt:
         print("\nGround station stopped.")
@@ -0,0 +1,89 @@
+"""
+Heap figyelés és szabályozott szemétgyűjtés (GC)
+
+A MicroPython GC alapesetben akkor fut, amikor egy foglalás nem fér el,
+vagyis bárhol: TX közben, I2S olvasás közben. Itt a gyűjtés a ciklusok
+közötti tétlen időben (slack) történik, amikor a legközelebbi határidőig
+biztosan belefér; a gc.threshold csak biztonsági háló arra az esetre,
+ha a tétlen gyűjtések elmaradnak.
+"""
+
+import gc
+import time
+from loop_timing import Histogram
+
+# GC futásidő hisztogram vödörhatárai (µs)
+GC_BOUNDS_US = (500, 1000, 2000, 5000, 10000, 20000)
+
+
+class HeapMonitor:
+    """Heap statisztika és tétlen idejű GC"""
+
+    def __init__(self, threshold, idle_budget, min_slack_ms):
+        """
+        Args:
+            threshold: gc.threshold érték (bájt, automatikus gyűjtés küszöbe)
+            idle_budget: Ennyi új foglalás után gyűjt a tétlen időben (bájt)
+            min_slack_ms: Csak ennyi szabad idő esetén gyűjt
+        """
+        self.threshold = threshold
+        self.idle_budget = idle_budget
+        self.min_slack_ms = min_slack_ms
+
+        self.alloc_after_gc = 0
+        self.collections = 0
+        self.gc_time = Histogram(GC_BOUNDS_US)
+        self.free_min = None
+        self.alloc_max = 0
+
+    def setup(self):
+        """Kezdeti gyűjtés és automatikus küszöb beállítása"""
+        gc.collect()
+        gc.threshold(self.threshold)
+        self.alloc_after_gc = gc.mem_alloc()
+
+    def maybe_collect(self, slack_ms):
+        """
+        Gyűjtés a tétlen időben, ha szükséges és belefér
+
+        Args:
+            slack_ms: Idő a legközelebbi határidőig
+
+        Returns:
+            bool: Történt-e gyűjtés
+        """
+        if slack_ms < self.min_slack_ms:
+            return False
+        if gc.mem_alloc() - self.alloc_after_gc < self.idle_budget:
+            return False
+
+        t0 = time.ticks_us()
+        gc.collect()
+        self.gc_time.add(time.ticks_diff(time.ticks_us(), t0))
+        self.collections += 1
+        self.alloc_after_gc = gc.mem_alloc()
+        return True
+
+    def sample(self):
+        """Ciklusonkénti heap mintavétel (minimum szabad, maximum foglalt)"""
+        free = gc.mem_free()
+        alloc = gc.mem_alloc()
+        if self.free_min is None or free < self.free_min:
+            self.free_min = free
+        if alloc > self.alloc_max:
+            self.alloc_max = alloc
+
+    def summary(self):
+        """
+        Kompakt összegzés
+
+        Formátum: "min_szabad/max_foglalt/gc_db/gc_max_us"
+        """
+        return f"{self.free_min}/{self.alloc_max}/{self.collections}/{self.gc_time.max}"
+
+    def reset(self):
+        """Új mérési ablak"""
+        self.collections = 0
+        self.gc_time.reset()
+        self.free_min = None
+        self.alloc_max = 0
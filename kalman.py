@@ -0,0 +1,192 @@
+"""
+Kalman szűrő barometrikus magasságra: magasság, függőleges sebesség, gyorsulás
+
+Állandó gyorsulású modell (fehér zaj rángás), mérés: a barometrikus
+magasság. Változó mintaközzel is működik (a barométer periódusa fázisonként
+más). Frissítésenként állandó számú művelet; az állapot és a kovariancia
+előre foglalt float tömbökben, helyben frissül, frissítésenként nem jön
+létre lista / tuple / mátrix.
+
+A szimmetrikus 3x3 kovariancia 6 eleme: P00, P01, P02, P11, P12, P22.
+"""
+
+import time
+from array import array
+import config
+
+try:
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    # CPython (földi feldolgozás, szimuláció): ms időbélyegek
+    def ticks_diff(a, b):
+        return a - b
+
+G = 9.80665  # m/s^2
+
+
+class AltitudeKalman:
+    """Magasság / sebesség / gyorsulás becslő, csúcspont előrejelzéssel"""
+
+    def __init__(self,
+                 meas_std=config.KALMAN_MEAS_STD,
+                 jerk_std=config.KALMAN_JERK_STD,
+                 gate=config.KALMAN_GATE):
+        """
+        Args:
+            meas_std: Barometrikus magasság zaja (m, szórás)
+            jerk_std: Folytonos rángás zaj spektrális sűrűsége (m/s^3)
+            gate: Innovációs kapu (szórásban); ezen kívüli minta eldobva
+        """
+        self.r = meas_std * meas_std
+        self.q = jerk_std * jerk_std
+        self.gate2 = gate * gate
+
+        self.x = array('f', (0.0, 0.0, 0.0))  # magasság, sebesség, gyorsulás
+        self.p = array('f', (0.0,) * 6)
+        self.last_ms = None
+        self.rejected = 0          # Kapun kívüli minták (összesen)
+        self._reject_run = 0       # Egymást követő eldobások
+
+    def reset(self, altitude, now_ms):
+        """Indítás egy mért magasságból, nyugalmi állapotban"""
+        x = self.x
+        x[0] = altitude
+        x[1] = 0.0
+        x[2] = 0.0
+        p = self.p
+        p[0] = self.r
+        p[1] = 0.0
+        p[2] = 0.0
+        p[3] = 100.0   # (10 m/s)^2
+        p[4] = 0.0
+        p[5] = 400.0   # (20 m/s^2)^2
+        self.last_ms = now_ms
+        self._reject_run = 0
+
+    def update(self, altitude, now_ms):
+        """
+        Predikció a mintaközre és korrekció a mért magassággal
+
+        Args:
+            altitude: Mért barometrikus magasság (m)
+            now_ms: Minta időpontja (ticks_ms)
+
+        Returns:
+            bool: False, ha a minta a kapun kívül esett (csak predikció)
+        """
+        if self.last_ms is None:
+            self.reset(altitude, now_ms)
+            return True
+
+        dt = ticks_diff(now_ms, self.last_ms) / 1000
+        self.last_ms = now_ms
+        if dt > 0:
+            self._predict(dt)
+
+        x = self.x
+        p = self.p
+        y = altitude - x[0]
+        s = p[0] + self.r
+
+        # Kiugró minta: eldobás, de több egymás utáni után elfogadás
+        # (valós, a modellnél gyorsabb változás, pl. indulás)
+        if y * y > self.gate2 * s and self._reject_run < config.KALMAN_MAX_REJECTS:
+            self.rejected += 1
+            self._reject_run += 1
+            return False
+        self._reject_run = 0
+
+        k0 = p[0] / s
+        k1 = p[1] / s
+        k2 = p[2] / s
+        x[0] += k0 * y
+        x[1] += k1 * y
+        x[2] += k2 * y
+
+        p00 = p[0]
+        p01 = p[1]
+        p02 = p[2]
+        p[0] = p00 - k0 * p00
+        p[1] = p01 - k0 * p01
+        p[2] = p02 - k0 * p02
+        p[3] -= k1 * p01
+        p[4] -= k1 * p02
+        p[5] -= k2 * p02
+        return True
+
+    def _predict(self, dt):
+        """Állapot és kovariancia léptetése dt másodperccel (P = F P F' + Q)"""
+        x = self.x
+        p = self.p
+        h = dt
+        g = dt * dt / 2
+
+        x[0] += x[1] * h + x[2] * g
+        x[1] += x[2] * h
+
+        # Elemenként (a tuple kicsomagolás MicroPython-on tuple-t foglalna)
+        p00 = p[0]
+        p01 = p[1]
+        p02 = p[2]
+        p11 = p[3]
+        p12 = p[4]
+        p22 = p[5]
+        # F * P sorai
+        a0 = p00 + h * p01 + g * p02
+        a1 = p01 + h * p11 + g * p12
+        a2 = p02 + h * p12 + g * p22
+        b1 = p11 + h * p12
+        b2 = p12 + h * p22
+
+        # Rángás zaj (diszkretizált)
+        q = self.q
+        dt2 = dt * dt
+        dt3 = dt2 * dt
+
+        p[0] = a0 + h * a1 + g * a2 + q * dt3 * dt2 / 20
+        p[1] = a1 + h * a2 + q * dt2 * dt2 / 8
+        p[2] = a2 + q * dt3 / 6
+        p[3] = b1 + h * b2 + q * dt3 / 3
+        p[4] = b2 + q * dt2 / 2
+        p[5] = p22 + q * dt
+
+    @property
+    def altitude(self):
+        return self.x[0]
+
+    @property
+    def velocity(self):
+        return self.x[1]
+
+    @property
+    def acceleration(self):
+        return self.x[2]
+
+    def apogee(self):
+        """
+        Előrejelzett csúcsmagasság
+
+        Emelkedés közben a becsült lassulással számol; ha az kisebb g-nél
+        (még tolóerő alatt), akkor g-vel, légellenállás nélkül.
+
+        Returns:
+            float: Várható legnagyobb magasság (m); nem emelkedve a mostani
+        """
+        h = self.x[0]
+        v = self.x[1]
+        if v <= 0:
+            return h
+        a = self.x[2]
+        if a > -G:
+            a = -G
+        return h - v * v / (2 * a)
+
+    def time_to_apogee(self):
+        """Várható idő a csúcspontig (s), 0 ha nem emelkedik"""
+        v = self.x[1]
+        if v <= 0:
+            return 0.0
+        a = self.x[2]
+        if a > -G:
+            a = -G
+        return -v / a
@@ -1,8 +1,32 @@
-from machine import Pin
+from machine import Pin, Timer
 import time
 
+# Csatornák a minta táblában
+STATUS = 0
+ERROR = 1
+
+
 class LEDController:
-    """LED státusz és hibajelző kezelő"""
+    """
+    LED státusz és hibajelző kezelő
+
+    A blokkoló metódusok (error_blink, heartbeat) a komponens teszthez
+    maradtak; repülés közben a show() / show_error() mintamotor használandó,
+    ami azonnal visszatér, a villogtatást egy machine.Timer callback végzi.
+    """
+
+    TICK_MS = 10
+
+    # Minta tábla: név -> (csatorna, fázisidők ms-ban [be, ki, be, ki, ...], ismétlődő)
+    PATTERNS = {
+        'heartbeat': (STATUS, (50,), False),
+        'alive':     (STATUS, (50, 950), True),
+        'error1':    (ERROR, (200, 200), False),
+        'error2':    (ERROR, (200, 200) * 2, False),
+        'error3':    (ERROR, (200, 200) * 3, False),
+        'error5':    (ERROR, (200, 200) * 5, False),
+        'fault':     (ERROR, (100, 100), True),
+    }
 
     def __init__(self, status_pin, error_pin):
         self.status_led = Pin(status_pin, Pin.OUT)
@@ -10,6 +34,81 @@ class LEDController:
         self.status_led.value(0)
         self.error_led.value(0)
 
+        # Mintamotor állapota csatornánként (előre lefoglalva, a callback nem foglal)
+        self._pins = (self.status_led, self.error_led)
+        self._steps = [None, None]
+        self._index = [0, 0]
+        self._remaining = [0, 0]
+        self._repeat = [False, False]
+        self._timer = None
+
+    def start_engine(self):
+        """Mintamotor indítása (periodikus machine.Timer)"""
+        if self._timer is None:
+            self._timer = Timer(period=self.TICK_MS, mode=Timer.PERIODIC, callback=self._tick)
+
+    def stop_engine(self):
+        """Mintamotor leállítása, LED-ek kikapcsolása"""
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
+        for ch in (STATUS, ERROR):
+            self._steps[ch] = None
+            self._pins[ch].value(0)
+
+    def _play(self, channel, steps, repeat):
+        """Minta indítása egy csatornán (a futó minta felülíródik)"""
+        self.start_engine()
+        # A callback a steps beállításáig nem nyúl a csatornához
+        self._steps[channel] = None
+        self._index[channel] = 0
+        self._remaining[channel] = steps[0]
+        self._repeat[channel] = repeat
+        self._pins[channel].value(1)
+        self._steps[channel] = steps
+
+    def show(self, name):
+        """
+        Minta lejátszása a PATTERNS táblából (azonnal visszatér)
+
+        Args:
+            name: Minta neve (pl. 'heartbeat', 'error3')
+        """
+        channel, steps, repeat = self.PATTERNS[name]
+        self._play(channel, steps, repeat)
+
+    def show_error(self, count):
+        """Hiba villogás `count` alkalommal (azonnal visszatér)"""
+        name = 'error' + str(count)
+        if name in self.PATTERNS:
+            self.show(name)
+        else:
+            self._play(ERROR, (200, 200) * count, False)
+
+    def _tick(self, timer):
+        """Timer callback: a futó minták léptetése"""
+        for ch in (STATUS, ERROR):
+            steps = self._steps[ch]
+            if steps is None:
+                continue
+
+            self._remaining[ch] -= self.TICK_MS
+            if self._remaining[ch] > 0:
+                continue
+
+            index = self._index[ch] + 1
+            if index >= len(steps):
+                if not self._repeat[ch]:
+                    self._steps[ch] = None
+                    self._pins[ch].value(0)
+                    continue
+                index = 0
+
+            self._index[ch] = index
+            self._remaining[ch] = steps[index]
+            # Páros index: bekapcsolt, páratlan: kikapcsolt fázis
+            self._pins[ch].value(1 if index % 2 == 0 else 0)
+
     def status_on(self):
         """Státusz LED bekapcsolás (normál működés)"""
         self.status_led.value(1)
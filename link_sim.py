@@ -0,0 +1,612 @@
+"""
+LoRa kapcsolat szimulátor: LoRaRadio adó -> GroundStation vevő egy folyamatban (gépen)
+
+Két emulált SX127x (regiszterek, FIFO, SPI, IRQ flagek) egy közös
+csatornán; a valódi meghajtó (lora_radio.LoRaRadio.send_async) és a
+valódi vevő kód (ground_station.GroundStation.receive, 20 ms-os
+lekérdezéssel, mint a main-ben) fut rajtuk, virtuális órával: egy több
+órás mérés is másodpercek alatt lefut.
+
+Csatorna modell:
+    - útcsillapítás: szabadtéri 1 m-en, utána log-távolság kitevővel
+      (SIM_PATH_LOSS_EXP), csomagonként normális árnyékolással
+      (SIM_SHADOWING_DB)
+    - zaj: -174 dBm/Hz + 10 log10(BW) + SIM_NOISE_FIGURE_DB
+    - csomaghiba: a demodulációs SNR küszöb SF-enként (SX1276 adatlap),
+      bájtonkénti hibavalószínűség logisztikus vízeséssel
+      (SIM_SNR_SLOPE_DB), PER = 1 - (1 - p) ^ hossz; CRC hibás csomag
+      RxDone + PayloadCrcError flaggel érkezik
+    - a küszöb alatt SIM_DETECT_MARGIN_DB-vel a preamble sem detektálódik
+    - adásidő: lora_radio.airtime_ms; a vevőnek a preamble alatt RX
+      módban kell lennie, azonos frekvencián és modem beállításokkal
+    - duty cycle: AirtimeBudget (config.DL_DUTY_CYCLE), --enforce-duty
+      mellett a küldő kivárja a keretet
+
+Mér profilonként, csomag formátumonként és távolságonként: kézbesítés,
+hiányzó / CRC hibás / időtúllépéses adás, késleltetés (küldés kezdete ->
+GroundStation), goodput, RSSI / SNR, duty cycle.
+
+Használat:
+    python link_sim.py                                   # minden profil, alap formátumok
+    python link_sim.py --profile robust --format kf dl --distance 2000 8000 15000
+    python link_sim.py --packets 1000 --enforce-duty --csv sim.csv
+"""
+
+import argparse
+import contextlib
+import heapq
+import importlib
+import math
+import os
+import random
+import sys
+import tempfile
+import types
+
+import config
+from downlink import DownlinkReceiver
+
+# Az SX1276 demodulációs SNR küszöbe (dB) SF-enként
+SNR_THRESHOLD = {6: -5.0, 7: -7.5, 8: -10.0, 9: -12.5, 10: -15.0, 11: -17.5, 12: -20.0}
+
+FORMATS = ('basic', 'kf', 'dl')
+SIM_EPOCH = 1700000000.0  # A virtuális time.time() kezdete
+# Az emulált hardverre importált modulok (`from machine import ...`)
+SIM_MODULES = ('lora_radio', 'ground_station')
+
+
+class SimClock:
+    """
+    Virtuális idő eseménysorral
+
+    A sleep_ms() az eltelt idő alatt esedékes eseményeket (vevő
+    lekérdezés, adás vége) sorban lefuttatja; az események maguk is
+    alhatnak (egymásba ágyazva), az idő mindig csak előre halad.
+    """
+
+    def __init__(self):
+        self.now = 0.0  # ms
+        self._events = []
+        self._count = 0
+
+    def at(self, t_ms, callback):
+        """Esemény ütemezése abszolút időpontra"""
+        self._count += 1
+        heapq.heappush(self._events, (t_ms, self._count, callback))
+
+    def run_until(self, t_ms):
+        while self._events and self._events[0][0] <= t_ms:
+            t, _, callback = heapq.heappop(self._events)
+            self.now = max(self.now, t)
+            callback()
+        self.now = max(self.now, t_ms)
+
+    def sleep_ms(self, ms):
+        self.run_until(self.now + ms)
+
+    def time_module(self):
+        """MicroPython time API a virtuális órára"""
+        clock = self
+        mod = types.ModuleType('time')
+        mod.ticks_ms = lambda: int(clock.now)
+        mod.ticks_us = lambda: int(clock.now * 1000)
+        mod.ticks_diff = lambda a, b: a - b
+        mod.ticks_add = lambda a, b: a + b
+        mod.sleep_ms = clock.sleep_ms
+        mod.sleep_us = lambda us: clock.sleep_ms(us / 1000)
+        mod.sleep = lambda s: clock.sleep_ms(s * 1000)
+        mod.time = lambda: SIM_EPOCH + clock.now / 1000
+        return mod
+
+    def asyncio_module(self):
+        """A meghajtó által használt uasyncio rész (sleep_ms): szinkron alvás"""
+        clock = self
+        mod = types.ModuleType('asyncio')
+
+        async def sleep_ms(ms):
+            clock.sleep_ms(ms)
+
+        async def sleep(s):
+            clock.sleep_ms(s * 1000)
+
+        mod.sleep_ms = sleep_ms
+        mod.sleep = sleep
+        return mod
+
+
+def run_sync(coro):
+    """Korutin futtatása, ami nem függeszt fel (a szimulált sleep_ms szinkron)"""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("a korutin felfüggesztett")
+
+
+class SimSX127x:
+    """
+    SX127x LoRa modem emuláció (a LoRaRadio által használt rész)
+
+    SPI: CS lefutó éle után az első bájt a cím (bit7: írás), utána
+    burst; a 0x00 (FIFO) címen a FifoAddrPtr lép. Módváltás a RegOpMode
+    írásával: TX indítja az adást, az adás végén TxDone és standby.
+    """
+
+    MODE_STDBY = 1
+    MODE_TX = 3
+    MODE_RX_CONTINUOUS = 5
+
+    def __init__(self, channel, name, cs_pin):
+        self.channel = channel
+        self.name = name
+        self.cs_pin = cs_pin
+        self.regs = bytearray(128)
+        self.regs[0x42] = 0x12  # RegVersion
+        self.fifo = bytearray(256)
+        self.fifo_ptr = 0
+        self.mode = 0
+        self.rx_since = None
+        self.tx = None  # Folyó adás: (kezdet, vég, hasznos teher)
+        self.overruns = 0
+        self._address = None
+        self._write = False
+
+    # --- SPI ---
+    def select(self, value):
+        if not value:
+            self._address = None
+
+    def spi_write(self, data):
+        for b in data:
+            if self._address is None:
+                self._address = b & 0x7F
+                self._write = bool(b & 0x80)
+            elif self._write:
+                self._reg_write(self._address, b)
+                if self._address:
+                    self._address += 1
+
+    def spi_read(self, n):
+        out = bytearray(n)
+        for i in range(n):
+            out[i] = self._reg_read(self._address)
+            if self._address:
+                self._address += 1
+        return bytes(out)
+
+    def _reg_write(self, address, value):
+        if address == 0x00:
+            self.fifo[self.fifo_ptr] = value
+            self.fifo_ptr = (self.fifo_ptr + 1) & 0xFF
+        elif address == 0x0D:
+            self.fifo_ptr = value
+        elif address == 0x12:
+            self.regs[0x12] &= ~value & 0xFF  # 1 írása törli a flaget
+        elif address == 0x01:
+            self.regs[0x01] = value
+            self._set_mode(value & 0x07)
+        else:
+            self.regs[address] = value
+
+    def _reg_read(self, address):
+        if address == 0x00:
+            value = self.fifo[self.fifo_ptr]
+            self.fifo_ptr = (self.fifo_ptr + 1) & 0xFF
+            return value
+        if address == 0x0D:
+            return self.fifo_ptr
+        return self.regs[address]
+
+    # --- Modem ---
+    @property
+    def modem(self):
+        """Frekvencia és modem regiszterek (az egyezés feltétele a vételhez)"""
+        return bytes(self.regs[a] for a in (0x06, 0x07, 0x08, 0x1D, 0x1E))
+
+    @property
+    def spreading_factor(self):
+        return self.regs[0x1E] >> 4
+
+    @property
+    def bandwidth(self):
+        return {7: 125000, 8: 250000, 9: 500000}.get(self.regs[0x1D] >> 4, 125000)
+
+    @property
+    def coding_rate(self):
+        return ((self.regs[0x1D] >> 1) & 0x07) + 4
+
+    @property
+    def tx_power(self):
+        return (self.regs[0x09] & 0x0F) + 2
+
+    def _set_mode(self, mode):
+        if self.mode == self.MODE_TX and mode != self.MODE_TX and self.tx:
+            # Adás közben más mód: az adás megszakad
+            self.channel.abort(self)
+        if mode == self.MODE_RX_CONTINUOUS:
+            if self.mode != mode:
+                self.rx_since = self.channel.clock.now
+        else:
+            self.rx_since = None
+        self.mode = mode
+        if mode == self.MODE_TX:
+            length = self.regs[0x22]
+            base = self.regs[0x0E]
+            payload = bytes(self.fifo[(base + i) & 0xFF] for i in range(length))
+            self.channel.transmit(self, payload)
+
+    def tx_done(self):
+        """Az adás vége (csatorna hívja)"""
+        self.tx = None
+        self.regs[0x12] |= 0x08
+        self.mode = self.MODE_STDBY
+        self.regs[0x01] = (self.regs[0x01] & 0xF8) | self.MODE_STDBY
+
+    def deliver(self, payload, rssi, snr, crc_error):
+        """Vett csomag a FIFO-ba (RX base címtől), IRQ és RSSI / SNR regiszterek"""
+        if self.regs[0x12] & 0x40:
+            self.overruns += 1
+        base = self.regs[0x0F]
+        for i, b in enumerate(payload):
+            self.fifo[(base + i) & 0xFF] = b
+        self.regs[0x10] = base
+        self.regs[0x13] = len(payload)
+        self.regs[0x1A] = max(0, min(255, int(round(rssi + 157))))
+        self.regs[0x19] = int(round(snr * 4)) & 0xFF
+        self.regs[0x12] |= 0x40 | (0x20 if crc_error else 0)
+
+
+def machine_module():
+    """machine.Pin / machine.SPI a csatolt emulált modemhez"""
+    mod = types.ModuleType('machine')
+    attach = {'chip': None}
+
+    class Pin:
+        OUT = 1
+        IN = 0
+
+        def __init__(self, pin, mode=None):
+            self.pin = pin
+            self.chip = attach['chip']
+            self._value = 1
+
+        def value(self, v=None):
+            if v is None:
+                return self._value
+            self._value = v
+            if self.chip and self.pin == self.chip.cs_pin:
+                self.chip.select(v)
+
+    class SPI:
+        def __init__(self, *args, **kwargs):
+            self.chip = attach['chip']
+
+        def write(self, data):
+            self.chip.spi_write(data)
+
+        def read(self, n):
+            return self.chip.spi_read(n)
+
+    mod.Pin = Pin
+    mod.SPI = SPI
+    mod.attach = attach
+    return mod
+
+
+@contextlib.contextmanager
+def sim_hardware(clock):
+    """
+    A valódi meghajtó és vevő kód az emulált hardverre és a virtuális órára
+
+    A blokkon belül a `machine` az emulált modul, a SIM_MODULES frissen
+    ezzel importálódik, az órájuk a virtuális óra. Kilépéskor a
+    sys.modules korábbi bejegyzései visszaállnak, így sem az emulált
+    `machine`, sem a szimulációhoz kötött modulok nem szivárognak ki.
+
+    Yields:
+        SimpleNamespace: machine, lora_radio, ground_station
+    """
+    saved = {name: sys.modules.pop(name, None) for name in ('machine',) + SIM_MODULES}
+    machine = sys.modules['machine'] = machine_module()
+    try:
+        lora_radio = importlib.import_module('lora_radio')
+        ground_station = importlib.import_module('ground_station')
+        lora_radio.time = ground_station.time = clock.time_module()
+        lora_radio.asyncio = clock.asyncio_module()
+        yield types.SimpleNamespace(machine=machine, lora_radio=lora_radio,
+                                    ground_station=ground_station)
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+def path_loss_db(distance_m, frequency_mhz, exponent):
+    """Log-távolság útcsillapítás, 1 m-en szabadtéri"""
+    d = max(distance_m, 1.0)
+    pl_1m = 20 * math.log10(4 * math.pi * frequency_mhz * 1e6 / 299792458.0)
+    return pl_1m + 10 * exponent * math.log10(d)
+
+
+def packet_error_rate(snr, spreading_factor, length, slope=config.SIM_SNR_SLOPE_DB):
+    """
+    Csomaghiba valószínűség (CRC hiba) az SNR-ből
+
+    Args:
+        snr: Vett SNR (dB)
+        length: Hasznos teher bájtban
+    """
+    x = (snr - SNR_THRESHOLD[spreading_factor]) / slope
+    if x > 40:
+        return 0.0
+    p = 1 / (1 + math.exp(x))
+    return 1 - (1 - p) ** length
+
+
+class SimChannel:
+    """Közös rádiócsatorna: adások ütemezése, vétel a modell szerint"""
+
+    def __init__(self, clock, distance_m, airtime, seed=1, exponent=config.SIM_PATH_LOSS_EXP,
+                 shadowing_db=config.SIM_SHADOWING_DB):
+        """
+        Args:
+            airtime: Adásidő függvény (lora_radio.airtime_ms)
+        """
+        self.clock = clock
+        self.airtime = airtime
+        self.distance_m = distance_m
+        self.exponent = exponent
+        self.shadowing_db = shadowing_db
+        self.random = random.Random(seed)
+        self.chips = []
+        self.airtime_ms = 0.0
+        self.stats = {'missed': 0, 'crc': 0, 'aborted': 0, 'rssi': [], 'snr': []}
+
+    def add(self, name, cs_pin=config.LORA_CS):
+        chip = SimSX127x(self, name, cs_pin)
+        self.chips.append(chip)
+        return chip
+
+    def transmit(self, chip, payload):
+        airtime = self.airtime(len(payload), chip.spreading_factor, chip.bandwidth,
+                               chip.coding_rate)
+        start = self.clock.now
+        chip.tx = (start, start + airtime, payload)
+        tx = chip.tx
+        self.clock.at(start + airtime, lambda: self._end(chip, tx))
+
+    def abort(self, chip):
+        self.stats['aborted'] += 1
+        self.airtime_ms += self.clock.now - chip.tx[0]
+        chip.tx = None
+
+    def _end(self, chip, tx):
+        if chip.tx is not tx:
+            return  # Megszakított adás
+        start, end, payload = tx
+        self.airtime_ms += end - start
+        chip.tx_done()
+        preamble_ms = 8 * (1 << chip.spreading_factor) * 1000 / chip.bandwidth
+        for rx in self.chips:
+            if (rx is chip or rx.mode != rx.MODE_RX_CONTINUOUS or rx.rx_since is None
+                    or rx.rx_since > start + preamble_ms / 2 or rx.modem != chip.modem):
+                continue
+            self._receive(chip, rx, payload)
+
+    def _receive(self, tx, rx, payload):
+        frequency = config.LORA_FREQUENCY
+        rssi = (tx.tx_power + config.SIM_ANTENNA_GAIN_DB
+                - path_loss_db(self.distance_m, frequency, self.exponent)
+                + self.random.gauss(0, self.shadowing_db))
+        noise = -174 + 10 * math.log10(rx.bandwidth) + config.SIM_NOISE_FIGURE_DB
+        snr = rssi - noise
+        sf = rx.spreading_factor
+        if snr < SNR_THRESHOLD[sf] - config.SIM_DETECT_MARGIN_DB:
+            self.stats['missed'] += 1
+            return
+
+        crc_error = self.random.random() < packet_error_rate(snr, sf, len(payload))
+        if crc_error:
+            self.stats['crc'] += 1
+            corrupted = bytearray(payload)
+            corrupted[self.random.randrange(len(payload))] ^= 1 << self.random.randrange(8)
+            payload = bytes(corrupted)
+        self.stats['rssi'].append(rssi)
+        self.stats['snr'].append(snr)
+        rx.deliver(payload, rssi, snr, crc_error)
+
+
+def make_packet(lora_radio, fmt, index, chunk_size=config.DL_CHUNK_SIZE):
+    """
+    Mérő csomag (a fedélzeti formátumokkal)
+
+    Args:
+        lora_radio: A meghajtó modul (sim_hardware)
+        fmt: FORMATS
+        index: Csomag index
+
+    Returns:
+        str: A csomag; az i. csomag telemetriánál az i+1 sorszám, letöltésnél
+             az i. darab
+    """
+    if fmt == 'dl':
+        size = 1000000 * chunk_size
+        data = (f"{index * 0.1:.2f},21.50,1008.12,152.4,0.0123,1,152.38,12.40,480.2\n"
+                * (chunk_size // 50 + 1))[:chunk_size]
+        return f"{config.MISSION_ID},DL,{index},{size},{data}"
+    velocity = apogee = None
+    if fmt == 'kf':
+        velocity, apogee = 12.4 + index % 7, 480.2
+    return lora_radio.LoRaRadio.format_telemetry(
+        (config.MISSION_ID, index + 1), 21.5 - index % 50 / 100, 1008.12 - index % 300 / 100,
+        152.4 + index % 1000 / 10, 0.0123, 1, velocity, apogee)
+
+
+def simulate(profile, fmt, distance_m, packets, interval_ms, enforce_duty=False, seed=1):
+    """
+    Egy mérés: `packets` csomag küldése a CanSat rádión, vétel a GroundStation-nel
+
+    Returns:
+        dict: Mérési eredmények
+    """
+    clock = SimClock()
+    with sim_hardware(clock) as hw:
+        machine, lora_radio, ground_station = hw.machine, hw.lora_radio, hw.ground_station
+        channel = SimChannel(clock, distance_m, lora_radio.airtime_ms, seed)
+        params = config.LORA_PROFILES[profile]
+
+        machine.attach['chip'] = channel.add('cansat')
+        lora = lora_radio.LoRaRadio(config.LORA_SCK, config.LORA_MOSI, config.LORA_MISO,
+                                    config.LORA_CS, config.LORA_RST, config.LORA_DIO0)
+        lora.init(frequency=config.LORA_FREQUENCY, **params)
+        lora.budget = lora_radio.AirtimeBudget(config.DL_DUTY_CYCLE, config.DL_DUTY_WINDOW_MS)
+
+        machine.attach['chip'] = channel.add('ground')
+        station = ground_station.GroundStation()
+        station.set_profile(profile)
+        machine.attach['chip'] = None
+
+        tmp = tempfile.TemporaryDirectory()
+        sent_at = {}
+        received = {}
+
+        if fmt == 'dl':
+            station.downlink = DownlinkReceiver(os.path.join(tmp.name, "downlink.csv"),
+                                                os.path.join(tmp.name, "downlink.bin"))
+            handle = station.handle_downlink
+
+            def handle_downlink(message):
+                handle(message)
+                index = int(message.split(',', 3)[2])
+                received.setdefault(index, clock.now)
+
+            station.handle_downlink = handle_downlink
+
+        # Vevő főciklus: lekérdezés SIM_GROUND_POLL_MS-onként (ground_station.main)
+        def poll():
+            data = station.receive()
+            if data:
+                received.setdefault(data['sequence'] - 1, clock.now)
+            else:
+                station.check_link()
+            clock.at(clock.now + config.SIM_GROUND_POLL_MS, poll)
+
+        clock.at(0, poll)
+
+        failed = deferred = 0
+        payload_bytes = 0
+        next_send = 0.0
+        for i in range(packets):
+            clock.run_until(next_send)
+            message = make_packet(lora_radio, fmt, i)
+            length = len(message)
+            if enforce_duty:
+                wait = lora.budget.wait_ms(lora.airtime_ms(length))
+                if wait:
+                    deferred += 1
+                    clock.sleep_ms(wait)
+            sent_at[i] = clock.now
+            payload_bytes += length
+            if not run_sync(lora.send_async(message)):
+                failed += 1
+            next_send = max(next_send + interval_ms, clock.now)
+
+        # A még úton lévő csomagok
+        clock.sleep_ms(max(interval_ms, 2 * lora.airtime_ms(255)))
+        duration = clock.now
+        tmp.cleanup()
+
+        delivered = [i for i in received if i in sent_at]
+        latency = sorted(received[i] - sent_at[i] for i in delivered)
+        stats = channel.stats
+        good_bytes = sum(len(make_packet(lora_radio, fmt, i)) for i in delivered)
+        return {
+            'profile': profile,
+            'sf': params['spreading_factor'],
+            'bw_khz': params['bandwidth'] // 1000,
+            'format': fmt,
+            'bytes': len(make_packet(lora_radio, fmt, 0)),
+            'airtime_ms': lora.airtime_ms(len(make_packet(lora_radio, fmt, 0))),
+            'distance_m': distance_m,
+            'sent': packets,
+            'delivered': len(delivered),
+            'loss_pct': 100 * (packets - len(delivered)) / packets,
+            'missed': stats['missed'],
+            'crc': stats['crc'],
+            'tx_fail': failed,
+            'aborted': stats['aborted'],
+            'overruns': channel.chips[1].overruns,
+            'rssi': sum(stats['rssi']) / len(stats['rssi']) if stats['rssi'] else math.nan,
+            'snr': sum(stats['snr']) / len(stats['snr']) if stats['snr'] else math.nan,
+            'latency_ms': sum(latency) / len(latency) if latency else math.nan,
+            'latency_p95_ms': latency[int(0.95 * (len(latency) - 1))] if latency else math.nan,
+            'goodput_bps': 8000 * good_bytes / duration if duration else 0.0,
+            'offered_bps': 8000 * payload_bytes / duration if duration else 0.0,
+            'duty_pct': 100 * channel.airtime_ms / duration if duration else 0.0,
+            'deferred': deferred,
+        }
+
+
+COLUMNS = (
+    ('profile', '{:<8}'), ('sf', '{:>3}'), ('bw_khz', '{:>4}'), ('format', '{:<6}'),
+    ('bytes', '{:>5}'), ('airtime_ms', '{:>8.1f}'), ('distance_m', '{:>7.0f}'),
+    ('loss_pct', '{:>6.1f}'), ('missed', '{:>6}'), ('crc', '{:>4}'), ('tx_fail', '{:>5}'),
+    ('rssi', '{:>7.1f}'), ('snr', '{:>6.1f}'), ('latency_ms', '{:>8.1f}'),
+    ('latency_p95_ms', '{:>8.1f}'), ('goodput_bps', '{:>9.0f}'), ('duty_pct', '{:>6.2f}'),
+    ('deferred', '{:>5}'),
+)
+HEADERS = ('profile', 'SF', 'BW', 'format', 'bytes', 'air ms', 'dist m', 'loss%',
+           'missed', 'crc', 'fail', 'RSSI', 'SNR', 'lat ms', 'p95 ms', 'goodput', 'duty%',
+           'defer')
+
+
+def format_row(result):
+    return " ".join(fmt.format(result[key]) for key, fmt in COLUMNS)
+
+
+def header_row():
+    widths = [len(fmt.format(0)) for _, fmt in COLUMNS]
+    return " ".join(h.rjust(w) if '>' in fmt else h.ljust(w)
+                    for h, w, (_, fmt) in zip(HEADERS, widths, COLUMNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LoRa kapcsolat szimulátor")
+    parser.add_argument("--profile", nargs="+", choices=list(config.LORA_PROFILES),
+                        default=list(config.LORA_PROFILES))
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=['basic', 'kf'])
+    parser.add_argument("--distance", nargs="+", type=float, default=config.SIM_DISTANCES_M,
+                        help="Távolság (m)")
+    parser.add_argument("--packets", type=int, default=config.SIM_PACKETS)
+    parser.add_argument("--interval", type=float, default=config.TELEMETRY_INTERVAL * 1000,
+                        help="Küldési periódus (ms)")
+    parser.add_argument("--enforce-duty", action="store_true",
+                        help="A küldő kivárja a duty cycle keretet")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--csv", help="Eredmények CSV-be")
+    args = parser.parse_args()
+
+    results = []
+    print(header_row())
+    for profile in args.profile:
+        for fmt in args.format:
+            for distance in args.distance:
+                result = simulate(profile, fmt, distance, args.packets, args.interval,
+                                  args.enforce_duty, args.seed)
+                results.append(result)
+                print(format_row(result), flush=True)
+
+    if args.csv:
+        keys = list(results[0]) if results else []
+        with open(args.csv, "w") as f:
+            f.write(",".join(keys) + "\n")
+            for result in results:
+                f.write(",".join(str(result[k]) for k in keys) + "\n")
+        print(f"Mentve: {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
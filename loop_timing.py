@@ -0,0 +1,176 @@
+"""
+Határidő alapú, drift-mentes periodikus ütemezés uasyncio taskokhoz
+
+A következő határidő mindig az előzőből számolódik (ticks_add), nem a munka
+végéből, így a feldolgozási idő nem csúsztatja el a mintavételt. Minden
+ciklusról jitter (késés a határidőhöz képest) és slack (hátralévő idő a
+munka végén) hisztogram készül.
+"""
+
+import time
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+# Hisztogram vödörhatárok milliszekundumban (a vödör: érték < határ)
+JITTER_BOUNDS_MS = (1, 2, 5, 10, 20, 50)
+SLACK_BOUNDS_MS = (0, 5, 10, 25, 50, 100, 250, 500)
+
+
+class Histogram:
+    """
+    Fix vödrös hisztogram minimum/maximum követéssel
+
+    Az i. vödör a bounds[i]-nél kisebb (és az előző határnál nem kisebb)
+    értékeket számolja, az utolsó vödör a bounds[-1]-nél nem kisebbeket.
+    """
+
+    def __init__(self, bounds):
+        """
+        Args:
+            bounds: Növekvő vödörhatárok
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        """Érték hozzáadása"""
+        i = 0
+        n = len(self.bounds)
+        while i < n and value >= self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def reset(self):
+        """Számlálók nullázása"""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def summary(self):
+        """
+        Kompakt szöveges összegzés
+
+        Formátum: "min/max:c0/c1/.../cN"
+        """
+        counts = "/".join(str(c) for c in self.counts)
+        return f"{self.min}/{self.max}:{counts}"
+
+
+class FixedRateTimer:
+    """
+    Drift-mentes periodikus időzítő
+
+    Használat egy task ciklusában:
+
+        timer = FixedRateTimer(100)
+        while True:
+            await timer.wait()
+            ...munka...
+    """
+
+    def __init__(self, period_ms, name=""):
+        """
+        Args:
+            period_ms: Periódusidő milliszekundumban
+            name: Név a riportokhoz
+        """
+        self.period_ms = period_ms
+        self.name = name
+        self.deadline = None
+        self._last = None    # Az utolsó ciklus határideje
+        self.cycles = 0
+        self.overruns = 0
+        self.missed = 0
+        self.jitter = Histogram(JITTER_BOUNDS_MS)
+        self.slack = Histogram(SLACK_BOUNDS_MS)
+        # Opcionális tétlen idejű feladat (pl. GC), a várakozás elején fut
+        self.idle_hook = None
+
+    def set_period(self, period_ms):
+        """
+        Periódusidő módosítása
+
+        Gyorsításkor a már ütemezett határidő is előrébb kerül (az utolsó
+        ciklus + új periódus), így pl. startálláson a lassú ütemről
+        emelkedésre váltva nem kell kivárni egy teljes régi periódust;
+        lassításkor az ütemezett határidő marad.
+        """
+        self.period_ms = period_ms
+        if self.deadline is not None and self._last is not None:
+            sooner = time.ticks_add(self._last, period_ms)
+            if time.ticks_diff(sooner, self.deadline) < 0:
+                self.deadline = sooner
+
+    def restart(self):
+        """Ütemezés újraindítása: az első wait() azonnal visszatér"""
+        self.deadline = None
+        self._last = None
+
+    async def wait(self):
+        """
+        Várakozás a következő határidőig
+
+        Túlfutás esetén (a munka tovább tartott, mint a periódus) nem vár,
+        a késő ciklus azonnal indul; ha a késés egy teljes periódusnál
+        nagyobb, a kimaradt határidőket átugorja, hogy a fázis megmaradjon.
+
+        Returns:
+            int: Az aktuális ciklus határideje (ticks_ms)
+        """
+        now = time.ticks_ms()
+
+        if self.deadline is None:
+            self.deadline = now
+        else:
+            slack = time.ticks_diff(self.deadline, now)
+            self.slack.add(slack)
+
+            if slack > 0 and self.idle_hook:
+                self.idle_hook()
+                # A hook tovább is tarthat: a túlfutás vizsgálat friss időből
+                now = time.ticks_ms()
+                slack = time.ticks_diff(self.deadline, now)
+
+            if slack > 0:
+                await asyncio.sleep_ms(slack)
+            elif slack < 0:
+                self.overruns += 1
+                while time.ticks_diff(now, self.deadline) >= self.period_ms:
+                    self.deadline = time.ticks_add(self.deadline, self.period_ms)
+                    self.missed += 1
+
+        self.jitter.add(time.ticks_diff(time.ticks_ms(), self.deadline))
+        self.cycles += 1
+
+        current = self._last = self.deadline
+        self.deadline = time.ticks_add(self.deadline, self.period_ms)
+        return current
+
+    def report(self):
+        """
+        Időzítési összegzés egy sorban
+
+        Formátum: "név,periódus,ciklusok,túlfutások,kimaradt,jitter,slack"
+        """
+        return (f"{self.name},{self.period_ms},{self.cycles},{self.overruns},{self.missed},"
+                f"{self.jitter.summary()},{self.slack.summary()}")
+
+    def reset_stats(self):
+        """Statisztikák nullázása (a határidő megmarad)"""
+        self.cycles = 0
+        self.overruns = 0
+        self.missed = 0
+        self.jitter.reset()
+        self.slack.reset()
@@ -1,5 +1,75 @@
 from machine import SPI, Pin
 import time
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+
+def airtime_ms(length, spreading_factor, bandwidth, coding_rate):
+    """
+    Adásidő adott modem beállításokkal (SX1276 adatlap 4.1.1.7)
+
+    Explicit fejléc, CRC, 8 szimbólum preamble. Rádió példány nélkül is
+    hívható (pl. profilok összevetése, szimulátor).
+
+    Args:
+        length: Hasznos teher bájtban
+        spreading_factor: 7-12
+        bandwidth: Sávszélesség Hz-ben
+        coding_rate: 5-8 (4/5 - 4/8)
+
+    Returns:
+        float: Adásidő ms-ban
+    """
+    sf = spreading_factor
+    symbol_ms = (1 << sf) * 1000 / bandwidth
+    de = 2 if symbol_ms > 16 else 0
+    bits = 8 * length - 4 * sf + 28 + 16
+    payload = 8 + max(-(-bits // (4 * (sf - de))) * coding_rate, 0)
+    return (8 + 4.25 + payload) * symbol_ms
+
+
+class AirtimeBudget:
+    """
+    Duty cycle korlát adásidő kerettel (token bucket)
+
+    A keret duty_cycle ütemben töltődik, legfeljebb window_ms * duty_cycle
+    ms adásidőig. Minden adás levonja a saját adásidejét; a keret
+    negatívba is mehet (a telemetria nem vár), az erre figyelő küldő
+    (pl. a tömeges letöltés) csak a maradékot használja.
+    """
+
+    def __init__(self, duty_cycle, window_ms):
+        """
+        Args:
+            duty_cycle: Megengedett adási arány (pl. 0.01 = 1%)
+            window_ms: Az az időablak, amire a keret felhalmozódhat
+        """
+        self.duty_cycle = duty_cycle
+        self.capacity = duty_cycle * window_ms
+        self.tokens = self.capacity
+        self.last = time.ticks_ms()
+
+    def _refill(self):
+        now = time.ticks_ms()
+        self.tokens = min(self.capacity,
+                          self.tokens + time.ticks_diff(now, self.last) * self.duty_cycle)
+        self.last = now
+
+    def consume(self, airtime_ms):
+        """Adásidő levonása"""
+        self._refill()
+        self.tokens -= airtime_ms
+
+    def wait_ms(self, airtime_ms):
+        """Ennyi ms múlva fér bele a keretbe egy airtime_ms hosszú adás"""
+        self._refill()
+        missing = airtime_ms - self.tokens
+        if missing <= 0:
+            return 0
+        return int(missing / self.duty_cycle) + 1
+
 
 class LoRaRadio:
     """
@@ -18,6 +88,7 @@ class LoRaRadio:
     REG_FIFO_ADDR_PTR = 0x0D
     REG_FIFO_TX_BASE_ADDR = 0x0E
     REG_FIFO_RX_BASE_ADDR = 0x0F
+    REG_FIFO_RX_CURRENT_ADDR = 0x10
     REG_IRQ_FLAGS = 0x12
     REG_RX_NB_BYTES = 0x13
     REG_MODEM_CONFIG_1 = 0x1D
@@ -52,13 +123,14 @@ class LoRaRadio:
                        miso=Pin(miso_pin))
 
         self.initialized = False
+        self.budget = None  # AirtimeBudget (opcionális duty cycle számlálás)
 
     def reset(self):
-        """LoRa modul reset"""
+        """LoRa modul reset (SX127x adatlap: >100 µs impulzus, 5 ms várakozás)"""
         self.rst.value(0)
-        time.sleep_ms(10)
+        time.sleep_us(200)
         self.rst.value(1)
-        time.sleep_ms(10)
+        time.sleep_ms(5)
 
     def _write_register(self, address, value):
         """Regiszter írás"""
@@ -96,9 +168,8 @@ class LoRaRadio:
         if version != 0x12:
             return False
 
-        # Sleep mód
+        # Sleep mód (a LoRa mód bit csak itt állítható; a váltás azonnali)
         self._set_mode(self.MODE_SLEEP)
-        time.sleep_ms(10)
 
         # Frekvencia beállítása
         frf = int((frequency * 1000000.0) / 32000000.0 * 524288.0)
@@ -106,6 +177,24 @@ class LoRaRadio:
         self._write_register(self.REG_FRF_MID, (frf >> 8) & 0xFF)
         self._write_register(self.REG_FRF_LSB, frf & 0xFF)
 
+        self._write_modem_config(spreading_factor, bandwidth, coding_rate, tx_power)
+
+        # Preamble
+        self._write_register(self.REG_PREAMBLE_MSB, 0x00)
+        self._write_register(self.REG_PREAMBLE_LSB, 0x08)
+
+        # FIFO
+        self._write_register(self.REG_FIFO_TX_BASE_ADDR, 0x00)
+        self._write_register(self.REG_FIFO_RX_BASE_ADDR, 0x00)
+
+        # Standby mód
+        self._set_mode(self.MODE_STDBY)
+
+        self.initialized = True
+        return True
+
+    def _write_modem_config(self, spreading_factor, bandwidth, coding_rate, tx_power):
+        """Modem regiszterek írása (SF, BW, CR, adóteljesítmény)"""
         # Adóteljesítmény
         if tx_power > 17:
             tx_power = 17
@@ -124,30 +213,47 @@ class LoRaRadio:
         # Spreading Factor
         self._write_register(self.REG_MODEM_CONFIG_2, (spreading_factor << 4) | 0x04)
 
-        # Preamble
-        self._write_register(self.REG_PREAMBLE_MSB, 0x00)
-        self._write_register(self.REG_PREAMBLE_LSB, 0x08)
+        # Low Data Rate Optimize: kötelező, ha a szimbólumidő > 16 ms
+        symbol_us = (1 << spreading_factor) * 1000000 // bandwidth
+        self._write_register(self.REG_MODEM_CONFIG_3, 0x08 if symbol_us > 16000 else 0x00)
 
-        # FIFO
-        self._write_register(self.REG_FIFO_TX_BASE_ADDR, 0x00)
-        self._write_register(self.REG_FIFO_RX_BASE_ADDR, 0x00)
+        self.spreading_factor = spreading_factor
+        self.bandwidth = bandwidth
+        self.coding_rate = coding_rate
+        self.tx_power = tx_power
 
-        # Standby mód
-        self._set_mode(self.MODE_STDBY)
+    def airtime_ms(self, length):
+        """
+        Adásidő az aktuális modem beállításokkal (lásd airtime_ms())
 
-        self.initialized = True
-        return True
+        Args:
+            length: Hasznos teher bájtban
 
-    def send(self, data):
+        Returns:
+            float: Adásidő ms-ban
         """
-        Adat küldése
+        return airtime_ms(length, self.spreading_factor, self.bandwidth, self.coding_rate)
 
-        Args:
-            data: bytes vagy string
+    def set_profile(self, spreading_factor, bandwidth, coding_rate, tx_power):
+        """
+        Rádió profil váltása futás közben (újrainicializálás nélkül)
+
+        Adás közben nem hívható; a hívó task felel a sorrendért.
         """
         if not self.initialized:
             return False
 
+        self._set_mode(self.MODE_STDBY)
+        self._write_modem_config(spreading_factor, bandwidth, coding_rate, tx_power)
+        return True
+
+    def _start_tx(self, data):
+        """
+        Adás indítása (FIFO feltöltés, TX mód) várakozás nélkül
+
+        Args:
+            data: bytes vagy string
+        """
         if isinstance(data, str):
             data = data.encode()
 
@@ -166,32 +272,152 @@ class LoRaRadio:
         # Csomag hossz
         self._write_register(self.REG_PAYLOAD_LENGTH, len(data))
 
+        if self.budget:
+            self.budget.consume(self.airtime_ms(len(data)))
+
         # TX mód
         self._set_mode(self.MODE_TX)
 
-        # Várakozás átvitelre (IRQ flag)
-        timeout = 100
+    def _tx_done(self):
+        """TxDone IRQ flag ellenőrzése"""
+        return self._read_register(self.REG_IRQ_FLAGS) & 0x08
+
+    def _finish_tx(self):
+        """Adás lezárása: IRQ flag törlése, vissza standby módba"""
+        self._write_register(self.REG_IRQ_FLAGS, 0xFF)
+        self._set_mode(self.MODE_STDBY)
+
+    def send(self, data):
+        """
+        Adat küldése (blokkol az adás végéig)
+
+        Args:
+            data: bytes vagy string
+        """
+        if not self.initialized:
+            return False
+
+        self._start_tx(data)
+
+        # Várakozás átvitelre (IRQ flag); lassú profilon a hosszú csomag
+        # adásideje 1 s fölött is lehet
+        timeout = max(100, int(self.airtime_ms(len(data))) // 10 + 10)
         while timeout > 0:
-            irq_flags = self._read_register(self.REG_IRQ_FLAGS)
-            if irq_flags & 0x08:  # TxDone
+            if self._tx_done():
                 break
             time.sleep_ms(10)
             timeout -= 1
 
-        # IRQ flag törlése
+        self._finish_tx()
+
+        return timeout > 0
+
+    async def send_async(self, data, poll_ms=5, timeout_ms=1000):
+        """
+        Adat küldése uasyncio alatt: az adás ideje alatt a többi task fut
+
+        Args:
+            data: bytes vagy string
+            poll_ms: TxDone lekérdezési periódus milliszekundumban
+            timeout_ms: Maximális várakozás az adás végére (legalább az
+                        adásidő + 100 ms)
+
+        Returns:
+            bool: Sikeres-e a küldés
+        """
+        if not self.initialized:
+            return False
+
+        self._start_tx(data)
+        timeout_ms = max(timeout_ms, int(self.airtime_ms(len(data))) + 100)
+
+        start = time.ticks_ms()
+        done = False
+        while time.ticks_diff(time.ticks_ms(), start) < timeout_ms:
+            if self._tx_done():
+                done = True
+                break
+            await asyncio.sleep_ms(poll_ms)
+
+        self._finish_tx()
+
+        return done
+
+    def _read_packet(self):
+        """Fogadott csomag kiolvasása a FIFO-ból (RxDone után)"""
+        length = self._read_register(self.REG_RX_NB_BYTES)
+        self._write_register(self.REG_FIFO_ADDR_PTR,
+                             self._read_register(self.REG_FIFO_RX_CURRENT_ADDR))
+        self.cs.value(0)
+        self.spi.write(bytes([self.REG_FIFO & 0x7F]))
+        data = self.spi.read(length)
+        self.cs.value(1)
+        return data
+
+    async def receive_async(self, timeout_ms, poll_ms=5):
+        """
+        Rövid vételi ablak (pl. adás után a földi válaszra)
+
+        Az ablak legfeljebb timeout_ms hosszú, utána a modul standby
+        módba kerül; közben a többi task fut.
+
+        Returns:
+            bytes: A fogadott csomag, vagy None (nem jött / CRC hiba)
+        """
+        if not self.initialized:
+            return None
+
+        self._set_mode(self.MODE_STDBY)
+        self._write_register(self.REG_FIFO_ADDR_PTR, 0x00)
         self._write_register(self.REG_IRQ_FLAGS, 0xFF)
+        self._set_mode(self.MODE_RX_CONTINUOUS)
+
+        data = None
+        start = time.ticks_ms()
+        while time.ticks_diff(time.ticks_ms(), start) < timeout_ms:
+            flags = self._read_register(self.REG_IRQ_FLAGS)
+            if flags & 0x40:  # RxDone
+                if not flags & 0x20:  # PayloadCrcError
+                    data = self._read_packet()
+                break
+            await asyncio.sleep_ms(poll_ms)
 
-        # Standby mód
+        self._write_register(self.REG_IRQ_FLAGS, 0xFF)
         self._set_mode(self.MODE_STDBY)
+        return data
 
-        return timeout > 0
+    @staticmethod
+    def format_telemetry(packet_id, temp, pressure, altitude, audio_rms, phase=0,
+                         velocity=None, apogee=None):
+        """
+        Telemetria csomag összeállítása kompakt formátumban
 
-    def send_telemetry(self, packet_id, temp, pressure, altitude, audio_rms):
+        Formátum: "ID,seq,temp,pres,alt,audio,phase[,vel,apogee]"
+        Példa: "CANSAT01,123,25.34,1013.25,150.2,0.1234,1,42.7,410.3"
+
+        Args:
+            velocity: Becsült függőleges sebesség (m/s), opcionális
+            apogee: Előrejelzett csúcsmagasság (m), a sebességgel együtt
+        """
+        message = f"{packet_id[0]},{packet_id[1]},{temp:.2f},{pressure:.2f},{altitude:.1f},{audio_rms:.4f},{phase}"
+        if velocity is not None:
+            message += f",{velocity:.1f},{apogee:.1f}"
+        return message
+
+    @staticmethod
+    def format_phase_announce(mission_id, phase, profile):
         """
-        Telemetria csomag küldése kompakt formátumban
+        Fázis / rádió profil váltás bejelentése
 
-        Formátum: "ID,seq,temp,pres,alt,audio"
-        Példa: "CANSAT01,123,25.34,1013.25,150.2,0.1234"
+        Formátum: "ID,PH,phase,profil"
+        Példa: "CANSAT01,PH,1,fast"
         """
-        message = f"{packet_id[0]},{packet_id[1]},{temp:.2f},{pressure:.2f},{altitude:.1f},{audio_rms:.4f}"
-        return self.send(message)
+        return f"{mission_id},PH,{phase},{profile}"
+
+    def send_telemetry(self, packet_id, temp, pressure, altitude, audio_rms, phase=0):
+        """Telemetria csomag küldése (blokkoló)"""
+        return self.send(self.format_telemetry(packet_id, temp, pressure, altitude, audio_rms, phase))
+
+    async def send_telemetry_async(self, packet_id, temp, pressure, altitude, audio_rms, phase=0):
+        """Telemetria csomag küldése (uasyncio)"""
+        return await self.send_async(self.format_telemetry(packet_id, temp, pressure, altitude, audio_rms, phase))
@@ -1,6 +1,7 @@
 from machine import I2C, Pin
 import time
 import bmp280
+import altitude
 from microphone_i2s import I2S_Microphone
 
 # ===== KONFIGURÁCIÓ =====
@@ -90,12 +91,11 @@ try:
                 pres, temp = sensor.read()
 
                 # Magasság becslés tengerszint alapján (1013.25 hPa referencia)
-                # h = 44330 * (1 - (P/P0)^0.1903)
-                altitude = 44330 * (1 - (pres / 1013.25) ** 0.1903)
+                alt = altitude.isa(pres, 1013.25)
 
                 print(f"🌡️  Hőmérséklet: {temp:.2f} °C")
                 print(f"📊 Légnyomás:   {pres:.2f} hPa")
-                print(f"⛰️  Magasság:    {altitude:.1f} m (becsült)")
+                print(f"⛰️  Magasság:    {alt:.1f} m (becsült)")
 
             except OSError as e:
                 print(f"❌ Szenzor olvasási hiba: {e}")
@@ -1,4 +1,5 @@
 from machine import I2S, Pin
+import micropython
 
 class I2S_Microphone:
     """
@@ -20,6 +21,7 @@ class I2S_Microphone:
         self.sample_rate = sample_rate
         self.bits = bits
         self.initialized = False
+        self._feature_buf = None
 
         try:
             # I2S periféria konfigurálása
@@ -118,6 +120,66 @@ class I2S_Microphone:
 
         return normalized_rms
 
+    @micropython.native
+    def read_features(self, num_samples=512, buf=None):
+        """
+        RMS és csúcsérték számítása egy olvasásból, előre lefoglalt bufferrel
+
+        A minták bájtokból, szeletelés nélkül, small int aritmetikával
+        kerülnek feldolgozásra, így a mintánkénti ciklus nem foglal heapet
+        (a második magon futó worker miatt fontos); foglalás csak a
+        visszaadott float értékeknél történik. Az RMS a négyzetösszeg
+        miatt 15 bites amplitúdóból számolódik.
+
+        Args:
+            num_samples: Minták száma a számításhoz
+            buf: Külső buffer (pl. az esemény gyűrű egy blokkja); ekkor a
+                 minták száma a buffer hosszából adódik
+
+        Returns:
+            tuple: (rms, peak), mindkettő 0-1 között normalizálva
+        """
+        if not self.initialized:
+            return 0.0, 0.0
+
+        bytes_per_sample = self.bits // 8
+        if buf is None:
+            size = num_samples * bytes_per_sample
+            if self._feature_buf is None or len(self._feature_buf) != size:
+                self._feature_buf = bytearray(size)
+            buf = self._feature_buf
+
+        num_bytes_read = self.audio_in.readinto(buf)
+        count = num_bytes_read // bytes_per_sample
+        if count == 0:
+            return 0.0, 0.0
+
+        # Mintánként csak a felső 16 bit kerül feldolgozásra (32 bites
+        # módban is). A négyzetösszeg nem fér a small int tartományba
+        # (rp2-n 30 bit + előjel), ezért a négyzetek 15 bites
+        # amplitúdóból számolódnak (<= 2^28), az összeg pedig 2^29-enként
+        # átvitelbe lép: a ciklus nem foglal heapet
+        acc = 0
+        carry = 0
+        peak = 0
+        top = bytes_per_sample - 2
+        for i in range(top, count * bytes_per_sample, bytes_per_sample):
+            s = buf[i] | (buf[i + 1] << 8)
+            if s & 0x8000:
+                s = 0x10000 - s
+            if s > peak:
+                peak = s
+            s >>= 1
+            acc += s * s
+            if acc >= 0x20000000:
+                acc -= 0x20000000
+                carry += 1
+
+        full_scale = 32768
+        sum_squares = (carry * 536870912.0 + acc) * 4
+        rms = (sum_squares / count) ** 0.5
+        return rms / full_scale, peak / full_scale
+
     def deinit(self):
         """I2S periféria leállítása"""
         if self.initialized:
@@ -0,0 +1,196 @@
+"""
+Könnyűsúlyú, ticks_us alapú futásidő profilozó a repülési ciklus lépéseihez
+
+Lépésenként minimum / átlag / maximum, durva hisztogram, hibaszámláló és
+heap foglalás (gc.mem_alloc különbség; ha közben GC futott, nem számít).
+Az összegzés alacsony gyakoriságú housekeeping csomagként megy LoRa-n,
+hisztogrammal együtt pedig az SD kártyára.
+"""
+
+import gc
+import time
+from loop_timing import Histogram
+
+# Hisztogram vödörhatárok mikroszekundumban
+STAGE_BOUNDS_US = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 100000)
+
+
+class StageStats:
+    """Egy lépés futásidő statisztikája"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+        self.alloc_total = 0
+        self.alloc_max = 0
+        self.hist = Histogram(STAGE_BOUNDS_US)
+
+    def add(self, duration_us, alloc=0):
+        """Egy mérés hozzáadása (futásidő µs, foglalt bájt)"""
+        if self.count == 0 or duration_us < self.min_us:
+            self.min_us = duration_us
+        if duration_us > self.max_us:
+            self.max_us = duration_us
+        self.count += 1
+        self.total_us += duration_us
+        self.hist.add(duration_us)
+        if alloc > 0:
+            self.alloc_total += alloc
+            if alloc > self.alloc_max:
+                self.alloc_max = alloc
+
+    def mean_us(self):
+        """Átlagos futásidő"""
+        return self.total_us // self.count if self.count else 0
+
+    def mean_alloc(self):
+        """Átlagos foglalás lépésenként (bájt)"""
+        return self.alloc_total // self.count if self.count else 0
+
+    def reset(self):
+        """Számlálók nullázása"""
+        self.count = 0
+        self.errors = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+        self.alloc_total = 0
+        self.alloc_max = 0
+        self.hist.reset()
+
+    def summary(self):
+        """
+        Kompakt összegzés
+
+        Formátum: "db/hiba/min/átlag/max/foglalás" (µs, átlagos bájt)
+        """
+        return (f"{self.count}/{self.errors}/{self.min_us}/{self.mean_us()}/{self.max_us}/"
+                f"{self.mean_alloc()}")
+
+
+class Profiler:
+    """
+    Lépésenkénti futásidő mérés
+
+    Használat:
+
+        t0 = profiler.start('sensor')
+        ...lépés...
+        profiler.record('sensor', t0)
+    """
+
+    def __init__(self, stages):
+        """
+        Args:
+            stages: Lépésnevek (a riportok sorrendje is ez)
+        """
+        self.stages = stages
+        self.stats = {name: StageStats() for name in stages}
+        self.window_start = time.ticks_ms()
+        # Opcionális hívás lépés kezdetén (név) és végén (None),
+        # pl. a watchdog állapottárnak
+        self.stage_hook = None
+
+    def start(self, stage):
+        """
+        Lépés kezdete: idő és heap állapot rögzítése
+
+        A kezdőállapot a hívónál marad, így ugyanaz a lépés több korutinban
+        átfedve is mérhető (pl. 'tx' a küldő és az uplink ágon) anélkül,
+        hogy egymás foglalási alapját felülírnák. A visszaadott tuple
+        néhány bájtja a lépés foglalásában megjelenik.
+
+        Returns:
+            tuple: (ticks_us, gc.mem_alloc()), a record() paramétere
+        """
+        if self.stage_hook:
+            self.stage_hook(stage)
+        return time.ticks_us(), gc.mem_alloc()
+
+    def record(self, stage, start):
+        """
+        Lépés befejezése: a start() óta eltelt idő és a foglalás rögzítése
+
+        Args:
+            stage: Lépés neve
+            start: A start() visszatérési értéke
+
+        Returns:
+            int: A lépés futásideje (µs)
+        """
+        t0_us, alloc0 = start
+        duration = time.ticks_diff(time.ticks_us(), t0_us)
+        self.stats[stage].add(duration, gc.mem_alloc() - alloc0)
+        if self.stage_hook:
+            self.stage_hook(None)
+        return duration
+
+    def add(self, stage, duration_us):
+        """Máshol (pl. a második magon) mért futásidő rögzítése"""
+        self.stats[stage].add(duration_us)
+
+    def error(self, stage):
+        """Hiba számlálása egy lépésnél (a lépés jelölése is lezárul)"""
+        self.stats[stage].errors += 1
+        if self.stage_hook:
+            self.stage_hook(None)
+
+    def housekeeping(self, mission_id, heap=None):
+        """
+        Housekeeping csomag LoRa-ra (hisztogram nélkül)
+
+        Formátum: "ID,HK,ablak_ms,lépés=db/hiba/min/átlag/max/foglalás;...[;heap=...]"
+        Példa: "CANSAT01,HK,30000,sensor=300/0/812/845/1210/48;tx=30/1/...;heap=..."
+
+        Args:
+            mission_id: Küldetés azonosító
+            heap: Opcionális heap összegzés (HeapMonitor.summary())
+        """
+        window = time.ticks_diff(time.ticks_ms(), self.window_start)
+        parts = ";".join(f"{name}={self.stats[name].summary()}" for name in self.stages)
+        if heap:
+            parts += f";heap={heap}"
+        return f"{mission_id},HK,{window},{parts}"
+
+    def report_lines(self, timestamp):
+        """
+        Részletes riport az SD kártyára, lépésenként egy sor
+
+        Formátum: "időbélyeg,lépés,db/hiba/min/átlag/max/foglalás,hisztogram"
+        """
+        return [f"{timestamp},{name},{self.stats[name].summary()},{self.stats[name].hist.summary()}"
+                for name in self.stages]
+
+    def reset(self):
+        """Új mérési ablak indítása"""
+        for stats in self.stats.values():
+            stats.reset()
+        self.window_start = time.ticks_ms()
+
+
+class BootReport:
+    """
+    Indulási idő bontás perifériánként
+
+    Az időpontok a reset óta eltelt ticks_ms értékek (rp2-n a ticks_ms
+    a resetkor nulláról indul).
+    """
+
+    def __init__(self):
+        self.entries = []
+
+    def mark(self, name, t0_ms):
+        """Egy inicializálási lépés rögzítése (időtartam és befejezési időpont)"""
+        now = time.ticks_ms()
+        self.entries.append((name, time.ticks_diff(now, t0_ms), now))
+
+    def summary(self):
+        """
+        Kompakt összegzés
+
+        Formátum: "lépés=időtartam@befejezés;..." (ms)
+        """
+        return ";".join(f"{name}={duration}@{done}" for name, duration, done in self.entries)
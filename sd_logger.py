@@ -18,6 +18,7 @@ class SDLogger:
 
         self.mounted = False
         self.buffer = []
+        self.offset = 0  # A log fájl mérete az utolsó kiírás után (bájt)
 
     def mount(self):
         """SD kártya csatolása"""
@@ -33,25 +34,99 @@ class SDLogger:
             return False
 
     def write_header(self, filename):
-        """CSV fejléc írása"""
+        """
+        CSV fejléc írása, ha a fájl még nem létezik vagy üres
+
+        Újraindulás után (watchdog, brown-out) a meglévő log folytatódik.
+        """
         if not self.mounted:
             return False
 
         try:
-            with open(filename, 'w') as f:
-                f.write("timestamp,temp_c,pressure_hpa,altitude_m,audio_rms\n")
+            self.offset = self.file_size(filename)
+            if self.offset == 0:
+                with open(filename, 'w') as f:
+                    f.write("timestamp,temp_c,pressure_hpa,altitude_m,audio_rms,phase,"
+                            "kf_alt_m,kf_vel_ms,kf_apogee_m\n")
+                self.offset = self.file_size(filename)
             return True
         except:
             return False
 
-    def append_data(self, filename, timestamp, temp, pressure, altitude, audio_rms):
+    @staticmethod
+    def file_size(filename):
+        """Fájlméret bájtban (0, ha nem létezik)"""
+        try:
+            return os.stat(filename)[6]
+        except OSError:
+            return 0
+
+    def append_data(self, filename, timestamp, temp, pressure, altitude, audio_rms, phase=0):
         """Adat hozzáfűzése a CSV fájlhoz"""
         if not self.mounted:
             return False
 
         try:
             with open(filename, 'a') as f:
-                f.write(f"{timestamp},{temp:.2f},{pressure:.2f},{altitude:.1f},{audio_rms:.4f}\n")
+                f.write(self.format_data(timestamp, temp, pressure, altitude, audio_rms, phase) + "\n")
+            return True
+        except:
+            return False
+
+    @staticmethod
+    def format_data(timestamp, temp, pressure, altitude, audio_rms, phase=0, estimate=None):
+        """
+        Egy CSV sor összeállítása (sorvége nélkül)
+
+        Args:
+            estimate: Opcionális Kalman becslés (magasság, sebesség, csúcsmagasság)
+        """
+        line = f"{timestamp},{temp:.2f},{pressure:.2f},{altitude:.1f},{audio_rms:.4f},{phase}"
+        if estimate:
+            line += f",{estimate[0]:.2f},{estimate[1]:.2f},{estimate[2]:.1f}"
+        return line
+
+    def append_line(self, filename, line):
+        """Egy szöveges sor hozzáfűzése tetszőleges fájlhoz"""
+        if not self.mounted:
+            return False
+
+        try:
+            with open(filename, 'a') as f:
+                f.write(line + "\n")
+            return True
+        except:
+            return False
+
+    def append_lines(self, filename, lines):
+        """Több sor hozzáfűzése egy megnyitással"""
+        if not self.mounted:
+            return False
+
+        try:
+            with open(filename, 'a') as f:
+                for line in lines:
+                    f.write(line + "\n")
+            return True
+        except:
+            return False
+
+    def write_bytes(self, filename, chunks, append=True):
+        """
+        Bináris adat írása egy megnyitással (pl. esemény hangfelvétel)
+
+        Args:
+            filename: Fájlnév
+            chunks: Bufferek (bytes / bytearray / memoryview) sorozata
+            append: False esetén a fájl felülíródik
+        """
+        if not self.mounted:
+            return False
+
+        try:
+            with open(filename, 'ab' if append else 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
             return True
         except:
             return False
@@ -69,6 +144,7 @@ class SDLogger:
             with open(filename, 'a') as f:
                 for data in self.buffer:
                     f.write(data + "\n")
+                    self.offset += len(data) + 1
             self.buffer.clear()
             return True
         except:
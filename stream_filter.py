@@ -0,0 +1,183 @@
+"""
+Folyamatos (mintánkénti) szűrők szenzor csatornákhoz
+
+- RunningMedian: csúszó medián rögzített méretű gyűrűben
+- Hampel: kiugró minta felismerése a csúszó medián és a MAD alapján,
+  kiugró helyett a mediánt adja tovább
+- EMA: exponenciális simítás
+- ChannelFilter: Hampel + EMA egy csatornára, számlálókkal
+
+Minden tároló előre foglalt float tömb, egy frissítés a (kicsi, rögzített)
+ablakmérettel arányos, a minták számától független idő.
+"""
+
+from array import array
+
+# MAD -> szórás (normális eloszlásnál)
+MAD_SCALE = 1.4826
+
+
+class RunningMedian:
+    """Csúszó medián: gyűrű a sorrendhez, rendezett tömb a mediánhoz"""
+
+    def __init__(self, size):
+        """
+        Args:
+            size: Ablakméret (páratlan ajánlott)
+        """
+        self.size = size
+        self.ring = array('f', [0.0] * size)
+        self.sorted = array('f', [0.0] * size)
+        self.count = 0
+        self.pos = 0
+
+    def update(self, value):
+        """
+        Új minta az ablakba (a legrégebbi helyére)
+
+        Returns:
+            float: Az ablak mediánja
+        """
+        s = self.sorted
+        n = self.count
+
+        if n == self.size:
+            old = self.ring[self.pos]
+            i = 0
+            while i < n - 1 and s[i] != old:
+                i += 1
+            while i < n - 1:
+                s[i] = s[i + 1]
+                i += 1
+            n -= 1
+
+        # A tárolt (float32) alakkal kell dolgozni, hogy a későbbi törlés
+        # megtalálja a rendezett tömbben
+        self.ring[self.pos] = value
+        value = self.ring[self.pos]
+        i = n
+        while i > 0 and s[i - 1] > value:
+            s[i] = s[i - 1]
+            i -= 1
+        s[i] = value
+
+        self.count = n + 1
+        self.pos += 1
+        if self.pos == self.size:
+            self.pos = 0
+        return self.median()
+
+    def median(self):
+        """Aktuális medián (üres ablaknál 0)"""
+        n = self.count
+        if n == 0:
+            return 0.0
+        s = self.sorted
+        if n & 1:
+            return s[n >> 1]
+        return (s[(n >> 1) - 1] + s[n >> 1]) / 2
+
+
+class Hampel:
+    """
+    Hampel szűrő: |x - medián| > k * 1.4826 * MAD esetén x kiugró
+
+    A küszöb alsó korlátja min_dev, különben kvantált, zajmentes
+    jelnél (MAD = 0) minden változás kiugrónak számítana.
+    """
+
+    def __init__(self, size, k=3.0, min_dev=0.0):
+        """
+        Args:
+            size: Ablakméret
+            k: Küszöb szórásban
+            min_dev: Legkisebb küszöb (a csatorna mértékegységében)
+        """
+        self.window = RunningMedian(size)
+        self.k = k * MAD_SCALE
+        self.min_dev = min_dev
+        self._dev = array('f', [0.0] * size)
+        self.rejected = 0
+
+    def update(self, value):
+        """
+        Returns:
+            float: value, vagy kiugró esetén az ablak mediánja
+        """
+        window = self.window
+        med = window.update(value)
+        n = window.count
+        if n < 3:
+            return value
+
+        # MAD: az eltérések mediánja (kis ablak: beszúrásos rendezés)
+        dev = self._dev
+        ring = window.ring
+        for i in range(n):
+            d = abs(ring[i] - med)
+            j = i
+            while j > 0 and dev[j - 1] > d:
+                dev[j] = dev[j - 1]
+                j -= 1
+            dev[j] = d
+        if n & 1:
+            mad = dev[n >> 1]
+        else:
+            mad = (dev[(n >> 1) - 1] + dev[n >> 1]) / 2
+
+        limit = self.k * mad
+        if limit < self.min_dev:
+            limit = self.min_dev
+        if abs(value - med) > limit:
+            self.rejected += 1
+            return med
+        return value
+
+
+class EMA:
+    """Exponenciális simítás (alpha = 1: nincs simítás)"""
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.value = None
+
+    def update(self, value):
+        if self.value is None or self.alpha >= 1:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+        return self.value
+
+
+class ChannelFilter:
+    """Egy csatorna szűrőlánca: Hampel, majd EMA"""
+
+    def __init__(self, window=5, k=3.0, min_dev=0.0, alpha=1.0):
+        """
+        Args:
+            window: Hampel ablakméret
+            k: Hampel küszöb (szórásban)
+            min_dev: Hampel legkisebb küszöb
+            alpha: EMA együttható (1: nincs simítás)
+        """
+        self.hampel = Hampel(window, k, min_dev)
+        self.ema = EMA(alpha)
+        self.count = 0
+
+    def update(self, value):
+        """Egy minta szűrése"""
+        self.count += 1
+        return self.ema.update(self.hampel.update(value))
+
+    @property
+    def rejected(self):
+        return self.hampel.rejected
+
+    def summary(self):
+        """Formátum: "minták/kiugrók" """
+        return f"{self.count}/{self.hampel.rejected}"
+
+    def reset_stats(self):
+        """Számlálók nullázása (a szűrő állapota megmarad)"""
+        self.count = 0
+        self.hampel.rejected = 0
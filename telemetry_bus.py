@@ -0,0 +1,280 @@
+"""
+Élő telemetria szétosztása helyi socketen (gépen, CPython)
+
+Minden dekódolt keret egyszer kerül kódolásra (formátumonként), és minden
+feliratkozó saját, korlátos sorába kerül; a sorokat feliratkozónként külön
+író korutin üríti. A publikálás soha nem vár: lassú feliratkozónál a sor
+megtelik, és a BUS_DROP_POLICY szerint dobunk:
+    'oldest'      a legrégebbi keret eldobása (a friss adat a fontosabb)
+    'newest'      az új keret eldobása (hiánytalan eleje)
+    'disconnect'  a feliratkozó lecsatlakoztatása
+
+Feliratkozás: kapcsolódás után egy sor, "json" (alapértelmezett) vagy
+"bin". JSON: soronként egy objektum. Bináris: 2 bájt hossz + BINARY_FORMAT
+rögzített mezők + küldetés azonosító és vevő név (hossz + bájtok).
+
+Használat:
+    python ground_merge.py serve --bus                      # összefésült folyam
+    mpremote ... run ground_station.py | python telemetry_bus.py serve   # egy vevő
+    python telemetry_bus.py sub [--bin]                     # kiírás (teszt, logger)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import struct
+import sys
+from collections import deque
+
+import config
+
+# sorszám, időbélyeg, hőmérséklet, nyomás, magasság, audio, sebesség,
+# csúcspont, RSSI, fázis, példányszám (hiányzó float: NaN)
+BINARY_FORMAT = '<IdffffffhBB'
+BINARY_FIELDS = ('sequence', 'timestamp', 'temperature', 'pressure', 'altitude',
+                 'audio_rms', 'velocity', 'apogee', 'rssi', 'phase', 'copies')
+FORMATS = ('json', 'bin')
+POLICIES = ('oldest', 'newest', 'disconnect')
+
+
+def encode_json(frame):
+    return (json.dumps(frame) + "\n").encode()
+
+
+def encode_binary(frame):
+    """Keret bináris alakja (2 bájt hossz előtaggal)"""
+    values = []
+    for name in BINARY_FIELDS:
+        value = frame.get(name)
+        if name in ('sequence', 'rssi', 'phase', 'copies'):
+            values.append(int(value or 0))
+        else:
+            values.append(math.nan if value is None else float(value))
+    body = struct.pack(BINARY_FORMAT, *values)
+    for name in ('mission_id', 'receiver'):
+        text = str(frame.get(name) or '').encode()[:255]
+        body += bytes((len(text),)) + text
+    return struct.pack('<H', len(body)) + body
+
+
+def decode_binary(body):
+    """Bináris keret (hossz előtag nélkül) -> szótár"""
+    size = struct.calcsize(BINARY_FORMAT)
+    frame = dict(zip(BINARY_FIELDS, struct.unpack_from(BINARY_FORMAT, body)))
+    for name, value in frame.items():
+        if isinstance(value, float) and math.isnan(value):
+            frame[name] = None
+    pos = size
+    for name in ('mission_id', 'receiver'):
+        length = body[pos]
+        frame[name] = body[pos + 1:pos + 1 + length].decode()
+        pos += 1 + length
+    return frame
+
+
+class Subscriber:
+    """Egy feliratkozó: korlátos sor és jelzés az írónak"""
+
+    def __init__(self, writer, fmt, max_queue):
+        self.writer = writer
+        self.fmt = fmt
+        self.queue = deque()
+        self.max_queue = max_queue
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+
+
+class TelemetryBus:
+    """Publikálás minden feliratkozónak, a vétel blokkolása nélkül"""
+
+    def __init__(self, max_queue=config.BUS_QUEUE_SIZE, policy=config.BUS_DROP_POLICY):
+        """
+        Args:
+            max_queue: Keretek feliratkozónként a sorban
+            policy: Teli sor kezelése (POLICIES)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"policy: {', '.join(POLICIES)}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.subscribers = []
+        self.published = 0
+        self.invalid = 0     # nem kódolható keretek (pl. tartományon kívüli mező)
+
+    def publish(self, frame):
+        """
+        Keret küldése minden feliratkozónak (nem vár, nem dob kivételt)
+
+        Formátumonként egyszer kódol, csak ha van ilyen feliratkozó. Ha a
+        keret egy formátumban nem kódolható (pl. a sorszám nem fér a bináris
+        mezőbe), az adott formátum feliratkozói kimaradnak, a keret az
+        `invalid` számlálóba kerül; a hívó (összefésülő) folyama nem áll le.
+        """
+        self.published += 1
+        encoded = {}
+        for sub in self.subscribers:
+            if sub.closed:
+                continue
+            data = encoded.get(sub.fmt)
+            if data is None:
+                try:
+                    data = encode_binary(frame) if sub.fmt == 'bin' else encode_json(frame)
+                except (struct.error, TypeError, ValueError, OverflowError):
+                    if not any(v == b'' for v in encoded.values()):
+                        self.invalid += 1
+                    data = b''
+                encoded[sub.fmt] = data
+            if not data:
+                continue
+
+            if len(sub.queue) >= sub.max_queue:
+                sub.dropped += 1
+                if self.policy == 'newest':
+                    continue
+                if self.policy == 'disconnect':
+                    self._close(sub)
+                    continue
+                sub.queue.popleft()
+            sub.queue.append(data)
+            sub.ready.set()
+
+    def _close(self, sub):
+        sub.closed = True
+        sub.ready.set()
+        sub.writer.close()
+
+    async def handle_subscriber(self, reader, writer):
+        """Új kapcsolat: formátum sor, majd a sor ürítése a kapcsolatra"""
+        fmt = 'json'
+        try:
+            line = await asyncio.wait_for(reader.readline(), 1.0)
+            word = line.decode(errors='ignore').strip().lower()
+            if word in FORMATS:
+                fmt = word
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+
+        sub = Subscriber(writer, fmt, self.max_queue)
+        self.subscribers.append(sub)
+        try:
+            while not sub.closed:
+                await sub.ready.wait()
+                sub.ready.clear()
+                while sub.queue and not sub.closed:
+                    writer.write(sub.queue.popleft())
+                    sub.sent += 1
+                    # Csak ez a korutin vár a lassú feliratkozóra
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.remove(sub)
+            if not sub.closed:
+                sub.closed = True
+                writer.close()
+
+    async def start(self, host='127.0.0.1', port=config.BUS_PORT, unix_path=None):
+        """
+        Szerver indítása (TCP vagy Unix socket)
+
+        Returns:
+            asyncio.Server
+        """
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_subscriber, unix_path)
+        return await asyncio.start_server(self.handle_subscriber, host, port)
+
+    def summary(self):
+        """Formátum: "publikált/hibás;formátum=küldött/eldobott/sor;..." """
+        parts = [f"{self.published}/{self.invalid}"]
+        parts += [f"{s.fmt}={s.sent}/{s.dropped}/{len(s.queue)}" for s in self.subscribers]
+        return ";".join(parts)
+
+
+def add_bus_arguments(parser):
+    """Közös parancssori kapcsolók a busz szerverhez"""
+    parser.add_argument("--bus-host", default="127.0.0.1")
+    parser.add_argument("--bus-port", type=int, default=config.BUS_PORT)
+    parser.add_argument("--bus-unix", help="Unix socket útvonal (TCP helyett)")
+    parser.add_argument("--bus-queue", type=int, default=config.BUS_QUEUE_SIZE)
+    parser.add_argument("--bus-policy", choices=POLICIES, default=config.BUS_DROP_POLICY)
+
+
+async def subscribe(host='127.0.0.1', port=config.BUS_PORT, fmt='json', unix_path=None):
+    """
+    Feliratkozás a buszra (fogyasztóknak)
+
+    Yields:
+        dict: Keretek
+    """
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"{fmt}\n".encode())
+    try:
+        while True:
+            if fmt == 'bin':
+                header = await reader.readexactly(2)
+                body = await reader.readexactly(struct.unpack('<H', header)[0])
+                yield decode_binary(body)
+            else:
+                line = await reader.readline()
+                if not line:
+                    return
+                yield json.loads(line)
+    except asyncio.IncompleteReadError:
+        return
+    finally:
+        writer.close()
+
+
+async def serve_stdin(bus, args):
+    """Egy vevő konzol kimenetének publikálása (ground_merge nélkül)"""
+    from ground_merge import parse_frame_line
+
+    server = await bus.start(args.bus_host, args.bus_port, args.bus_unix)
+    loop = asyncio.get_running_loop()
+    async with server:
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            frame = parse_frame_line(line.rstrip("\r\n"))
+            if frame is None:
+                sys.stdout.write(line)
+            else:
+                bus.publish(frame)
+
+
+async def print_frames(args):
+    async for frame in subscribe(args.bus_host, args.bus_port,
+                                 'bin' if args.bin else 'json', args.bus_unix):
+        print(json.dumps(frame), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Élő telemetria busz")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    serve = sub.add_parser("serve", help="Vevő konzol (stdin) publikálása")
+    add_bus_arguments(serve)
+    client = sub.add_parser("sub", help="Feliratkozás, keretek kiírása")
+    add_bus_arguments(client)
+    client.add_argument("--bin", action="store_true", help="Bináris formátum")
+    args = parser.parse_args()
+
+    try:
+        if args.mode == "serve":
+            asyncio.run(serve_stdin(TelemetryBus(args.bus_queue, args.bus_policy), args))
+        else:
+            asyncio.run(print_frames(args))
+    except (KeyboardInterrupt, ConnectionError):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,8 @@ def test_bmp280():
     try:
         """A BMP280 szenzor driver könyvtár betöltése"""
         import bmp280
+        """Közös magasság számítás (standard légkör képlet)"""
+        from altitude import isa as isa_altitude
         """Létrehozza az I2C busz objektumot"""
         """0 = I2C0 busz használata"""
         """scl=Pin(...) = órajel (clock) láb beállítása a config-ból"""
@@ -54,10 +56,8 @@ def test_bmp280():
                 """sensor.read(): Beolvassa a nyomást (hPa) és hőmérsékletet (°C)"""
                 pres, temp = sensor.read()
                 """Magasság számítás: Barometrikus képlettel számol (tengerszint feletti magasság)"""
-                """44330 = konstans"""
-                """1013.25 = tengerszinti átlagnyomás hPa-ban"""
-                """0.1903 = exponens a képletben"""
-                altitude = 44330 * (1 - (pres / 1013.25) ** 0.1903)
+                """config.SEA_LEVEL_PRESSURE = tengerszinti átlagnyomás hPa-ban"""
+                altitude = isa_altitude(pres)
                 """Kiírja az értékeket formázva (2 tizedesjegy temp/nyomás, 1 magasság)"""
                 print(f"  [{i+1}] Hőmérséklet: {temp:.2f} °C, Nyomás: {pres:.2f} hPa, Magasság: {altitude:.1f} m")
                 """0.5 mp várakozás mérések között"""
@@ -75,6 +75,97 @@ def test_bmp280():
         return False
 
 
+def test_bmp280_compensation():
+    """BMP280 32 bites kompenzáció összevetése a 64 bites referenciával (szenzor nélkül)"""
+    print("\n=== BMP280 KOMPENZÁCIÓ TESZT ===")
+    try:
+        import bmp280
+        # Az adatlap példa kalibrációja (T1..T3, P1..P9)
+        cal = (27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000)
+        sensor = bmp280.BMP280.__new__(bmp280.BMP280)
+        sensor._set_calibration(cal)
+
+        # Adatlap példa: adc_T=519888 -> 25.08 °C, adc_P=415148 -> ~100653 Pa
+        t_fine = sensor._compensate_temp(519888)
+        p32 = sensor._compensate_pressure(415148, t_fine)
+        p64 = sensor._compensate_pressure64(415148, t_fine) / 256
+        print(f"  Példa: {sensor.temperature / 100:.2f} °C, int32: {p32} Pa, int64: {p64:.2f} Pa")
+        if sensor.temperature != 2508 or abs(p32 - p64) > 5:
+            print("❌ Eltérés az adatlap példától")
+            return False
+
+        # Pontosságvesztés a teljes tartományban (kb. 300-1100 hPa, -20..+60 °C)
+        max_diff = 0.0
+        for adc_t in range(420000, 600001, 30000):
+            t_fine = sensor._compensate_temp(adc_t)
+            for adc_p in range(250000, 650001, 5000):
+                diff = abs(sensor._compensate_pressure(adc_p, t_fine) -
+                           sensor._compensate_pressure64(adc_p, t_fine) / 256)
+                if diff > max_diff:
+                    max_diff = diff
+        print(f"  Legnagyobb eltérés: {max_diff:.2f} Pa (~{max_diff * 0.083:.2f} m tengerszinten)")
+
+        # Futásidő mintánként
+        n = 200
+        t0 = time.ticks_us()
+        for _ in range(n):
+            sensor._compensate_pressure(415148, t_fine)
+        t32 = time.ticks_diff(time.ticks_us(), t0) / n
+        t0 = time.ticks_us()
+        for _ in range(n):
+            sensor._compensate_pressure64(415148, t_fine)
+        t64 = time.ticks_diff(time.ticks_us(), t0) / n
+        print(f"  Futásidő: int32 {t32:.0f} µs, int64 {t64:.0f} µs ({t64 / t32:.1f}x)")
+
+        if max_diff > 8:
+            print("❌ Túl nagy pontosságvesztés")
+            return False
+        print("✓ BMP280 kompenzáció OK")
+        return True
+
+    except Exception as e:
+        print(f"❌ BMP280 kompenzáció hiba: {e}")
+        return False
+
+
+def test_altitude():
+    """Táblázatos magasság számítás pontossága és sebessége a pontos képlethez képest"""
+    print("\n=== MAGASSÁG SZÁMÍTÁS TESZT ===")
+    try:
+        import altitude
+        ok = True
+        for mode in ('isa', 'hypsometric'):
+            table = altitude.AltitudeTable(mode=mode)
+            worst = table.check()
+            print(f"  {mode}: {len(table.table)} pont, hibakorlát {table.max_error:.4f} m, "
+                  f"mért legnagyobb hiba {worst:.4f} m")
+            if worst > table.max_error * 1.5:
+                ok = False
+
+        # Futásidő mintánként
+        table = altitude.AltitudeTable(mode='isa')
+        n = 500
+        t0 = time.ticks_us()
+        for _ in range(n):
+            table.altitude(900.5)
+        t_table = time.ticks_diff(time.ticks_us(), t0) / n
+        t0 = time.ticks_us()
+        for _ in range(n):
+            altitude.isa(900.5)
+        t_exact = time.ticks_diff(time.ticks_us(), t0) / n
+        print(f"  Futásidő: táblázat {t_table:.1f} µs, pontos képlet {t_exact:.1f} µs")
+
+        if not ok:
+            print("❌ A hiba meghaladja a korlátot")
+            return False
+        print("✓ Magasság számítás OK")
+        return True
+
+    except Exception as e:
+        print(f"❌ Magasság számítás hiba: {e}")
+        return False
+
+
 def test_i2s_microphone():
     """I2S mikrofon tesztelése"""
     print("\n=== I2S MIKROFON TESZT ===")
@@ -134,7 +225,7 @@ def test_lora():
     print("\n=== LoRa MODUL TESZT ===")
     try:
         from lora_radio import LoRaRadio
-"""LoRa objektum létrehozása SPI pin-ekkel:
+        """LoRa objektum létrehozása SPI pin-ekkel:
 sck = Serial Clock
 mosi = Master Out Slave In (adat kimenet)
 miso = Master In Slave Out (adat bemenet)
@@ -149,7 +240,7 @@ dio0 = Digital I/O 0 (megszakítás kezelés)"""
             rst_pin=config.LORA_RST,
             dio0_pin=config.LORA_DIO0
         )
-"""LoRa inicializálás rádió paraméterekkel:
+        """LoRa inicializálás rádió paraméterekkel:
 frequency = frekvencia MHz-ben (pl. 433 vagy 868 MHz)
 tx_power = adóteljesítmény dBm-ben
 spreading_factor = terjedési faktor (hatótáv vs sebesség)
@@ -171,7 +262,7 @@ coding_rate = hibavédelem mértéke"""
 
         # Teszt üzenet küldése
         print("Teszt üzenet küldése...")
-"""Teszt üzenet összeállítása CSV formátumban (teszt adatok)"""
+        """Teszt üzenet összeállítása CSV formátumban (teszt adatok)"""
         test_msg = "TEST,1,25.5,1013.25,100.0,0.1234"
 
         if lora.send(test_msg):
@@ -278,6 +369,8 @@ def main():
     results = {
         'LED': test_leds(),
         'BMP280': test_bmp280(),
+        'BMP280 kompenzáció': test_bmp280_compensation(),
+        'Magasság számítás': test_altitude(),
         'I2S Mikrofon': test_i2s_microphone(),
         'LoRa': test_lora(),
         'SD Kártya': test_sd_card()
@@ -0,0 +1,155 @@
+"""
+Földi eszközök tesztje (gépen, CPython)
+
+Hardver nélkül fut: python test_ground.py (vagy pytest test_ground.py)
+"""
+
+import importlib
+import io
+import random
+import sys
+import types
+
+import numpy as np
+
+import bmp280_batch
+from ground_merge import Deduplicator, MergeServer
+from telemetry_bus import Subscriber, TelemetryBus, decode_binary
+
+
+class _Writer:
+    """Feliratkozó kapcsolat helyett: nem ír sehová"""
+
+    def close(self):
+        pass
+
+
+def _firmware_module(name):
+    """
+    Fedélzeti modul importja gépen
+
+    A hiányzó `machine` / `micropython` helyére csak az import idejére
+    kerül váz (a tesztelt függvények hardvert nem érnek el).
+    """
+    stubs = {
+        'machine': types.SimpleNamespace(I2C=None, Pin=None, SPI=None),
+        'micropython': types.SimpleNamespace(native=lambda f: f, viper=lambda f: f,
+                                             const=lambda x: x),
+    }
+    added = [n for n in stubs if n not in sys.modules]
+    for n in added:
+        sys.modules[n] = stubs[n]
+    try:
+        return importlib.import_module(name)
+    finally:
+        for n in added:
+            sys.modules.pop(n)
+
+
+def _random_calibration(rnd):
+    """Véletlen, de valószerű kalibráció (T1..T3, P1..P9, a gyári szórás körül)"""
+    return (rnd.randint(26000, 30000), rnd.randint(24000, 28000), rnd.randint(-1200, 0),
+            rnd.randint(34000, 40000), rnd.randint(-12000, -9000), rnd.randint(2000, 4000),
+            rnd.randint(2000, 9000), rnd.randint(-300, 300), rnd.randint(-10, 10),
+            rnd.randint(9000, 16000), rnd.randint(-15000, -10000), rnd.randint(3000, 7000))
+
+
+def test_bmp280_batch_equivalence():
+    """bmp280_batch bitre azonos a fedélzeti BMP280 kompenzációval"""
+    print("\n=== BMP280 BATCH EGYEZÉS TESZT ===")
+    bmp280 = _firmware_module('bmp280')
+    rnd = random.Random(1)
+    samples = 0
+    # Az adatlap példa kalibrációja és véletlen kalibrációk
+    cals = [(27504, 26435, -1000, 36477, -10685, 3024, 2855, 140, -7, 15500, -14600, 6000)]
+    cals += [_random_calibration(rnd) for _ in range(20)]
+    for cal in cals:
+        sensor = bmp280.BMP280.__new__(bmp280.BMP280)
+        sensor._set_calibration(cal)
+        adc_t = [rnd.randint(300000, 720000) for _ in range(1000)]
+        adc_p = [rnd.randint(150000, 750000) for _ in range(1000)]
+
+        t_fine, temp = bmp280_batch.compensate_temp(adc_t, cal)
+        pressure = bmp280_batch.compensate_pressure(adc_p, t_fine, cal)
+        for i in range(len(adc_t)):
+            tf = sensor._compensate_temp(adc_t[i])
+            assert tf == t_fine[i] and sensor.temperature == temp[i], \
+                f"hőmérséklet eltér: cal={cal} adc_t={adc_t[i]}"
+            assert sensor._compensate_pressure(adc_p[i], tf) == pressure[i], \
+                f"nyomás eltér: cal={cal} adc_t={adc_t[i]} adc_p={adc_p[i]}"
+        samples += len(adc_t)
+    assert pressure.dtype == np.int64
+    print(f"✓ {samples} minta, {len(cals)} kalibráció: bitre azonos")
+
+
+def _frame(sequence, **fields):
+    frame = {'mission_id': 'CANSAT', 'sequence': sequence, 'timestamp': 1.0,
+             'altitude': 120.5, 'rssi': -80, 'phase': 1, 'copies': 1, 'receiver': 'north'}
+    frame.update(fields)
+    return frame
+
+
+def test_bus_malformed_frame():
+    """Nem kódolható keret nem állítja meg az összefésülő -> busz utat"""
+    print("\n=== BUSZ HIBÁS KERET TESZT ===")
+    output = io.StringIO()
+    merge = MergeServer(output)
+    bus = TelemetryBus(max_queue=8)
+    merge.sinks.append(bus.publish)
+    binary = Subscriber(_Writer(), 'bin', bus.max_queue)
+    text = Subscriber(_Writer(), 'json', bus.max_queue)
+    bus.subscribers += [binary, text]
+
+    # Sorszám nem fér az uint32 mezőbe, RSSI nem szám, fázis szöveg
+    merge.write([_frame(2 ** 40), _frame(2, rssi='n/a'), _frame(3, phase='ASCENT'),
+                 _frame(4)])
+
+    assert len(output.getvalue().splitlines()) == 4, "a CSV kimenetből keret hiányzik"
+    assert bus.published == 4
+    assert bus.invalid == 3
+    assert len(text.queue) == 4, "a JSON feliratkozó nem kapott meg minden keretet"
+    assert len(binary.queue) == 1
+    assert decode_binary(binary.queue[0][2:])['sequence'] == 4
+    print(f"✓ busz: {bus.summary()}")
+
+
+def test_merge_malformed_rssi():
+    """Nem szám RSSI nem szakítja meg a duplikátum szűrést"""
+    print("\n=== ÖSSZEFÉSÜLÉS HIBÁS RSSI TESZT ===")
+    dedup = Deduplicator(hold_ms=1000)
+    dedup.add(_frame(1, rssi='n/a', receiver='north'), now=0)
+    dedup.add(_frame(1, rssi=-90, receiver='south'), now=0.1)
+    dedup.add(_frame(1, rssi=None, receiver='east'), now=0.2)
+    dedup.add(_frame(1, rssi=[1], receiver='west'), now=0.3)
+    frames = dedup.expired(now=2)
+    assert len(frames) == 1
+    assert frames[0]['receiver'] == 'south', "nem a legjobb (számszerű) RSSI-jű példány maradt"
+    assert frames[0]['copies'] == 4
+    print(f"✓ összefésülés: {dedup.summary()}")
+
+
+def main():
+    """Főprogram - összes teszt futtatása"""
+    results = {}
+    tests = (
+        ('BMP280 batch egyezés', test_bmp280_batch_equivalence),
+        ('Busz hibás keret', test_bus_malformed_frame),
+        ('Hibás RSSI', test_merge_malformed_rssi),
+    )
+    for name, test in tests:
+        try:
+            test()
+            results[name] = True
+        except AssertionError as e:
+            print(f"❌ {e}")
+            results[name] = False
+
+    print("\n" + "=" * 60)
+    for name, result in results.items():
+        print(f"{name:20} : {'✓ OK' if result else '❌ HIBA'}")
+    print("=" * 60)
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Hitelesített feltöltő (föld -> CanSat) parancsok
+
+A CanSat minden telemetria adás után rövid vételi ablakot nyit; a
+vevőállomás ebben küldheti a következő parancsot. Minden feltöltött
+csomag végén HMAC-SHA256 (az első UPLINK_MAC_LEN bájt, hexában) a közös
+kulccsal, a parancsokban szigorúan növekvő számláló (visszajátszás ellen).
+
+Csomagok:
+    föld -> CanSat: "ID,CM,számláló,parancs,paraméter,mac"
+                    "ID,NK,eddig,a-b;c,mac"  (letöltés hiánylista)
+    CanSat -> föld: "ID,CA,számláló,ok|dup|err|part:n"  (parancs nyugta;
+                    part:n - RT-ből csak n sorszámig fért a küldési sorba)
+
+Parancsok:
+    TI,<ms>       telemetria periódus (a következő fázisváltásig)
+    RP,<profil>   rádió profil (bejelentéssel, mint fázisváltáskor)
+    RT,<a>[-<b>]  telemetria csomag(ok) újraküldése sorszám szerint
+    DL,<1|0|a>    tömeges letöltés indítása / leállítása / automatikus
+
+A fedélzet és a vevőállomás is használja (MicroPython és CPython).
+"""
+
+import hashlib
+import config
+
+COMMANDS = ('TI', 'RP', 'RT', 'DL')
+
+
+def hmac_sha256(key, message):
+    """HMAC-SHA256 (RFC 2104); a MicroPython-ban nincs hmac modul"""
+    if len(key) > 64:
+        key = hashlib.sha256(key).digest()
+    key = key + bytes(64 - len(key))
+    inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    inner.update(message)
+    outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+    outer.update(inner.digest())
+    return outer.digest()
+
+
+class UplinkAuth:
+    """Feltöltött csomagok aláírása / ellenőrzése, parancs számláló"""
+
+    def __init__(self, key=config.UPLINK_KEY, mission_id=config.MISSION_ID,
+                 counter_file=None):
+        """
+        Args:
+            key: Közös kulcs (bytes)
+            mission_id: Csomag azonosító
+            counter_file: A számláló tárolása (túléli az újraindulást)
+        """
+        self.key = key
+        self.mission_id = mission_id
+        self.counter_file = counter_file
+        self.counter = 0
+        self.rejected = 0  # Hibás MAC / régi számláló
+
+        if counter_file:
+            try:
+                with open(counter_file) as f:
+                    self.counter = int(f.read())
+            except:
+                pass
+
+    def _save_counter(self):
+        if not self.counter_file:
+            return
+        try:
+            with open(self.counter_file, 'w') as f:
+                f.write(str(self.counter))
+        except:
+            pass
+
+    def mac(self, body):
+        """Rövidített MAC hexában"""
+        digest = hmac_sha256(self.key, body.encode())
+        return "".join("%02x" % b for b in digest[:config.UPLINK_MAC_LEN])
+
+    def sign(self, body):
+        """Aláírt csomag: "body,mac" """
+        return f"{body},{self.mac(body)}"
+
+    def verify(self, data):
+        """
+        Aláírás ellenőrzése
+
+        Args:
+            data: Fogadott csomag (bytes vagy str)
+
+        Returns:
+            str: A csomag MAC nélkül, vagy None (hibás / más küldetés)
+        """
+        try:
+            if not isinstance(data, str):
+                data = bytes(data).decode()
+            body, _, mac = data.rpartition(',')
+            if body.split(',', 1)[0] == self.mission_id and mac == self.mac(body):
+                return body
+        except:
+            pass
+        self.rejected += 1
+        return None
+
+    def command(self, cmd, arg=''):
+        """
+        Következő parancs összeállítása (vevőállomás)
+
+        Returns:
+            tuple: (számláló, aláírt csomag)
+        """
+        self.counter += 1
+        self._save_counter()
+        return self.counter, self.sign(f"{self.mission_id},CM,{self.counter},{cmd},{arg}")
+
+    def parse_command(self, body):
+        """
+        Ellenőrzött csomagból parancs (fedélzet)
+
+        Az utolsó elfogadott számlálójú parancs ismét megérkezhet (elveszett
+        nyugta után újraküldve): ekkor 'dup', nem hajtódik végre újra.
+
+        Args:
+            body: verify() kimenete
+
+        Returns:
+            tuple: (számláló, parancs, paraméter, új-e) vagy None
+        """
+        try:
+            _, kind, counter, cmd, arg = body.split(',', 4)
+            counter = int(counter)
+        except:
+            return None
+        if kind != 'CM' or cmd not in COMMANDS or counter < self.counter:
+            self.rejected += 1
+            return None
+        fresh = counter > self.counter
+        if fresh:
+            self.counter = counter
+            self._save_counter()
+        return counter, cmd, arg, fresh
+
+    def ack(self, counter, status):
+        """Parancs nyugta: "ID,CA,számláló,ok|dup|err|part:n" """
+        return f"{self.mission_id},CA,{counter},{status}"
@@ -0,0 +1,240 @@
+"""
+Watchdog felügyelet és állapotmegőrzés újraindításhoz
+
+A hardveres watchdogot (machine.WDT) egyetlen felügyelő task eteti, de csak
+akkor, ha minden regisztrált task jelentkezett a saját határidején belül.
+Ha egy task elakad (pl. TxDone sosem jön, az SD kártya lefagy), a felügyelő
+abbahagyja az etetést és a chip újraindul; ha a teljes ütemező blokkol,
+maga a felügyelő sem fut, így a watchdog ugyanúgy újraindít.
+
+Az utolsó jó állapot (sorszám, fázis, log pozíció, földi referencia,
+maximális magasság) két helyre kerül:
+- az RP2040 watchdog scratch regisztereibe minden ciklusban (gyors, túléli
+  a watchdog és soft resetet, a tápvesztést nem)
+- flash fájlba ritkábban (túléli a brown-out / tápvesztést is)
+"""
+
+import machine
+import os
+import time
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+# RP2040 WATCHDOG_SCRATCH0..3 (a 4..7 regisztereket a bootrom használja)
+SCRATCH_BASE = 0x4005800C
+STATE_MAGIC = 0xCA5A
+
+# Lépéskódok a scratch regiszterben (melyik lépésben akadt el a ciklus)
+STAGES = ('', 'sensor', 'rms', 'encode', 'tx', 'sd', 'mount')
+
+
+class StateStore:
+    """
+    Utolsó jó állapot tárolása
+
+    Scratch elrendezés:
+        SCRATCH0: sorszám
+        SCRATCH1: SD log pozíció (bájt)
+        SCRATCH2: földi referencia magasság (dm, előjeles, felső 16 bit) |
+                  maximális AGL magasság (dm, alsó 16 bit)
+        SCRATCH3: magic (16 bit) | fázis index (8 bit) | lépéskód (8 bit)
+    """
+
+    def __init__(self, filename):
+        """
+        Args:
+            filename: Flash állapotfájl (pl. "/state.csv")
+        """
+        self.filename = filename
+        self._word3 = 0
+
+    def save_fast(self, seq, phase, log_offset, ground_alt, max_alt=0.0):
+        """
+        Állapot mentése a scratch regiszterekbe (minden ciklusban hívható)
+
+        A két magasság egy regiszteren osztozik, ezért dm felbontással,
+        16 bitre vágva kerül be (földi referencia ±3276 m, maximum 0..6553 m).
+        """
+        ground_dm = min(max(int(ground_alt * 10), -0x8000), 0x7FFF)
+        max_dm = min(max(int(max_alt * 10), 0), 0xFFFF)
+        machine.mem32[SCRATCH_BASE] = seq
+        machine.mem32[SCRATCH_BASE + 4] = log_offset
+        machine.mem32[SCRATCH_BASE + 8] = ((ground_dm & 0xFFFF) << 16) | max_dm
+        self._word3 = (STATE_MAGIC << 16) | ((phase & 0xFF) << 8) | (self._word3 & 0xFF)
+        machine.mem32[SCRATCH_BASE + 12] = self._word3
+
+    def mark_stage(self, stage):
+        """
+        Aktuális lépés jelölése (watchdog reset után kiderül, hol akadt el)
+
+        Args:
+            stage: Lépés neve (STAGES) vagy None a lépés végén
+        """
+        code = STAGES.index(stage) if stage else 0
+        self._word3 = (self._word3 & 0xFFFFFF00) | code
+        machine.mem32[SCRATCH_BASE + 12] = self._word3
+
+    def save_flash(self, seq, phase, log_offset, ground_alt, max_alt=0.0, reason=''):
+        """
+        Állapot mentése flash fájlba (ritkán: fázisváltáskor, periodikusan)
+
+        Formátum: "seq,phase,log_offset,ground_alt,max_alt,reason"
+        Az írás ideiglenes fájlba, majd átnevezéssel történik, így egy
+        írás közbeni reset sem hagy félkész állapotot.
+        """
+        tmp = self.filename + ".tmp"
+        try:
+            with open(tmp, 'w') as f:
+                f.write(f"{seq},{phase},{log_offset},{ground_alt:.2f},{max_alt:.2f},{reason}\n")
+            os.rename(tmp, self.filename)
+            return True
+        except:
+            return False
+
+    def _load_scratch(self):
+        """Scratch regiszterek olvasása, None ha nincs érvényes állapot"""
+        # A mem32 olvasás előjelessége portfüggő, ezért maszkolva
+        word3 = machine.mem32[SCRATCH_BASE + 12] & 0xFFFFFFFF
+        if (word3 >> 16) != STATE_MAGIC:
+            return None
+
+        alt_word = machine.mem32[SCRATCH_BASE + 8] & 0xFFFFFFFF
+        ground_dm = alt_word >> 16
+        if ground_dm & 0x8000:
+            ground_dm -= 0x10000
+
+        self._word3 = word3 & 0xFFFFFF00
+        return {
+            'seq': machine.mem32[SCRATCH_BASE] & 0xFFFFFFFF,
+            'phase': (word3 >> 8) & 0xFF,
+            'log_offset': machine.mem32[SCRATCH_BASE + 4] & 0xFFFFFFFF,
+            'ground_alt': ground_dm / 10,
+            'max_alt': (alt_word & 0xFFFF) / 10,
+            'stage': STAGES[word3 & 0xFF] if (word3 & 0xFF) < len(STAGES) else '',
+            'reason': '',
+        }
+
+    def _load_flash(self):
+        """Flash állapotfájl olvasása, None ha nincs"""
+        try:
+            with open(self.filename) as f:
+                seq, phase, log_offset, ground_alt, max_alt, reason = f.readline().strip().split(',')
+            return {
+                'seq': int(seq),
+                'phase': int(phase),
+                'log_offset': int(log_offset),
+                'ground_alt': float(ground_alt),
+                'max_alt': float(max_alt),
+                'stage': '',
+                'reason': reason,
+            }
+        except:
+            return None
+
+    def load(self):
+        """
+        Utolsó jó állapot betöltése
+
+        A scratch regiszter a frissebb (minden ciklusban íródik); ha nem
+        érvényes (tápvesztés), a flash fájl marad. Az elakadás oka mindig
+        a flash fájlból jön.
+
+        Returns:
+            dict: seq, phase, log_offset, ground_alt, max_alt, stage, reason
+                  vagy None
+        """
+        flash = self._load_flash()
+        state = self._load_scratch()
+        if state is None:
+            return flash
+        if flash:
+            state['reason'] = flash['reason']
+        return state
+
+    def clear(self):
+        """Tárolt állapot törlése (új küldetés)"""
+        machine.mem32[SCRATCH_BASE + 12] = 0
+        self._word3 = 0
+        try:
+            os.remove(self.filename)
+        except:
+            pass
+
+
+def reset_cause_name():
+    """Utolsó reset oka szövegesen"""
+    cause = machine.reset_cause()
+    names = {
+        getattr(machine, 'PWRON_RESET', -1): 'pwron',
+        getattr(machine, 'WDT_RESET', -2): 'wdt',
+        getattr(machine, 'SOFT_RESET', -3): 'soft',
+        getattr(machine, 'HARD_RESET', -4): 'hard',
+    }
+    return names.get(cause, str(cause))
+
+
+class Supervisor:
+    """
+    Taskfelügyelet hardveres watchdoggal
+
+    Minden task a ciklusában feed(név) hívással jelentkezik; a felügyelő
+    csak akkor eteti a watchdogot, ha egyik task sem késett a saját
+    határidején túl.
+    """
+
+    def __init__(self, timeout_ms):
+        """
+        Args:
+            timeout_ms: Hardveres watchdog időkorlát (RP2040: max ~8300 ms)
+        """
+        self.timeout_ms = timeout_ms
+        self.wdt = None
+        self.limits = {}
+        self.last_seen = {}
+        self.stalled = None
+
+    def register(self, name, limit_ms):
+        """Task felvétele a felügyeletbe (limit_ms: megengedett leghosszabb csend)"""
+        self.limits[name] = limit_ms
+        self.last_seen[name] = time.ticks_ms()
+
+    def feed(self, name):
+        """Task jelentkezése"""
+        self.last_seen[name] = time.ticks_ms()
+
+    def check(self):
+        """
+        Returns:
+            str: Az elakadt task neve vagy None
+        """
+        now = time.ticks_ms()
+        for name, limit in self.limits.items():
+            if time.ticks_diff(now, self.last_seen[name]) > limit:
+                return name
+        return None
+
+    def start(self):
+        """Hardveres watchdog indítása (utána már nem állítható le)"""
+        if self.wdt is None:
+            self.wdt = machine.WDT(timeout=self.timeout_ms)
+
+    async def run(self, interval_ms, on_stall):
+        """
+        Felügyelő task
+
+        Args:
+            interval_ms: Ellenőrzési periódus (jóval a timeout alatt)
+            on_stall: Hívás az elakadt task nevével, mielőtt az etetés leáll
+        """
+        self.start()
+        while True:
+            stalled = self.check()
+            if stalled is None:
+                self.wdt.feed()
+            elif self.stalled is None:
+                # Az etetés leáll, a watchdog timeout_ms múlva újraindít
+                self.stalled = stalled
+                on_stall(stalled)
+            await asyncio.sleep_ms(interval_ms)